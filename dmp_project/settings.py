@@ -41,6 +41,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "music_publisher.instrumentation.InstrumentationMiddleware",
 ]
 
 ROOT_URLCONF = "dmp_project.urls"
@@ -161,6 +162,36 @@ PUBLISHING_AGREEMENT_PUBLISHER_SR = Decimal(
 # Anything else makes no changes to names and titles
 OPTION_FORCE_CASE = os.getenv("OPTION_FORCE_CASE")
 
+# CWR files with at least OPTION_CWR_PARALLEL_MIN_WORKS works are generated
+# in OPTION_CWR_PROCESSES worker processes. 0 or 1 means no worker processes.
+OPTION_CWR_PROCESSES = int(os.getenv("OPTION_CWR_PROCESSES", 0))
+OPTION_CWR_PARALLEL_MIN_WORKS = int(
+    os.getenv("OPTION_CWR_PARALLEL_MIN_WORKS", 1000)
+)
+
+# Transactions of works are stored and reused in later CWR files, as long as
+# the works do not change. 0 means they are always rendered.
+OPTION_CWR_CACHE = int(os.getenv("OPTION_CWR_CACHE", 1))
+
+# Data import files are validated in OPTION_IMPORT_PROCESSES worker
+# processes. 0 or 1 means no worker processes.
+OPTION_IMPORT_PROCESSES = int(os.getenv("OPTION_IMPORT_PROCESSES", 0))
+
+# JSON encoder for exports and API, 'json' or 'orjson', the latter is used
+# by default if installed
+OPTION_JSON_ENCODER = os.getenv("OPTION_JSON_ENCODER")
+
+# Number of background threads creating derivatives (resized images, audio
+# previews) of uploaded files, 0 means they are created during the request
+OPTION_MEDIA_WORKERS = int(os.getenv("OPTION_MEDIA_WORKERS", 0))
+
+# Number of background threads updating last change of works affected by
+# changes of writers, artists, labels, etc., 0 means during the request
+OPTION_CHANGE_WORKERS = int(os.getenv("OPTION_CHANGE_WORKERS", 0))
+
+# Record queries and time of each request, 'memory' records peak memory too
+OPTION_INSTRUMENTATION = os.getenv("OPTION_INSTRUMENTATION")
+
 
 # REMOTE FILES
 # The default is Digital Ocean Spaces, but any S3 should work with AWS
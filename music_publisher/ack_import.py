@@ -0,0 +1,213 @@
+"""Reconciliation of acknowledgement (ACK) and ISWC (ISW) records.
+
+All records from a file are processed together. Works, and works already
+holding any of the ISWCs from the file, are found in the
+:mod:`.work_index`. They and their acknowledgements are fetched with a
+constant number of queries, records are then reconciled in memory, in
+file order, and changes are written in bulk.
+
+The report and messages are the same as if records were processed and
+saved one by one.
+
+"""
+
+from itertools import chain
+
+from django.contrib.admin.models import CHANGE, LogEntry
+from django.contrib.admin.options import get_content_type_for_model
+from django.db import transaction
+from django.urls import reverse
+from django.utils.timezone import now
+
+from .models import (
+    Work,
+    WorkAcknowledgement,
+    WorkIndexChange,
+    WorkRegistrationStatus,
+    chunked,
+)
+from .work_index import get_work_index
+
+CHUNK_SIZE = 500
+
+
+class ACKReconciliation(object):
+    """Reconcile ACK and ISW records from one file with the database.
+
+    Attributes:
+        ack_import (ACKImport): saved import object
+        user_id (int): user for the log entries
+        import_iswcs (bool): import ISWCs or not
+        report (list): lines of the HTML report
+        errors (list): error messages, in order
+        unknown_work_ids (list): work IDs not found in the database
+        existing_work_ids (list): work IDs with existing acknowledgements
+    """
+
+    def __init__(self, ack_import, user_id, import_iswcs=False):
+        self.ack_import = ack_import
+        self.user_id = user_id
+        self.import_iswcs = import_iswcs
+        self.report = []
+        self.errors = []
+        self.unknown_work_ids = []
+        self.existing_work_ids = []
+        self.works = {}
+        self.iswc_holders = {}
+        self.existing_acks = set()
+        self.changed_works = {}
+        self.log_entries = []
+        self.new_acks = []
+
+    def load(self, work_ids, iswcs):
+        """Fetch works, their acknowledgements and ISWC holders."""
+        index = get_work_index()
+        found = index.lookup("WORK_ID", set(work_ids))
+        ids = sorted(set(chain.from_iterable(found.values())))
+        for chunk in chunked(ids, CHUNK_SIZE):
+            for work in Work.objects.filter(id__in=chunk):
+                self.works[work._work_id] = work
+        ids = sorted(work.id for work in self.works.values())
+        for chunk in chunked(ids, CHUNK_SIZE):
+            acks = WorkAcknowledgement.objects.filter(
+                work_id__in=chunk, society_code=self.ack_import.society_code
+            ).values_list("work_id", "remote_work_id", "date", "status")
+            self.existing_acks.update(acks)
+        if not self.import_iswcs:
+            return
+        by_id = {work.id: work for work in self.works.values()}
+        found = index.lookup("ISWC", set(iswc for iswc in iswcs if iswc))
+        ids = sorted(set(chain.from_iterable(found.values())))
+        for chunk in chunked(ids, CHUNK_SIZE):
+            for work in Work.objects.filter(id__in=chunk):
+                work = by_id.get(work.id, work)
+                self.iswc_holders.setdefault(work.iswc.upper(), []).append(
+                    work
+                )
+
+    def get_duplicate(self, work, iswc):
+        """Return the other work holding the ISWC, as ``.first()`` would."""
+        holders = self.iswc_holders.get(iswc.upper(), [])
+        holders = [holder for holder in holders if holder.id != work.id]
+        if holders:
+            return max(holders, key=lambda holder: holder.id)
+        return None
+
+    def reconcile_iswc(self, work, iswc, source):
+        """Set the ISWC if the work has none, unless used by another work."""
+        if work.iswc:
+            if work.iswc != iswc:
+                self.report.append(
+                    "A different ISWC exists for work "
+                    + "{}: {} (old) vs {} (new).<br/>\n".format(
+                        work, work.iswc, iswc
+                    )
+                    + "Old ISWC kept, please investigate.<br/>\n"
+                )
+                self.errors.append(
+                    "Conflicting ISWCs found for work {}!".format(work)
+                )
+            return
+        duplicate = self.get_duplicate(work, iswc)
+        if duplicate:
+            self.report.append(
+                "One ISWC can not be used for two works: "
+                + "{} {} {}.<br/>\n".format(iswc, duplicate, work)
+                + "This usually happens if one work is entered twice. "
+                + "ISWC not imported for {}.<br/>\n".format(work)
+            )
+            self.errors.append(
+                "Duplicate works found for ISWC {}!".format(iswc)
+            )
+            return
+        work.iswc = iswc
+        work.last_change = now()
+        self.iswc_holders.setdefault(iswc.upper(), []).append(work)
+        self.changed_works[work.id] = work
+        url = reverse(
+            "admin:music_publisher_ackimport_change",
+            args=(self.ack_import.id,),
+        )
+        link = f'<a href="{url}">{self.ack_import}</a>'
+        self.log_entries.append(
+            LogEntry(
+                user_id=self.user_id,
+                content_type_id=get_content_type_for_model(work).id,
+                object_id=str(work.id),
+                object_repr=str(work)[:200],
+                action_flag=CHANGE,
+                change_message=f"ISWC imported from {source} file: {link}.",
+            )
+        )
+
+    def process_ack(self, work_id, remote_work_id, date, status, iswc):
+        """Process one ACK record."""
+        work = self.works.get(work_id)
+        if not work:
+            self.unknown_work_ids.append(work_id)
+            return
+        if self.import_iswcs and iswc:
+            self.reconcile_iswc(work, iswc, "ACK")
+        key = (work.id, remote_work_id, date, status)
+        if key in self.existing_acks:
+            self.existing_work_ids.append(str(work_id))
+            return
+        self.existing_acks.add(key)
+        wa = WorkAcknowledgement(
+            work=work,
+            remote_work_id=remote_work_id,
+            society_code=self.ack_import.society_code,
+            date=date,
+            status=status,
+        )
+        self.new_acks.append(wa)
+        url = reverse("admin:music_publisher_work_change", args=(work.id,))
+        self.report.append(
+            '<a href="{}">{}</a> {} &mdash; {}<br/>\n'.format(
+                url, work.work_id, work.title, wa.get_status_display()
+            )
+        )
+
+    def process_isw(self, work_id, iswc):
+        """Process one ISW record."""
+        work = self.works.get(work_id)
+        if not work:
+            self.unknown_work_ids.append(work_id)
+            return
+        if self.import_iswcs and iswc:
+            self.reconcile_iswc(work, iswc, "ISW")
+
+    def save(self):
+        """Write all changes in bulk."""
+        with transaction.atomic():
+            Work.objects.bulk_update(
+                self.changed_works.values(), ["iswc", "last_change"]
+            )
+            LogEntry.objects.bulk_create(self.log_entries)
+            WorkAcknowledgement.objects.bulk_create(self.new_acks)
+            work_ids = sorted(set(wa.work_id for wa in self.new_acks))
+            WorkRegistrationStatus.objects.refresh(work_ids)
+            WorkIndexChange.objects.log(
+                sorted(set(work_ids) | set(self.changed_works))
+            )
+
+    def run(self, acks, isws):
+        """Process all records and save changes.
+
+        Args:
+            acks (list): (work_id, remote_work_id, date, status, iswc) tuples
+            isws (list): (work_id, iswc) tuples
+
+        Returns:
+            str: HTML report
+        """
+        self.load(
+            [ack[0] for ack in acks] + [isw[0] for isw in isws],
+            [ack[4] for ack in acks] + [isw[1] for isw in isws],
+        )
+        for ack in acks:
+            self.process_ack(*ack)
+        for isw in isws:
+            self.process_isw(*isw)
+        self.save()
+        return "".join(self.report)
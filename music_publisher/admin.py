@@ -8,21 +8,25 @@ All views are here, except for :mod:`.royalty_calculation`.
 import re
 import zipfile
 from csv import DictWriter
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
+from functools import lru_cache
 
 from django import forms
 from django.conf import settings
 from django.contrib import admin, messages
+from django.contrib.admin.utils import quote
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.http import HttpResponse, JsonResponse
+from django.db import models, transaction
+from django.http import HttpResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404, render
 from django.template.response import TemplateResponse
-from django.urls import reverse
-from django.utils.html import mark_safe
+from django.urls import get_script_prefix, reverse
+from django.utils.duration import duration_string
+from django.utils.html import format_html, mark_safe
 from django.utils.timezone import now
 
+from .ack_import import ACKReconciliation
 from .forms import (
     ACKImportForm,
     AlternateTitleFormSet,
@@ -32,7 +36,9 @@ from .forms import (
     WorkForm,
     WriterInWorkFormSet,
 )
+from .json_export import streaming_json_response
 from .models import (
+    ACKFile,
     ACKImport,
     AlternateTitle,
     Artist,
@@ -50,14 +56,31 @@ from .models import (
     Track,
     Work,
     WorkAcknowledgement,
+    WorkRegistrationStatus,
     Writer,
     WriterInWork,
 )
 from .validators import CWRFieldValidator
+from .work_index import INDEX, get_work_index, normalize
 
 IS_POPUP_VAR = admin.options.IS_POPUP_VAR
 
 
+@lru_cache(maxsize=None)
+def get_change_url_parts(viewname, script_prefix):
+    """Return the change URL of an object split around its primary key."""
+    url = reverse(viewname, args=["0"])
+    prefix, _, suffix = url.rpartition("/0/")
+    return prefix + "/", "/" + suffix
+
+
+def get_change_url(viewname, pk):
+    """Return the change URL of an object, without resolving the URL for
+    every row in changelists."""
+    prefix, suffix = get_change_url_parts(viewname, get_script_prefix())
+    return "{}{}{}".format(prefix, quote(pk), suffix)
+
+
 class ImageWidget(forms.widgets.ClearableFileInput):
     template_name = "admin/widgets/image.html"
 
@@ -226,18 +249,6 @@ class ArtistAdmin(MusicPublisherAdmin):
 
     actions = None
 
-    def save_model(self, request, obj, form, *args, **kwargs):
-        """Save, then update ``last_change`` of the works whose CWR
-        registration changes due to this change.
-        """
-        super().save_model(request, obj, form, *args, **kwargs)
-        if form.changed_data:
-            qs = Work.objects.filter(
-                models.Q(artistinwork__artist=obj)
-                | models.Q(recordings__artist=obj)
-            )
-            qs.update(last_change=now())
-
     def get_queryset(self, request):
         """Optimized queryset for changelist view."""
         qs = super().get_queryset(request)
@@ -375,13 +386,6 @@ class LabelAdmin(MusicPublisherAdmin):
     recording_count.short_description = "Recordings"
     recording_count.admin_order_field = "recording__count"
 
-    def save_model(self, request, obj, form, *args, **kwargs):
-        """Save, then update ``last_change`` of the corresponding works."""
-        super().save_model(request, obj, form, *args, **kwargs)
-        if form.changed_data:
-            qs = Work.objects.filter(models.Q(recordings__record_label=obj))
-            qs.update(last_change=now())
-
 
 @admin.register(Library)
 class LibraryAdmin(MusicPublisherAdmin):
@@ -432,13 +436,6 @@ class LibraryAdmin(MusicPublisherAdmin):
     work_count.short_description = "Works"
     work_count.admin_order_field = "work__count"
 
-    def save_model(self, request, obj, form, *args, **kwargs):
-        """Save, then update ``last_change`` of the corresponding works."""
-        super().save_model(request, obj, form, *args, **kwargs)
-        if form.changed_data:
-            qs = Work.objects.filter(models.Q(library_release__library=obj))
-            qs.update(last_change=now())
-
 
 class TrackInline(admin.TabularInline):
     """Inline interface for :class:`.models.Track`, used in
@@ -557,13 +554,6 @@ class LibraryReleaseAdmin(MusicPublisherAdmin):
             return []
         return super().get_inline_instances(request)
 
-    def save_model(self, request, obj, form, *args, **kwargs):
-        """Save, then update ``last_change`` of the corresponding works."""
-        super().save_model(request, obj, form, *args, **kwargs)
-        if form.changed_data:
-            qs = Work.objects.filter(library_release=obj)
-            qs.update(last_change=now())
-
     def get_queryset(self, request):
         """Optimized queryset for changelist view."""
         qs = super().get_queryset(request)
@@ -602,18 +592,14 @@ class LibraryReleaseAdmin(MusicPublisherAdmin):
         """Batch action that downloads a JSON file containing library releases.
 
         Returns:
-            JsonResponse: JSON file with selected works
+            StreamingHttpResponse: JSON file with selected library releases
         """
 
-        j = LibraryRelease.objects.get_dict(qs)
-
-        response = JsonResponse(j, json_dumps_params={"indent": 4})
+        releases = LibraryRelease.objects.get_dict_items(qs)
         name = "{}-libraryreleases-{}".format(
             settings.PUBLISHER_CODE, datetime.now().toordinal()
         )
-        cd = 'attachment; filename="{}.json"'.format(name)
-        response["Content-Disposition"] = cd
-        return response
+        return streaming_json_response((("releases", releases),), name)
 
     create_json.short_description = "Export selected library releases (JSON)."
 
@@ -809,18 +795,15 @@ class CommercialReleaseAdmin(MusicPublisherAdmin):
         releases.
 
         Returns:
-            JsonResponse: JSON file with selected commercial releases
+            StreamingHttpResponse: JSON file with selected commercial
+            releases
         """
 
-        j = CommercialRelease.objects.get_dict(qs)
-
-        response = JsonResponse(j, json_dumps_params={"indent": 4})
+        releases = CommercialRelease.objects.get_dict_items(qs)
         name = "{}-libraryreleases-{}".format(
             settings.PUBLISHER_CODE, datetime.now().toordinal()
         )
-        cd = 'attachment; filename="{}.json"'.format(name)
-        response["Content-Disposition"] = cd
-        return response
+        return streaming_json_response((("releases", releases),), name)
 
     create_json.short_description = (
         "Export selected commercial releases (JSON)."
@@ -947,14 +930,6 @@ class WriterAdmin(MusicPublisherAdmin):
             societies.append("sr_society")
         return societies
 
-    def save_model(self, request, obj, form, *args, **kwargs):
-        """Perform normal save_model, then update last_change of
-        all connected works."""
-        super().save_model(request, obj, form, *args, **kwargs)
-        if form.changed_data:
-            qs = Work.objects.filter(writerinwork__writer=obj)
-            qs.update(last_change=now())
-
     def get_queryset(self, request):
         """Optimized queryset for changelist view."""
         qs = super().get_queryset(request)
@@ -1064,19 +1039,12 @@ class WorkAdmin(MusicPublisherAdmin):
         WorkAcknowledgementInline,
     )
 
-    def writer_last_names(self, obj):
-        """This is a standard way how writers are shown in other apps."""
-        return obj.writer_last_names()
-
-    writer_last_names.short_description = "Writers' last names"
-    writer_last_names.admin_order_field = "writers__last_name"
-
     def percentage_controlled(self, obj):
         """Controlled percentage
         (sum of relative shares for controlled writers)
 
-        Please note that writers in work are already included in the queryset
-        for other reasons, so no overhead except summing.
+        Please note that writers in work are prefetched in the queryset,
+        so no overhead except summing.
         """
         return sum(
             wiw.relative_share
@@ -1133,7 +1101,7 @@ class WorkAdmin(MusicPublisherAdmin):
         """Optimized queryset for changelist view."""
         qs = super().get_queryset(request)
         qs = qs.prefetch_related("library_release__library")
-        qs = qs.prefetch_related("writerinwork_set__writer")
+        qs = qs.prefetch_related("writerinwork_set")
         qs = qs.annotate(models.Count("cwr_exports", distinct=True))
         qs = qs.annotate(models.Count("recordings", distinct=True))
         return qs
@@ -1167,7 +1135,7 @@ class WorkAdmin(MusicPublisherAdmin):
         def lookups(self, request, model_admin):
             """Simple Yes/No filter"""
 
-            codes = WorkAcknowledgement.objects.order_by()
+            codes = WorkRegistrationStatus.objects.order_by()
             codes = codes.values_list("society_code", flat=True).distinct()
             return sorted(
                 [(code, SOCIETY_DICT.get(code, code)) for code in codes],
@@ -1177,9 +1145,10 @@ class WorkAdmin(MusicPublisherAdmin):
         def queryset(self, request, queryset):
             """Filter on society sending ACKs."""
             if self.value():
-                queryset = queryset.filter(
-                    workacknowledgement__society_code=self.value()
-                ).distinct()
+                statuses = WorkRegistrationStatus.objects.filter(
+                    society_code=self.value()
+                )
+                queryset = queryset.filter(id__in=statuses.values("work_id"))
                 queryset.society_code = self.value()
             return queryset
 
@@ -1194,17 +1163,14 @@ class WorkAdmin(MusicPublisherAdmin):
             return WorkAcknowledgement.TRANSACTION_STATUS_CHOICES
 
         def queryset(self, request, qs):
-            """Filter on ACK status."""
+            """Filter on the latest ACK status."""
             if self.value():
+                statuses = WorkRegistrationStatus.objects.filter(
+                    status=self.value()
+                )
                 if hasattr(qs, "society_code"):
-                    qs = qs.filter(
-                        workacknowledgement__status=self.value(),
-                        workacknowledgement__society_code=qs.society_code,
-                    ).distinct()
-                else:
-                    qs = qs.filter(
-                        workacknowledgement__status=self.value()
-                    ).distinct()
+                    statuses = statuses.filter(society_code=qs.society_code)
+                qs = qs.filter(id__in=statuses.values("work_id"))
             return qs
 
     class HasISWCListFilter(admin.SimpleListFilter):
@@ -1268,13 +1234,33 @@ class WorkAdmin(MusicPublisherAdmin):
         "recordings__recording_title",
         "recordings__version_title",
         "^recordings__isrc",
-        "writerinwork__writer__last_name",
+        "writer_last_names",
     )
 
     def get_search_results(self, request, queryset, search_term):
-        """Deal with the situation term is work ID."""
+        """Deal with the situation term is work ID.
+
+        ISWCs and ISRCs are found in the :mod:`.work_index`, also with
+        dashes and dots. The index is not built during requests, if it
+        was not built in this process yet, formatted ones are looked up
+        in the database.
+        """
         if search_term.isnumeric():
             search_term = search_term.lstrip("0")
+        code = search_term.strip()
+        work_ids = None
+        if code and " " not in code:
+            if INDEX.built:
+                index = get_work_index()
+                work_ids = index.get("ISWC", code) or index.get("ISRC", code)
+            elif normalize(code) != code:
+                code = normalize(code)
+                work_ids = Work.objects.filter(
+                    models.Q(iswc=code) | models.Q(recordings__isrc=code)
+                ).values_list("id", flat=True)
+                work_ids = list(work_ids)
+        if work_ids:
+            return queryset.filter(id__in=work_ids), False
         return super().get_search_results(request, queryset, search_term)
 
     fieldsets = (
@@ -1313,6 +1299,8 @@ class WorkAdmin(MusicPublisherAdmin):
         if save_instance:
             formset.instance.last_change = now()
             formset.instance.save()
+            if formset.model is WorkAcknowledgement:
+                WorkRegistrationStatus.objects.refresh([formset.instance.id])
 
     def create_cwr(self, request, qs):
         """Batch action that redirects to the add view for
@@ -1332,19 +1320,16 @@ class WorkAdmin(MusicPublisherAdmin):
         """Batch action that downloads a JSON file containing selected works.
 
         Returns:
-            JsonResponse: JSON file with selected works
+            StreamingHttpResponse: JSON file with selected works
         """
 
         Work.persist_work_ids(qs)
 
-        j = Work.objects.get_dict(qs)
-        response = JsonResponse(j, json_dumps_params={"indent": 4})
+        works = Work.objects.get_dict_items(qs)
         name = "{}-works-{}".format(
             settings.PUBLISHER_CODE, datetime.now().toordinal()
         )
-        cd = 'attachment; filename="{}.json"'.format(name)
-        response["Content-Disposition"] = cd
-        return response
+        return streaming_json_response((("works", works),), name)
 
     create_json.short_description = "Export selected works (JSON)."
 
@@ -1775,11 +1760,9 @@ class RecordingAdmin(MusicPublisherAdmin):
             )
 
     def get_queryset(self, request):
-        """Optimized query regarding work name"""
+        """Optimized query, names of writers are stored in works."""
         qs = super().get_queryset(request)
-        qs = qs.prefetch_related("work__writers")
-        qs = qs.prefetch_related("artist")
-        qs = qs.prefetch_related("record_label")
+        qs = qs.select_related("work", "artist", "record_label")
         return qs
 
     def recording_id(self, obj):
@@ -1796,7 +1779,7 @@ class RecordingAdmin(MusicPublisherAdmin):
 
     def work_link(self, obj):
         """Link to the work the recording is based on."""
-        url = reverse("admin:music_publisher_work_change", args=[obj.work.id])
+        url = get_change_url("admin:music_publisher_work_change", obj.work_id)
         link = '<a href="{}">{}</a>'.format(url, obj.work)
         return mark_safe(link)
 
@@ -1807,8 +1790,8 @@ class RecordingAdmin(MusicPublisherAdmin):
         """Link to the recording artist."""
         if not obj.artist:
             return None
-        url = reverse(
-            "admin:music_publisher_artist_change", args=[obj.artist.id]
+        url = get_change_url(
+            "admin:music_publisher_artist_change", obj.artist_id
         )
         link = '<a href="{}">{}</a>'.format(url, obj.artist)
         return mark_safe(link)
@@ -1820,8 +1803,8 @@ class RecordingAdmin(MusicPublisherAdmin):
         """Link to the recording label."""
         if not obj.record_label:
             return None
-        url = reverse(
-            "admin:music_publisher_label_change", args=[obj.record_label.id]
+        url = get_change_url(
+            "admin:music_publisher_label_change", obj.record_label_id
         )
         link = '<a href="{}">{}</a>'.format(url, obj.record_label)
         return mark_safe(link)
@@ -1902,6 +1885,22 @@ class CWRExportAdmin(admin.ModelAdmin):
     list_filter = ("nwr_rev", "year")
     search_fields = ("description", "works__title", "num_in_year")
 
+    def progress(self, obj):
+        """Progress of CWR generation, with a button for resuming it.
+
+        The button submits the (read-only) change form, with CSRF token."""
+        progress = obj.get_progress()
+        text = "{done} of {total} works".format(**progress)
+        if progress["rate"]:
+            text += ", {:.0f} works per second".format(progress["rate"])
+        if progress["eta"]:
+            text += ", about {} left".format(
+                duration_string(timedelta(seconds=int(progress["eta"])))
+            )
+        return format_html(
+            '{}. <input type="submit" name="resume" value="Resume">', text
+        )
+
     def get_readonly_fields(self, request, obj=None):
         """Read-only fields differ if CWR has been completed."""
         if obj and obj.cwr:
@@ -1913,6 +1912,8 @@ class CWRExportAdmin(admin.ModelAdmin):
                 "view_link",
                 "download_link",
             )
+        elif obj and obj.num_in_year:
+            return "nwr_rev", "description", "works", "progress"
         else:
             return ()
 
@@ -1927,6 +1928,8 @@ class CWRExportAdmin(admin.ModelAdmin):
                 "view_link",
                 "download_link",
             )
+        elif obj and obj.num_in_year:
+            return "nwr_rev", "description", "works", "progress"
         else:
             return "nwr_rev", "description", "works"
 
@@ -1973,7 +1976,9 @@ class CWRExportAdmin(admin.ModelAdmin):
 
         Parameters:
             preview: that returns the preview of CWR file,
-            download: that downloads the CWR file."""
+            download: that downloads the CWR file.
+
+        Interrupted generation is resumed with ``resume`` in POST data."""
         try:
             obj = get_object_or_404(CWRExport, pk=object_id)
         except ValueError:
@@ -2011,6 +2016,10 @@ class CWRExportAdmin(admin.ModelAdmin):
                 )
             response["Content-Disposition"] = cd
             return response
+        elif request.method == "POST" and "resume" in request.POST:
+            if not obj.cwr and self.has_add_permission(request):
+                obj.create_cwr()
+            return HttpResponseRedirect(request.path)
 
         extra_context = {
             "show_save": False,
@@ -2031,9 +2040,12 @@ class CWRExportAdmin(admin.ModelAdmin):
         """:meth:`save_model` passes the main object, which is needed to fetch
         CWR from the external service, but only after related objects are
         saved.
+
+        CWR is generated after the export is committed, so checkpoints are
+        kept if generation is interrupted.
         """
         super().save_related(request, form, formsets, change)
-        form.instance.create_cwr()
+        transaction.on_commit(form.instance.create_cwr)
 
 
 class AdminWithReport(admin.ModelAdmin):
@@ -2088,7 +2100,7 @@ class ACKImportAdmin(AdminWithReport):
         re.S | re.M,
     )
     RE_ACK_30 = re.compile(
-        r"(?<=\n)ACK.{43}(WRK).{60}(.{20})(.{20}){20}(.{8})(.{2})(.*?)("
+        r"(?<=\n)ACK.{43}(WRK|ISR).{60}(.{20})(.{20}).{20}(.{8})(.{2})(.*?)("
         r"?=^ACK|^GRT)",
         re.S | re.M,
     )
@@ -2112,27 +2124,16 @@ class ACKImportAdmin(AdminWithReport):
     def process(self, request, ack_import, file_content, import_iswcs=False):
         """Create appropriate WorkAcknowledgement objects, without duplicates.
 
-        Big part of this code should be moved to the model, left here because
-        messaging is simpler.
+        Records are parsed here, and reconciled with the database in
+        :class:`.ack_import.ACKReconciliation`, messaging is done here.
         """
 
-        society_code = ack_import.society_code
-        ack_import_url = reverse(
-            "admin:music_publisher_ackimport_change", args=(ack_import.id,)
-        )
-        ack_import_link = f'<a href="{ack_import_url}">{ack_import}</a>'
-        from django.contrib.admin.models import CHANGE, LogEntry
-
-        if import_iswcs:
-            validator = CWRFieldValidator("iswc")
-
-        unknown_work_ids = []
-        existing_work_ids = []
-        report = ""
+        validator = CWRFieldValidator("iswc") if import_iswcs else None
         if file_content[59:64] == "01.10":
             pattern = self.RE_ACK_21
         else:
             pattern = self.RE_ACK_30
+        acks = []
         for x in re.findall(pattern, file_content):
             tt, work_id, remote_work_id, dat, status, rest = x
             iswc = self.validate_iswc(x, validator, import_iswcs)
@@ -2140,126 +2141,19 @@ class ACKImportAdmin(AdminWithReport):
             work_id = work_id.strip()
             remote_work_id = remote_work_id.strip()
             dat = datetime.strptime(dat, "%Y%m%d").date()
-            work = Work.objects.filter(_work_id=work_id).first()
-            if not work:
-                unknown_work_ids.append(work_id)
-                continue
-            if import_iswcs and iswc:
-                if work.iswc:
-                    if work.iswc != iswc:
-                        report += (
-                            "A different ISWC exists for work "
-                            + "{}: {} (old) vs {} (new).<br/>\n".format(
-                                work, work.iswc, iswc
-                            )
-                            + "Old ISWC kept, please investigate.<br/>\n"
-                        )
-                        self.message_user(
-                            request,
-                            "Conflicting ISWCs found for work {}!".format(
-                                work
-                            ),
-                            level=messages.ERROR,
-                        )
-                else:
-                    duplicate = Work.objects.exclude(id=work.id)
-                    duplicate = duplicate.filter(iswc__iexact=iswc).first()
-                    if duplicate:
-                        report += (
-                            "One ISWC can not be used for two works: "
-                            + "{} {} {}.<br/>\n".format(iswc, duplicate, work)
-                            + "This usually happens if one work is entered "
-                            "twice. "
-                            + "ISWC not imported for {}.<br/>\n".format(work)
-                        )
-                        self.message_user(
-                            request,
-                            "Duplicate works found for ISWC {}!".format(iswc),
-                            level=messages.ERROR,
-                        )
-                    else:
-                        work.iswc = iswc
-                        work.last_change = now()
-                        s = f"ISWC imported from ACK file: {ack_import_link}."
-                        LogEntry.objects.log_action(
-                            request.user.id,
-                            admin.options.get_content_type_for_model(work).id,
-                            work.id,
-                            str(work),
-                            CHANGE,
-                            s,
-                        )
-                        work.save()
-            wa, c = WorkAcknowledgement.objects.get_or_create(
-                work_id=work.id,
-                remote_work_id=remote_work_id,
-                society_code=society_code,
-                date=dat,
-                status=status,
-            )
-            if not c:
-                existing_work_ids.append(str(work_id))
-                continue
-            url = reverse("admin:music_publisher_work_change", args=(work.id,))
-            report += '<a href="{}">{}</a> {} &mdash; {}<br/>\n'.format(
-                url, work.work_id, work.title, wa.get_status_display()
-            )
+            acks.append((work_id, remote_work_id, dat, status, iswc))
+        isws = []
         if file_content[59:64] == "01.10":
             for work_id, iswc in re.findall(self.RE_ISW_21, file_content):
-                work_id = work_id.strip()
-                work = Work.objects.filter(_work_id=work_id).first()
-                if not work:
-                    unknown_work_ids.append(work_id)
-                    continue
-                if import_iswcs and iswc:
-                    if work.iswc:
-                        if work.iswc != iswc:
-                            report += (
-                                "A different ISWC exists for work "
-                                + "{}: {} (old) vs {} (new).<br/>\n".format(
-                                    work, work.iswc, iswc
-                                )
-                                + "Old ISWC kept, please "
-                                "investigate.<br/>\n"
-                            )
-                            self.message_user(
-                                request,
-                                "Conflicting ISWCs found for work {}!".format(
-                                    work
-                                ),
-                                level=messages.ERROR,
-                            )
-                    else:
-                        duplicate = Work.objects.exclude(id=work.id)
-                        duplicate = duplicate.filter(iswc__iexact=iswc).first()
-                        if duplicate:
-                            report += "One ISWC can not be used for two works: " + "{} {} {}.<br/>\n".format(
-                                iswc, duplicate, work
-                            ) + "This usually happens if one work is entered " "twice. " + "ISWC not imported for {}.<br/>\n".format(
-                                work
-                            )
-                            self.message_user(
-                                request,
-                                "Duplicate works found for ISWC {}!".format(
-                                    iswc
-                                ),
-                                level=messages.ERROR,
-                            )
-                        else:
-                            work.iswc = iswc
-                            work.last_change = now()
-                            s = f"ISWC imported from ISW file: {ack_import_link}."
-                            LogEntry.objects.log_action(
-                                request.user.id,
-                                admin.options.get_content_type_for_model(
-                                    work
-                                ).id,
-                                work.id,
-                                str(work),
-                                CHANGE,
-                                s,
-                            )
-                            work.save()
+                isws.append((work_id.strip(), iswc))
+        reconciliation = ACKReconciliation(
+            ack_import, request.user.id, import_iswcs
+        )
+        report = reconciliation.run(acks, isws)
+        for error in reconciliation.errors:
+            self.message_user(request, error, level=messages.ERROR)
+        unknown_work_ids = reconciliation.unknown_work_ids
+        existing_work_ids = reconciliation.existing_work_ids
         if unknown_work_ids:
             messages.add_message(
                 request,
@@ -2286,12 +2180,25 @@ class ACKImportAdmin(AdminWithReport):
             obj.society_code = cd["society_code"]
             obj.society_name = cd["society_name"]
             obj.date = cd["date"]
+            obj.ack_file, created = ACKFile.objects.store(
+                cd["acknowledgement_file"]
+            )
+            if not created:
+                self.message_user(
+                    request,
+                    "This file was already imported: {}.".format(
+                        ", ".join(
+                            "{} ({})".format(i.filename, i.date)
+                            for i in obj.ack_file.imports.all()
+                        )
+                    ),
+                    level=messages.WARNING,
+                )
             # TODO move process() to model, and handle messages here
             super().save_model(request, obj, form, change)
             obj.report = self.process(
                 request, obj, cd["acknowledgement_file"], cd["import_iswcs"]
             )
-            obj.cwr = cd["acknowledgement_file"]
             super().save_model(request, obj, form, True)
 
     def has_add_permission(self, request):
@@ -2399,7 +2306,7 @@ class DataImportAdmin(AdminWithReport):
             return response
         return super().add_view(request, form_url, extra_context)
 
-    add_fields = ("data_file", "ignore_unknown_columns")
+    add_fields = ("data_file", "ignore_unknown_columns", "validate_only")
 
     def get_fields(self, request, obj=None):
         """Return different fields for add vs change."""
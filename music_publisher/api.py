@@ -1,5 +1,4 @@
-from rest_framework.renderers import JSONRenderer
-
+from .json_export import iter_json
 from .models import (
     Writer,
     Work,
@@ -32,18 +31,40 @@ class DjangoModelPermissionsIncludingView(permissions.DjangoModelPermissions):
     }
 
 
+class DerivativeField(serializers.ReadOnlyField):
+    """Absolute URL of a derivative of the media file, or the original.
+
+    See :mod:`.media`.
+    """
+
+    def __init__(self, derivative, **kwargs):
+        self.derivative = derivative
+        kwargs["source"] = "*"
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        url = value.get_derivative_url(self.derivative)
+        request = self.context.get("request")
+        if url and request:
+            return request.build_absolute_uri(url)
+        return url
+
+
 class ArtistNestedSerializer(serializers.HyperlinkedModelSerializer):
     class Meta:
         model = Artist
-        fields = ["name", "image", "description", "url"]
+        fields = ["name", "image", "thumbnail", "description", "url"]
 
     name = serializers.CharField(source="__str__", read_only=True)
+    thumbnail = DerivativeField("thumbnail")
 
 
 class LabelNestedSerializer(serializers.ModelSerializer):
     class Meta:
         model = Label
-        fields = ["name", "image", "description"]
+        fields = ["name", "image", "thumbnail", "description"]
+
+    thumbnail = DerivativeField("thumbnail")
 
 
 class WriterNestedSerializer(serializers.ModelSerializer):
@@ -78,6 +99,7 @@ class ReleaseListSerializer(serializers.HyperlinkedModelSerializer):
         fields = [
             "title",
             "image",
+            "thumbnail",
             "description",
             "release_label",
             "release_date",
@@ -86,6 +108,7 @@ class ReleaseListSerializer(serializers.HyperlinkedModelSerializer):
         ]
 
     title = serializers.CharField(source="release_title", read_only=True)
+    thumbnail = DerivativeField("thumbnail")
     release_label = LabelNestedSerializer(read_only=True)
 
 
@@ -206,6 +229,7 @@ class ArtistPlaylistSerializer(serializers.ModelSerializer):
         fields = ["name", "image", "description"]
 
     name = serializers.CharField(source="__str__", read_only=True)
+    image = DerivativeField("medium")
 
 
 class RecordingPlaylistSerializer(serializers.HyperlinkedModelSerializer):
@@ -223,6 +247,7 @@ class RecordingPlaylistSerializer(serializers.HyperlinkedModelSerializer):
             "work",
         ]
 
+    audio_file = DerivativeField("preview")
     artist = ArtistPlaylistSerializer(read_only=True)
     work = WorkNestedSerializer(read_only=True)
     record_label = LabelNestedSerializer(read_only=True)
@@ -263,6 +288,7 @@ class PlaylistSerializer(serializers.ModelSerializer):
             "recordings",
         ]
 
+    image = DerivativeField("medium")
     artist = ArtistPlaylistSerializer(read_only=True)
     release_label = LabelNestedSerializer(read_only=True)
     recordings = RecordingPlaylistSerializer(many=True, read_only=True)
@@ -308,20 +334,10 @@ class BackupViewSet(viewsets.ViewSet):
     renderer_classes = [renderers.JSONRenderer]
 
     def json(self, request, *args, **kwargs):
-        yield """{"works":["""
-        renderer = JSONRenderer()
-        for i, work_item in enumerate(
-            Work.objects.get_dict_items(Work.objects.all())
-        ):
-            if i > 0:
-                yield ","
-            yield renderer.render(work_item)
-        yield """],"releases":["""
-        for i, release in enumerate(Release.objects.all()):
-            if i > 0:
-                yield ","
-            yield renderer.render(release.get_dict(with_tracks=True))
-        yield """]}"""
+        works = Work.objects.get_dict_items(Work.objects.all())
+        releases = Release.objects.get_dict_items(Release.objects.all())
+        arrays = (("works", works), ("releases", releases))
+        return iter_json(arrays, compact=True)
 
     def list(self, request, *args, **kwargs):
         response = StreamingHttpResponse(
@@ -9,7 +9,7 @@ import django.core.exceptions
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
-from .societies import SOCIETIES
+from .societies import NO_SOCIETY, SOCIETIES
 from .validators import CWRFieldValidator
 
 
@@ -63,6 +63,49 @@ class DescriptionBase(models.Model):
     description = models.TextField(blank=True)
 
 
+class MediaBase(models.Model):
+    """Abstract class for all classes with an uploaded media file.
+
+    Derivatives (resized images, audio previews) are created in the
+    background after upload, see :mod:`.media`.
+
+    Attributes:
+        MEDIA_FIELD (str): name of the file field
+        DERIVATIVES (tuple): names of derivatives
+        derivatives (django.db.models.JSONField): {name: file name}, with
+            the name of the original file under ``source``
+    """
+
+    class Meta:
+        abstract = True
+
+    MEDIA_FIELD = "image"
+    DERIVATIVES = ("thumbnail", "medium")
+
+    derivatives = models.JSONField(default=dict, blank=True, editable=False)
+
+    def get_derivative_url(self, name):
+        """Return URL of a derivative, or of the original if there is none.
+
+        Returns:
+            str: URL or ``None`` if there is no file
+        """
+        field = getattr(self, self.MEDIA_FIELD)
+        if not field:
+            return None
+        derivative = self.derivatives.get(name)
+        if derivative and self.derivatives.get("source") == field.name:
+            return field.storage.url(derivative)
+        return field.url
+
+    @property
+    def media_urls(self):
+        """Dictionary with URLs of all derivatives, for templates."""
+        return {
+            name: self.get_derivative_url(name) for name in self.DERIVATIVES
+        }
+
+
 class TitleBase(models.Model):
     """Abstract class for all classes that have a title.
 
@@ -95,7 +138,7 @@ class TitleBase(models.Model):
         return self.title
 
 
-class PersonBase(models.Model):
+class PersonBase(MediaBase):
     """Base class for all classes that contain people with first and last name.
 
     This includes writers and artists. For bands, only the last name field is
@@ -143,7 +186,7 @@ class SocietyAffiliationBase(models.Model):
         max_length=3,
         blank=True,
         null=True,
-        choices=SOCIETIES + [("99", "NO SOCIETY")],
+        choices=SOCIETIES + (NO_SOCIETY,),
     )
     mr_society = models.CharField(
         "Mechanical rights society",
@@ -353,7 +396,7 @@ class WriterBase(
         abstract = True
 
 
-class LabelBase(NotesBase, DescriptionBase):
+class LabelBase(NotesBase, DescriptionBase, MediaBase):
     """Music Label base class.
 
     Attributes:
@@ -390,7 +433,7 @@ class LibraryBase(models.Model):
     )
 
 
-class ReleaseBase(DescriptionBase):
+class ReleaseBase(DescriptionBase, MediaBase):
     """Music Release base class
 
     Attributes:
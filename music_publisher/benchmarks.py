@@ -0,0 +1,849 @@
+"""Benchmarks for performance-sensitive code paths.
+
+Benchmarks are registered with :func:`benchmark` and run with the
+``dmp_benchmark`` management command. Each benchmark is a function that
+returns a dictionary of measurements, keys include units.
+
+Hot query paths are registered with :func:`query_path`. The ``queries``
+benchmark records their plans and reports full scans of tables that
+should be accessed through indexes. Run it on a generated catalog, see
+:mod:`music_publisher.synthetic`, as plans depend on table sizes.
+
+    Attributes:
+        BENCHMARKS (OrderedDict): {name: function}
+        QUERY_PATHS (OrderedDict): {name: (function, indexed tables)}
+"""
+
+import os
+import subprocess
+import sys
+import time
+import timeit
+from collections import OrderedDict
+
+BENCHMARKS = OrderedDict()
+
+
+def benchmark(name):
+    """Decorator registering a benchmark under the given name."""
+
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+def time_per_call(func, number, repeat=5):
+    """Return the best time per call of ``func``, in seconds."""
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_benchmarks(names=None):
+    """Yield (name, results) for all or selected benchmarks."""
+    for name, func in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        yield name, func()
+
+
+def import_times(modules=("music_publisher.admin", "music_publisher.urls")):
+    """Set up Django and import modules in a fresh interpreter.
+
+    Uses ``python -X importtime``, so all measured imports are cold. Note
+    that ``importtime`` only reports ``import`` statements, modules loaded
+    by Django with ``import_module`` (e.g. ``models`` and ``admin``) are
+    not listed, so the time spent in ``django.setup()`` is returned too.
+
+    Args:
+        modules (tuple): modules to import after ``django.setup()``
+
+    Returns:
+        tuple: wall time and setup time in ms, and a list of
+            (module, self, cumulative) tuples, times in microseconds,
+            in import order
+    """
+    from django.conf import settings
+
+    code = (
+        "import time; start = time.perf_counter(); "
+        "import django; django.setup(); "
+        "print(time.perf_counter() - start)"
+    )
+    for module in modules:
+        code += "; import " + module
+    env = dict(os.environ)
+    env.setdefault("DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = (time.perf_counter() - start) * 1e3
+    setup = float(process.stdout.split()[0]) * 1e3
+    rows = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, module = line[12:].split("|")
+        if not own.strip().isdigit():
+            continue  # header
+        rows.append((module.strip(), int(own), int(cumulative)))
+    return wall, setup, rows
+
+
+@benchmark("startup")
+def startup_benchmark(repeat=5):
+    """Cold start: Django setup plus admin and URL configuration."""
+    results = OrderedDict()
+    for i in range(repeat):
+        wall, setup, rows = import_times()
+        results["wall (ms)"] = min(results.get("wall (ms)", wall), wall)
+        results["django.setup (ms)"] = min(
+            results.get("django.setup (ms)", setup), setup
+        )
+        for module, own, cumulative in rows:
+            if not module.startswith("music_publisher"):
+                continue
+            key = "{} (ms)".format(module)
+            value = cumulative / 1e3
+            results[key] = min(results.get(key, value), value)
+    return results
+
+
+@benchmark("societies")
+def societies_benchmark(number=100000):
+    """Society registry: loading and short name lookups."""
+    from .models import Writer
+    from .societies import SocietyRegistry, get_registry, read_societies
+
+    writer = Writer(pr_society="52")
+    registry = get_registry()
+    displays = registry.displays
+    code = "52"
+    return {
+        "load (ms)": time_per_call(
+            lambda: SocietyRegistry(read_societies()), 20
+        )
+        * 1e3,
+        "get_pr_society_display split (us)": time_per_call(
+            lambda: writer.get_pr_society_display().split(",")[0], 1000
+        )
+        * 1e6,
+        "display split (ns)": time_per_call(
+            lambda: displays.get(code, "").split(",")[0], number
+        )
+        * 1e9,
+        "short_name (ns)": time_per_call(
+            lambda: registry.short_name(code), number
+        )
+        * 1e9,
+        "get_registry().short_name (ns)": time_per_call(
+            lambda: get_registry().short_name(code), number
+        )
+        * 1e9,
+    }
+
+
+@benchmark("cwr")
+def cwr_benchmark(nwr_rev="NWR"):
+    """CWR generation for all works in the database, without and with
+    worker processes."""
+    from copy import deepcopy
+
+    from django.test.utils import override_settings
+
+    from .models import CWRExport, Work
+
+    qs = Work.objects.order_by("id")
+    works = Work.objects.get_dict(qs)["works"]
+    results = OrderedDict([("works", len(works))])
+    if not works:
+        return results
+    processes = os.cpu_count() or 1
+    for label, options in (
+        ("serial (s)", {"OPTION_CWR_PROCESSES": 0}),
+        (
+            "{} processes (s)".format(processes),
+            {
+                "OPTION_CWR_PROCESSES": processes,
+                "OPTION_CWR_PARALLEL_MIN_WORKS": 1,
+            },
+        ),
+    ):
+        data = deepcopy(works)  # generation changes work dicts
+        with override_settings(**options):
+            start = time.perf_counter()
+            "".join(CWRExport(nwr_rev=nwr_rev).yield_lines(data))
+            results[label] = time.perf_counter() - start
+    return results
+
+
+def measure(func):
+    """Call ``func`` and return wall time in s and peak memory in MB."""
+    import tracemalloc
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return duration, peak / 2**20
+
+
+@benchmark("cwr_loader")
+def cwr_loader_benchmark():
+    """Loading work dicts for CWR: model instances vs projections."""
+    from .cwr_loader import get_cwr_dict_items
+    from .models import Work
+
+    qs = Work.objects.order_by("id")
+    results = OrderedDict([("works", qs.count())])
+    for label, func in (
+        ("get_dict", lambda: Work.objects.get_dict(qs)["works"]),
+        ("projections", lambda: list(get_cwr_dict_items(qs))),
+    ):
+        duration, peak = measure(func)
+        results["{} (s)".format(label)] = duration
+        results["{} peak (MB)".format(label)] = peak
+    return results
+
+
+@benchmark("cwr_cache")
+def cwr_cache_benchmark():
+    """CWR files for all works in the database: without the transaction
+    cache, with an empty one, and repeated (NWR, then REV)."""
+    from django.db import transaction
+    from django.test.utils import override_settings
+
+    from .models import CWRExport, CWRTransaction, Work
+
+    qs = Work.objects.order_by("id")
+    results = OrderedDict([("works", qs.count())])
+    if not results["works"]:
+        return results
+    with transaction.atomic():
+        CWRTransaction.objects.all().delete()
+        for label, nwr_rev, cache in (
+            ("no cache (s)", "NWR", 0),
+            ("empty cache (s)", "NWR", 1),
+            ("repeated (s)", "REV", 1),
+        ):
+            cwr_export = CWRExport.objects.create(nwr_rev=nwr_rev)
+            cwr_export.works.set(qs)
+            with override_settings(OPTION_CWR_CACHE=cache):
+                start = time.perf_counter()
+                cwr_export.create_cwr()
+                results[label] = time.perf_counter() - start
+        transaction.set_rollback(True)
+    return results
+
+
+def generate_work_dicts(count):
+    """Return ``count`` work dicts shaped like :meth:`.models.Work.get_dict`.
+
+    Dicts are not saved anywhere, there is no need for a database.
+    """
+    from datetime import datetime, timezone
+
+    from .models import WORLD_DICT
+
+    works = []
+    for i in range(count):
+        writer = {
+            "id": i,
+            "code": "W{:06d}".format(i),
+            "first_name": "JOHN",
+            "last_name": "WRITER {}".format(i),
+            "ipi_name_number": "{:011d}".format(i),
+            "ipi_base_number": None,
+            "account_number": None,
+            "affiliations": [
+                {
+                    "organization": {"code": "52", "name": "PRS"},
+                    "affiliation_type": {
+                        "code": "PR",
+                        "name": "Performance Rights",
+                    },
+                    "territory": WORLD_DICT,
+                }
+            ],
+        }
+        works.append(
+            {
+                "id": i,
+                "code": "DMP{:06d}".format(i),
+                "work_title": "WORK TITLE {}".format(i),
+                "last_change": datetime(2024, 1, 1, tzinfo=timezone.utc),
+                "version_type": {"code": "ORI", "name": "Original Work"},
+                "iswc": "T{:010d}".format(i),
+                "other_titles": [
+                    {
+                        "title": "OTHER TITLE {}".format(i),
+                        "title_type": {"code": "AT", "name": "Alternative"},
+                    }
+                ],
+                "origin": None,
+                "writers": [
+                    {
+                        "writer": writer,
+                        "controlled": True,
+                        "relative_share": "0.5",
+                        "writer_role": {"code": "CA", "name": "Composer"},
+                        "original_publishers": [],
+                    },
+                    {
+                        "writer": None,
+                        "controlled": False,
+                        "relative_share": "0.5",
+                        "writer_role": None,
+                        "original_publishers": [],
+                    },
+                ],
+                "performing_artists": [],
+                "original_works": [],
+                "cross_references": [],
+                "recordings": [
+                    {
+                        "id": i,
+                        "code": "DMP{:06d}R".format(i),
+                        "recording_title": "WORK TITLE {}".format(i),
+                        "version_title": None,
+                        "release_date": "20240101",
+                        "duration": "00:03:30",
+                        "isrc": None,
+                        "recording_artist": None,
+                        "record_label": None,
+                        "tracks": [],
+                    }
+                ],
+            }
+        )
+    return works
+
+
+@benchmark("json")
+def json_benchmark(count=100000, distinct=1000):
+    """Encoding a generated catalog with all available JSON encoders,
+    compact and indented."""
+    from .json_export import ENCODERS, iter_json
+
+    works = generate_work_dicts(distinct)
+    results = OrderedDict([("works", count)])
+    for name, encoder in ENCODERS.items():
+        for compact in (True, False):
+            items = (works[i % distinct] for i in range(count))
+            start = time.perf_counter()
+            size = sum(
+                len(chunk)
+                for chunk in iter_json(
+                    (("works", items),), compact=compact, encoder=encoder
+                )
+            )
+            duration = time.perf_counter() - start
+            label = "{} {}".format(name, "compact" if compact else "indented")
+            results["{} (s)".format(label)] = duration
+            results["{} (MB/s)".format(label)] = size / 2**20 / duration
+    return results
+
+
+def get_wide_import_rows(rows):
+    """Return a header with 150 data import columns and ``rows`` rows.
+
+    Rows are dicts, as returned by :class:`csv.DictReader`."""
+    fieldnames = [
+        "Work ID",
+        "Work Title",
+        "ISWC",
+        "Original Title",
+        "Library",
+        "CD Identifier",
+    ]
+    fieldnames += ["Alt Title {}".format(i) for i in range(1, 5)]
+    values = ["", "WORK", "", "", "LIBRARY", "CD1"] + ["ALT TITLE"] * 4
+    writer_fields = (
+        ("Last", "LAST"),
+        ("First", "FIRST"),
+        ("IPI", "00000000199"),
+        ("PRO", "52"),
+        ("Role", "CA"),
+        ("Controlled", "Y"),
+        ("Share", "10%"),
+        ("SAAN", "SAAN"),
+        ("Account Number", "ACC"),
+        ("Publisher Name", "PUBLISHER"),
+    )
+    for i in range(1, 11):
+        for field, value in writer_fields:
+            fieldnames.append("Writer {} {}".format(i, field))
+            values.append(value)
+    recording_fields = (
+        ("Recording Title", "RECORDING"),
+        ("Version Title", "VERSION"),
+        ("Release Date", "20240101"),
+        ("Duration", "00:03:00"),
+        ("ISRC", "USX9P1234567"),
+        ("Record Label", "LABEL"),
+    )
+    for i in range(1, 6):
+        for field, value in recording_fields:
+            fieldnames.append("Recording {} {}".format(i, field))
+            values.append(value)
+    for i in range(1, 6):
+        fieldnames += [
+            "Reference {} ID".format(i),
+            "Reference {} CMO".format(i),
+        ]
+        values += ["R{}".format(i), "52"]
+    row = dict(zip(fieldnames, values))
+    return fieldnames, [dict(row) for i in range(rows)]
+
+
+@benchmark("unflatten")
+def unflatten_benchmark(rows=50000):
+    """Data import: unflattening rows of a 150-column file, with the
+    column plan compiled once and, for comparison, for every row."""
+    from .data_import import DataImporter
+
+    fieldnames, data = get_wide_import_rows(rows)
+    results = OrderedDict([("columns", len(fieldnames)), ("rows", rows)])
+    importer = DataImporter([])
+    start = time.perf_counter()
+    for row in data:
+        importer.unflatten(row)
+    compiled = (time.perf_counter() - start) / rows
+    start = time.perf_counter()
+    for row in data[:1000]:
+        importer.columns = {}
+        importer.unflatten(row)
+    uncompiled = (time.perf_counter() - start) / min(rows, 1000)
+    results["plan compiled once (us/row)"] = compiled * 1e6
+    results["plan compiled per row (us/row)"] = uncompiled * 1e6
+    results["speedup"] = uncompiled / compiled
+    return results
+
+
+QUERY_PATHS = OrderedDict()
+
+
+def query_path(name, indexed=()):
+    """Decorator registering a hot query path.
+
+    The decorated function returns a queryset. Tables in ``indexed`` must
+    be accessed through an index, see :func:`get_full_scans`.
+    """
+
+    def decorator(func):
+        QUERY_PATHS[name] = (func, indexed)
+        return func
+
+    return decorator
+
+
+def get_full_scans(plan):
+    """Return names of tables read in full, from SQLite or PostgreSQL plan."""
+    import re
+
+    scans = re.findall(r"\bSCAN (\w+)(?! USING (?:COVERING )?INDEX)", plan)
+    scans += re.findall(r"Seq Scan on (\w+)", plan)
+    return set(scans)
+
+
+def get_sample(model, field):
+    """Return the value of ``field`` in the first object with one."""
+    qs = model.objects.exclude(**{field: None}).order_by("id")
+    return qs.values_list(field, flat=True).first()
+
+
+@query_path("admin: works changed since", ("music_publisher_work",))
+def changed_works_query():
+    from .models import Work
+
+    # counted by the admin paginator, ordering is not used
+    last_change = get_sample(Work, "last_change")
+    return Work.objects.filter(last_change__gte=last_change).order_by()
+
+
+@query_path(
+    "admin: work registration status filter",
+    ("music_publisher_workregistrationstatus",),
+)
+def registration_status_query():
+    from .models import Work, WorkRegistrationStatus
+
+    statuses = WorkRegistrationStatus.objects.filter(
+        society_code=get_sample(WorkRegistrationStatus, "society_code"),
+        status=get_sample(WorkRegistrationStatus, "status"),
+    )
+    return Work.objects.filter(id__in=statuses.values("work_id"))
+
+
+@query_path(
+    "admin: acknowledgements by work, society and status",
+    ("music_publisher_workacknowledgement",),
+)
+def acknowledgements_query():
+    from .models import WorkAcknowledgement
+
+    work_ids = WorkAcknowledgement.objects.values_list("work_id", flat=True)
+    return WorkAcknowledgement.objects.filter(
+        work_id__in=list(work_ids.order_by("work_id")[:100]),
+        society_code=get_sample(WorkAcknowledgement, "society_code"),
+        status=get_sample(WorkAcknowledgement, "status"),
+    )
+
+
+def royalty_query(source, model, field):
+    """Queryset from royalty calculation, for 100 identifiers."""
+    from types import SimpleNamespace
+
+    from .royalty_calculation import RoyaltyCalculation
+
+    ids = model.objects.exclude(**{field: None}).order_by("id")
+    ids = list(ids.values_list(field, flat=True)[:100])
+    calculation = SimpleNamespace(work_id_source=source)
+    return RoyaltyCalculation.get_work_queryset(calculation, ids)
+
+
+@query_path("royalties: by work ID", ("music_publisher_writerinwork",))
+def royalty_work_id_query():
+    from django.conf import settings
+
+    from .models import Work
+
+    return royalty_query(settings.PUBLISHER_CODE, Work, "_work_id")
+
+
+@query_path("royalties: by ISWC", ("music_publisher_writerinwork",))
+def royalty_iswc_query():
+    from .models import Work
+
+    return royalty_query("ISWC", Work, "iswc")
+
+
+@query_path("royalties: by ISRC", ("music_publisher_writerinwork",))
+def royalty_isrc_query():
+    from .models import Recording
+
+    return royalty_query("ISRC", Recording, "isrc")
+
+
+@query_path("royalties: by society work ID", ("music_publisher_writerinwork",))
+def royalty_remote_work_id_query():
+    from .models import WorkAcknowledgement
+
+    code = get_sample(WorkAcknowledgement, "society_code")
+    return royalty_query(code, WorkAcknowledgement, "remote_work_id")
+
+
+@query_path("data import: writer lookup", ("music_publisher_writer",))
+def writer_lookup_query():
+    from .models import Writer
+
+    writer = Writer.objects.exclude(ipi_name=None).order_by("id").first()
+    return Writer.objects.filter(
+        last_name__iexact=writer.last_name,
+        first_name__iexact=writer.first_name,
+        ipi_name=writer.ipi_name,
+    )
+
+
+@query_path(
+    "data import: library release lookup", ("music_publisher_release",)
+)
+def library_release_lookup_query():
+    from .models import LibraryRelease
+
+    release = LibraryRelease.objects.order_by("id").first()
+    return LibraryRelease.objects.filter(
+        library_id=release.library_id,
+        cd_identifier__iexact=release.cd_identifier,
+    )
+
+
+@query_path("models: library releases")
+def library_releases_query():
+    from .models import LibraryRelease
+
+    return LibraryRelease.objects.all()
+
+
+@query_path("api: playlist", ("music_publisher_release",))
+def playlist_query():
+    from django.utils.timezone import now
+
+    from .models import Playlist, Release
+
+    cd_identifier = get_sample(Release, "cd_identifier")
+    qs = Playlist.objects.filter(cd_identifier=cd_identifier)
+    return qs.exclude(release_date__lt=now())
+
+
+@query_path("api: releases")
+def api_releases_query():
+    from .api import ReleaseViewSet
+
+    return ReleaseViewSet.queryset.all()
+
+
+def audit_query_paths(names=None, number=5):
+    """Yield (name, plan, full scans of indexed tables, time in ms).
+
+    Time is for executing the SQL query and fetching rows, without
+    creating model instances and prefetching.
+    """
+    from django.db import connection
+
+    for name, (func, indexed) in QUERY_PATHS.items():
+        if names and name not in names:
+            continue
+        qs = func()
+        plan = qs.explain()
+        scans = sorted(get_full_scans(plan) & set(indexed))
+        sql, params = qs.query.sql_with_params()
+
+        def execute():
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                cursor.fetchall()
+
+        duration = time_per_call(execute, number, repeat=3)
+        yield name, plan, scans, duration * 1e3
+
+
+@benchmark("queries")
+def queries_benchmark():
+    """Hot query paths: time and full scans of tables expected to be
+    accessed through indexes."""
+    results = OrderedDict()
+    for name, plan, scans, duration in audit_query_paths():
+        results["{} (ms)".format(name)] = duration
+        results["{} full scans".format(name)] = ", ".join(scans) or "-"
+    return results
+
+
+def rolled_back(func):
+    """Return a function calling ``func`` in a rolled back transaction."""
+    from django.db import transaction
+
+    def wrapper():
+        with transaction.atomic():
+            func()
+            transaction.set_rollback(True)
+
+    return wrapper
+
+
+def get_data_import_file(writers, rows):
+    """Return a data import CSV file with ``rows`` new works."""
+    import csv
+    from io import StringIO
+
+    fieldnames = ["Work Title"]
+    for i in (1, 2):
+        fieldnames += [
+            "Writer {} {}".format(i, key)
+            for key in ("Last", "First", "IPI", "PRO", "Role", "Share")
+        ]
+        fieldnames.append("Writer {} Controlled".format(i))
+    f = StringIO()
+    csv_writer = csv.writer(f)
+    csv_writer.writerow(fieldnames)
+    for i in range(rows):
+        row = ["IMPORTED WORK {}".format(i)]
+        for j, controlled in ((0, "Y"), (1, "N")):
+            writer = writers[(i + j) % len(writers)]
+            row += [
+                writer.last_name,
+                writer.first_name,
+                writer.ipi_name,
+                writer.pr_society,
+                "CA" if j == 0 else "A",
+                "50%",
+                controlled,
+            ]
+        csv_writer.writerow(row)
+    f.seek(0)
+    return f
+
+
+def get_statement_file(work_ids):
+    """Return a royalty statement CSV file, one row per work ID."""
+    import csv
+    from io import StringIO
+
+    f = StringIO()
+    csv_writer = csv.writer(f)
+    csv_writer.writerow(["Work ID", "Right Type", "Amount"])
+    for i, work_id in enumerate(work_ids):
+        csv_writer.writerow([work_id, "PMS"[i % 3], "{}.99".format(i % 100)])
+    f.seek(0)
+    return f
+
+
+@benchmark("catalog")
+def catalog_benchmark(rows=1000):
+    """End-to-end: time and peak memory of heavy entry points, for the
+    whole catalog in the database, see ``dmp_generate_catalog``.
+
+    Data import and royalty calculation use ``rows`` rows. Database
+    changes are rolled back."""
+    from datetime import date
+    from decimal import Decimal
+    from types import SimpleNamespace
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+
+    from .ack_import import ACKReconciliation
+    from .data_import import DataImporter
+    from .models import ACKImport, CWRExport, Work, Writer
+    from .royalty_calculation import RoyaltyCalculation
+
+    works = Work.objects.order_by("id")
+    results = OrderedDict([("works", works.count())])
+    if not results["works"]:
+        return results
+
+    def cwr_export():
+        cwr_export = CWRExport.objects.create(nwr_rev="NWR")
+        cwr_export.works.set(works)
+        cwr_export.create_cwr()
+
+    def ack_import():
+        user = User.objects.create(username="benchmark")
+        ack = ACKImport.objects.create(
+            filename="benchmark", society_code="52", date=date.today()
+        )
+        acks = [
+            (work_id, "B{:08d}".format(i), date.today(), "RA", iswc)
+            for i, (work_id, iswc) in enumerate(
+                works.values_list("_work_id", "iswc")
+            )
+        ]
+        ACKReconciliation(ack, user.id, import_iswcs=True).run(acks, [])
+
+    def data_import():
+        writers = Writer.objects.filter(
+            generally_controlled=False, _can_be_controlled=True
+        )
+        f = get_data_import_file(list(writers.order_by("id")[:100]), rows)
+        for work in DataImporter(f).run():
+            pass
+
+    def royalty_calculation():
+        work_ids = works.values_list("_work_id", flat=True)[:rows]
+        form = SimpleNamespace(
+            file=get_statement_file(work_ids),
+            cleaned_data={
+                "in_file": SimpleNamespace(name="statement.csv"),
+                "work_id_column": "0",
+                "work_id_source": settings.PUBLISHER_CODE,
+                "right_type_column": "1",
+                "amount_column": "2",
+                "algo": "fee",
+                "default_fee": Decimal(0),
+            },
+        )
+        os.remove(RoyaltyCalculation(form).out_file_path)
+
+    def json_backup():
+        from .api import BackupViewSet
+
+        for chunk in BackupViewSet().json(None):
+            pass
+
+    for label, func in (
+        ("cwr export", cwr_export),
+        ("ack import", ack_import),
+        ("data import", data_import),
+        ("royalty calculation", royalty_calculation),
+        ("json backup", json_backup),
+    ):
+        duration, peak = measure(rolled_back(func))
+        results["{} (s)".format(label)] = duration
+        results["{} peak (MB)".format(label)] = peak
+    return results
+
+
+@benchmark("changelist")
+def changelist_benchmark(rows=500):
+    """Render admin changelists with ``rows`` objects per page, as when
+    ``list_per_page`` is raised for bulk editing."""
+    from unittest import mock
+
+    from django.contrib import admin
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import RequestFactory
+    from django.test.utils import CaptureQueriesContext
+
+    from .models import Recording
+
+    results = OrderedDict()
+    user = User(username="benchmark", is_active=True, is_superuser=True)
+    for model in (Recording,):
+        model_admin = admin.site._registry[model]
+        name = model._meta.model_name
+        request = RequestFactory().get("/")
+        request.user = user
+
+        def render():
+            with mock.patch.object(model_admin, "list_per_page", rows):
+                model_admin.changelist_view(request).render()
+
+        with CaptureQueriesContext(connection) as ctx:
+            render()
+        results["{} queries".format(name)] = len(ctx.captured_queries)
+        results["{} (ms)".format(name)] = time_per_call(render, 1, 3) * 1e3
+    return results
+
+
+def get_environment():
+    """Return a dict describing where the benchmarks were run."""
+    import platform
+
+    import django
+    from django.db import connection
+
+    from .models import Work
+
+    return OrderedDict(
+        [
+            ("python", platform.python_version()),
+            ("django", django.get_version()),
+            ("database", connection.vendor),
+            ("works", Work.objects.count()),
+        ]
+    )
+
+
+def compare_results(results, baseline):
+    """Yield (name, key, value, baseline value, change in %) tuples.
+
+    Args:
+        results (dict): {benchmark name: {key: value}}
+        baseline (dict): the same structure, e.g. loaded from a file
+            written by ``dmp_benchmark --output``
+
+    Change is ``None`` if the values are not numbers, the baseline is
+    zero or missing.
+    """
+    for name, values in results.items():
+        base_values = baseline.get(name, {})
+        for key, value in values.items():
+            base = base_values.get(key)
+            change = None
+            numbers = all(
+                isinstance(v, (int, float)) and not isinstance(v, bool)
+                for v in (value, base)
+            )
+            if numbers and base:
+                change = (value - base) / base * 100
+            yield name, key, value, base, change
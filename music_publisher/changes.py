@@ -0,0 +1,180 @@
+"""Propagation of changes to ``last_change`` of works.
+
+CWR registrations include data about writers, artists, labels, libraries,
+releases, recordings and tracks. When one of them is changed or deleted,
+``last_change`` of all affected works is updated, so they can be
+registered again. This is done with signals, for changes from the admin,
+data imports, API and any other code that saves objects. Saving an
+object without changing it changes nothing, neither does creating it,
+as a new object has no works yet. ``QuerySet.update()`` does not send
+signals, so it does not propagate.
+
+IDs of affected works are collected with a ``UNION`` of subqueries, each
+filtering on one indexed foreign key, instead of ``OR`` across joins,
+which makes databases choose bad query plans. Works are then updated in
+batches by primary key.
+
+Propagation runs after the transaction is committed. If
+``OPTION_CHANGE_WORKERS`` is set, it runs in a background thread,
+otherwise during the request.
+
+    Attributes:
+        SOURCES (dict): {model label: ((model label, lookup, work ID
+            field), ...)}, queries with affected work IDs for each model
+        BATCH_SIZE (int): maximal number of works in one ``UPDATE``
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.timezone import now
+
+SOURCES = {
+    "music_publisher.Writer": (
+        ("music_publisher.WriterInWork", "writer", "work_id"),
+    ),
+    "music_publisher.Artist": (
+        ("music_publisher.ArtistInWork", "artist", "work_id"),
+        ("music_publisher.Recording", "artist", "work_id"),
+    ),
+    "music_publisher.Label": (
+        ("music_publisher.Recording", "record_label", "work_id"),
+        ("music_publisher.Track", "release__release_label", "recording__work"),
+    ),
+    "music_publisher.Library": (
+        ("music_publisher.Work", "library_release__library", "id"),
+    ),
+    "music_publisher.Release": (
+        ("music_publisher.Work", "library_release", "id"),
+        ("music_publisher.Track", "release", "recording__work"),
+    ),
+    "music_publisher.Recording": (
+        ("music_publisher.Recording", "id", "work_id"),
+    ),
+    "music_publisher.Track": (
+        ("music_publisher.Track", "id", "recording__work"),
+    ),
+}
+BATCH_SIZE = 900
+
+
+def get_label(model):
+    """Return the label of a model, or of the concrete one for proxies."""
+    return model._meta.concrete_model._meta.label
+
+
+def get_work_ids(label, pks):
+    """Return IDs of works affected by changes of objects.
+
+    Args:
+        label (str): model label, key in :data:`SOURCES`
+        pks (list): primary keys of changed objects
+
+    Returns:
+        set: work IDs
+    """
+    from .models import chunked  # models import this module
+
+    work_ids = set()
+    for chunk in chunked(pks, BATCH_SIZE):
+        querysets = [
+            apps.get_model(source)
+            ._base_manager.filter(**{lookup + "__in": chunk})
+            .values_list(field, flat=True)
+            .order_by()
+            for source, lookup, field in SOURCES[label]
+        ]
+        qs = querysets[0].union(*querysets[1:])
+        work_ids.update(qs)
+    work_ids.discard(None)
+    return work_ids
+
+
+def update_works(work_ids):
+    """Update ``last_change`` of works in batches.
+
+    Args:
+        work_ids (iterable): work IDs
+
+    Returns:
+        int: number of updated works
+    """
+    from .models import Work, chunked
+
+    timestamp = now()
+    count = 0
+    for chunk in chunked(sorted(work_ids), BATCH_SIZE):
+        count += Work.objects.filter(id__in=chunk).update(
+            last_change=timestamp
+        )
+    return count
+
+
+def propagate(label, pks, work_ids=()):
+    """Update ``last_change`` of works affected by changed objects.
+
+    Args:
+        label (str): model label, key in :data:`SOURCES`
+        pks (list): primary keys of changed objects
+        work_ids (iterable): other affected work IDs, e.g. collected
+            before the objects were deleted
+
+    Returns:
+        int: number of updated works
+    """
+    return update_works(get_work_ids(label, pks) | set(work_ids))
+
+
+def process(label, pks, work_ids=()):
+    """Propagate changes, used in workers."""
+    try:
+        propagate(label, pks, work_ids)
+    finally:
+        connection.close()
+
+
+@lru_cache(maxsize=None)
+def get_executor(workers):
+    """Return the thread pool with ``workers`` threads."""
+    return ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="dmp-changes"
+    )
+
+
+def schedule_propagation(label, pks, work_ids=()):
+    """Propagate changes after the current transaction is committed."""
+    workers = settings.OPTION_CHANGE_WORKERS
+    if workers:
+        func = partial(
+            get_executor(workers).submit, process, label, pks, work_ids
+        )
+    else:
+        func = partial(propagate, label, pks, work_ids)
+    transaction.on_commit(func)
+
+
+def has_changed(instance):
+    """Return ``True`` if an object about to be saved differs from the
+    database.
+
+    Also stores names of changed fields in ``_changed_fields``, and the
+    previous work of a recording moved to another one, it is affected too.
+    """
+    model = type(instance)
+    fields = [
+        f.attname
+        for f in model._meta.concrete_fields
+        if not f.primary_key and f.attname != "derivatives"
+    ]
+    old = model._base_manager.filter(pk=instance.pk).values(*fields).first()
+    if old is None:
+        return False
+    changed = [f for f in fields if old[f] != getattr(instance, f)]
+    instance._changed_fields = changed
+    if "work_id" in changed and old["work_id"]:
+        # recording moved to another work, the previous one is affected
+        instance._previous_work_ids = [old["work_id"]]
+    return bool(changed)
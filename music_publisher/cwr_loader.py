@@ -0,0 +1,248 @@
+"""Loading work data for CWR generation without model instances.
+
+:meth:`.models.WorkManager.get_dict` builds work dictionaries from model
+instances, with nine prefetched relations. CWR generation needs only some
+of that data, so here it is read with ``values_list`` projections, one
+query per relation for a chunk of works. Dictionaries are created with
+the same functions as ``get_dict`` methods of models use, e.g.
+:func:`.models.get_work_dict`, so they are the same as
+:meth:`.models.Work.get_dict` creates.
+
+Recordings are without release (``tracks``) data, which is not used in CWR.
+
+"""
+
+from collections import defaultdict
+
+from django.db.models import F
+
+from .models import (
+    AlternateTitle,
+    ArtistInWork,
+    Recording,
+    Work,
+    WorkAcknowledgement,
+    WriterInWork,
+    chunked,
+    get_agreement_dict,
+    get_alternate_title_dict,
+    get_artist_dict,
+    get_complete_titles,
+    get_label_dict,
+    get_library_dict,
+    get_origin_dict,
+    get_recording_code,
+    get_recording_dict,
+    get_work_code,
+    get_work_dict,
+    get_writer_dict,
+    get_writer_in_work_dict,
+)
+
+CHUNK_SIZE = 500
+
+ARTIST_FIELDS = (
+    "artist__id",
+    "artist__last_name",
+    "artist__first_name",
+    "artist__isni",
+)
+
+
+def get_artist(row):
+    """Return the artist dict from ``artist__`` fields, or ``None``."""
+    if row.artist__id is None:
+        return None
+    return get_artist_dict(
+        row.artist__id,
+        row.artist__last_name,
+        row.artist__first_name,
+        row.artist__isni,
+    )
+
+
+def get_writer_in_work(row):
+    """Return the writer in work dict from a row with writer fields."""
+    if row.writer_id is None:
+        return get_writer_in_work_dict(
+            None, row.controlled, row.relative_share, row.capacity, None
+        )
+    writer = get_writer_dict(
+        row.writer_id,
+        row.writer__first_name,
+        row.writer__last_name,
+        row.writer__ipi_name,
+        row.writer__ipi_base,
+        row.writer__account_number,
+        (
+            row.writer__pr_society,
+            row.writer__mr_society,
+            row.writer__sr_society,
+        ),
+    )
+    if row.controlled:
+        agreement = get_agreement_dict(
+            row.saan, row.writer__generally_controlled, row.writer__saan
+        )
+    else:
+        agreement = None
+    return get_writer_in_work_dict(
+        writer, row.controlled, row.relative_share, row.capacity, agreement
+    )
+
+
+def get_recording(row, work_title):
+    """Return the recording dict, without releases."""
+    recording_title, version_title = get_complete_titles(
+        work_title,
+        row.recording_title,
+        row.recording_title_suffix,
+        row.version_title,
+        row.version_title_suffix,
+    )
+    if row.record_label_id:
+        label = get_label_dict(row.record_label_id, row.record_label__name)
+    else:
+        label = None
+    return get_recording_dict(
+        row.id,
+        get_recording_code(row.id, row.recording_code),
+        work_title,
+        recording_title,
+        version_title,
+        row.release_date,
+        row.duration,
+        row.isrc,
+        get_artist(row),
+        label,
+    )
+
+
+def get_related_rows(model, ids, fields, **annotations):
+    """Return rows for works in ``ids``, grouped by work id.
+
+    Rows are in the default ordering of the model, as in prefetches.
+    """
+    rows = defaultdict(list)
+    qs = model.objects.filter(work_id__in=ids).annotate(**annotations)
+    qs = qs.order_by(*model._meta.ordering)
+    for row in qs.values_list("work_id", *fields, named=True):
+        rows[row.work_id].append(row)
+    return rows
+
+
+def get_work_dicts(ids):
+    """Yield work dicts for a chunk of work ids, in the order of ids."""
+    works = Work.objects.filter(id__in=ids).order_by()
+    works = works.annotate(work_code=F("_work_id")).values_list(
+        "id",
+        "work_code",
+        "title",
+        "last_change",
+        "original_title",
+        "iswc",
+        "library_release_id",
+        "library_release__cd_identifier",
+        "library_release__library_id",
+        "library_release__library__name",
+        named=True,
+    )
+    works = {row.id: row for row in works}
+    alt_titles = get_related_rows(
+        AlternateTitle, ids, ("title", "suffix", "title_type")
+    )
+    artists = get_related_rows(ArtistInWork, ids, ARTIST_FIELDS)
+    writers = get_related_rows(
+        WriterInWork,
+        ids,
+        (
+            "writer_id",
+            "controlled",
+            "relative_share",
+            "capacity",
+            "saan",
+            "writer__first_name",
+            "writer__last_name",
+            "writer__ipi_name",
+            "writer__ipi_base",
+            "writer__account_number",
+            "writer__pr_society",
+            "writer__mr_society",
+            "writer__sr_society",
+            "writer__generally_controlled",
+            "writer__saan",
+        ),
+    )
+    recordings = get_related_rows(
+        Recording,
+        ids,
+        (
+            "id",
+            "recording_code",
+            "recording_title",
+            "recording_title_suffix",
+            "version_title",
+            "version_title_suffix",
+            "release_date",
+            "duration",
+            "isrc",
+            "record_label_id",
+            "record_label__name",
+        )
+        + ARTIST_FIELDS,
+        recording_code=F("_recording_id"),
+    )
+    acks = get_related_rows(
+        WorkAcknowledgement, ids, ("society_code", "remote_work_id")
+    )
+    for work_id in ids:
+        row = works.get(work_id)
+        if row is None:
+            continue
+        if row.library_release_id:
+            origin = get_origin_dict(
+                row.library_release__cd_identifier,
+                get_library_dict(
+                    row.library_release__library_id,
+                    row.library_release__library__name,
+                ),
+            )
+        else:
+            origin = None
+        j = get_work_dict(
+            row.id,
+            get_work_code(row.id, row.work_code),
+            row.title,
+            row.last_change,
+            row.original_title,
+            row.iswc,
+            [
+                get_alternate_title_dict(
+                    row.title, at.title, at.suffix, at.title_type
+                )
+                for at in alt_titles[work_id]
+            ],
+            origin,
+            [get_writer_in_work(wiw) for wiw in writers[work_id]],
+            [{"artist": get_artist(aiw)} for aiw in artists[work_id]],
+            ((a.society_code, a.remote_work_id) for a in acks[work_id]),
+        )
+        j["recordings"] = [
+            get_recording(rec, row.title) for rec in recordings[work_id]
+        ]
+        yield j
+
+
+def get_cwr_dict_items(qs, chunk_size=CHUNK_SIZE):
+    """Yield work dicts for CWR generation, in the order of the queryset.
+
+    Args:
+        qs (django.db.models.query.QuerySet): :class:`.models.Work` queryset
+        chunk_size (int): number of works loaded at once
+
+    Yields:
+        dict: same as :meth:`.models.Work.get_dict`, without release data
+    """
+    ids = qs.values_list("id", flat=True)
+    for chunk in chunked(ids.iterator(), chunk_size):
+        yield from get_work_dicts(chunk)
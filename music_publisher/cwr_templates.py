@@ -1,5 +1,7 @@
 """Django templates for CWR generation.
 
+Templates are compiled when first rendered, see :class:`LazyTemplate`.
+
 Attributes:
     TEMPLATES_21 (dict): Record templates for CWR 2.1
     TEMPLATES_22 (dict): Record templates for CWR 2.2, based on 2.1
@@ -9,8 +11,37 @@ Attributes:
 
 from django.template import Template
 
+
+class LazyTemplate(object):
+    """Django template, compiled on first use.
+
+    Compiling all record templates takes a good part of the start-up time,
+    and most processes never generate a CWR file.
+
+    Attributes:
+        source (str): template source
+    """
+
+    __slots__ = ("source", "_template")
+
+    def __init__(self, source):
+        self.source = source
+        self._template = None
+
+    @property
+    def template(self):
+        """Return compiled :class:`django.template.Template`."""
+        if self._template is None:
+            self._template = Template(self.source)
+        return self._template
+
+    def render(self, context):
+        """Render the compiled template."""
+        return self.template.render(context)
+
+
 TEMPLATES_21 = {
-    "HDR": Template(
+    "HDR": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         'HDRPB{{ ipi_name_number|rjust:11|slice:"2:" }}'
         '{{ name|ljust:45 }}01.10{{ creation_date|date:"Ymd" }}'
@@ -18,7 +49,7 @@ TEMPLATES_21 = {
         "               \r\n{% endautoescape %}"
     ),
     # CWR 2.1 revision 8 "hack" - no sender type field, 11 digit IPI name
-    "HDR_8": Template(
+    "HDR_8": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "HDR{{ ipi_name_number|rjust:11 }}"
         "{{ name|ljust:45 }}01.10{{ "
@@ -27,12 +58,12 @@ TEMPLATES_21 = {
         'creation_date|date:"Ymd" }}'
         "               \r\n{% endautoescape %}"
     ),
-    "GRH": Template(
+    "GRH": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "GRH{{ transaction_type|ljust:3 }}0000102.10"
         "0000000000  \r\n{% endautoescape %}"
     ),
-    "WRK": Template(
+    "WRK": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "{{ record_type }}"
         "{{ transaction_sequence|rjust:8 }}00000000"
@@ -46,7 +77,7 @@ TEMPLATES_21 = {
         + "N"
         "\r\n{% endautoescape %}"
     ),
-    "SPU": Template(
+    "SPU": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "SPU{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ chain_sequence|rjust:2 }}"
@@ -62,7 +93,7 @@ TEMPLATES_21 = {
         "{{usa_license|ljust:1}}"
         "\r\n{% endautoescape %}"
     ),
-    "SPT": Template(
+    "SPT": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "SPT{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ code|ljust:9 }}"
@@ -71,7 +102,7 @@ TEMPLATES_21 = {
         "{{ sr_share|default:0|cwrshare }}"
         "I2136N001\r\n{% endautoescape %}"
     ),
-    "SWR": Template(
+    "SWR": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "SWR{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ code|ljust:9 }}"
@@ -83,7 +114,7 @@ TEMPLATES_21 = {
         " N  {{ ipi_base_number|ljust:13 }}             \r\n"
         "{% endautoescape %}"
     ),
-    "SWT": Template(
+    "SWT": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "SWT{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ code|ljust:9 }}"
@@ -91,7 +122,7 @@ TEMPLATES_21 = {
         "{{ mr_share|default:0|cwrshare }}"
         "{{ sr_share|default:0|cwrshare }}I2136N001\r\n{% endautoescape %}"
     ),
-    "PWR": Template(
+    "PWR": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "PWR{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ publisher_code|ljust:9 }}"
@@ -99,7 +130,7 @@ TEMPLATES_21 = {
         "{{ saan|ljust:14 }}"
         "{{ code|ljust:9 }}\r\n{% endautoescape %}"
     ),
-    "OPU": Template(
+    "OPU": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "OPU{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ sequence|rjust:2 }}"
@@ -111,7 +142,7 @@ TEMPLATES_21 = {
         " N                                             "
         "\r\n{% endautoescape %}"
     ),
-    "OWR": Template(
+    "OWR": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "OWR{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ code|ljust:9 }}"
@@ -123,27 +154,27 @@ TEMPLATES_21 = {
         "{{ sr_society|soc }}{{ sr_share|default:0|cwrshare }}    "
         "{{ ipi_base_number|ljust:13 }}             \r\n{% endautoescape %}"
     ),
-    "ALT": Template(
+    "ALT": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "ALT{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ alternate_title|ljust:60 }}{{ title_type|ljust:2 }}  "
         "\r\n{% endautoescape %}"
     ),
-    "OWK": Template(
+    "OWK": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "VER{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ work_title|ljust:60 }}"
         + " " * (11 + 2 + 45 + 30 + 60 + 11 + 13 + 45 + 30 + 11 + 13 + 14)
         + "\r\n{% endautoescape %}"
     ),
-    "PER": Template(
+    "PER": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "PER{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ last_name|ljust:45 }}"
         "{{ first_name|ljust:30 }}                        \r\n"
         "{% endautoescape %}"
     ),
-    "REC": Template(
+    "REC": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "REC{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}"
@@ -153,7 +184,7 @@ TEMPLATES_21 = {
         + " " * 151
         + "{{ isrc|ljust:12 }}     \r\n{% endautoescape %}"
     ),
-    "ORN": Template(
+    "ORN": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "ORN{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}LIB"
@@ -163,26 +194,26 @@ TEMPLATES_21 = {
         + "0000                  \r\n"
         "{% endautoescape %}"
     ),
-    "GRT": Template(
+    "GRT": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "GRT00001{{ transaction_count|rjust:8 }}"
         "{{ record_count|rjust:8 }}   0000000000\r\n{% endautoescape %}"
     ),
-    "TRL": Template(
+    "TRL": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "TRL00001{{ transaction_count|rjust:8 }}"
         "{{ record_count|rjust:8 }}{% endautoescape %}"
     ),
-    "OPT": Template(""),
-    "OWT": Template(""),
-    "XRF": Template(""),
-    "MAN": Template(""),
+    "OPT": LazyTemplate(""),
+    "OWT": LazyTemplate(""),
+    "XRF": LazyTemplate(""),
+    "MAN": LazyTemplate(""),
 }
 
 TEMPLATES_22 = TEMPLATES_21.copy()
 TEMPLATES_22.update(
     {
-        "HDR": Template(
+        "HDR": LazyTemplate(
             "{% load cwr_generators %}{% autoescape off %}"
             'HDRPB{{ ipi_name_number|rjust:11|slice:"2:" }}'
             '{{ name|ljust:45 }}01.10{{ creation_date|date:"Ymd" }}'
@@ -190,7 +221,7 @@ TEMPLATES_22.update(
             "               2.2002{{ settings.SOFTWARE|ljust:30 }}"
             "{{ settings.SOFTWARE_VERSION|ljust:30 }}\r\n{% endautoescape %}"
         ),
-        "HDR_8": Template(
+        "HDR_8": LazyTemplate(
             "{% load cwr_generators %}{% autoescape off %}"
             "HDR{{ ipi_name_number|rjust:11 }}"
             "{{ name|ljust:45 }}01.10{{ "
@@ -200,12 +231,12 @@ TEMPLATES_22.update(
             "               2.2002{{ settings.SOFTWARE|ljust:30 }}"
             "{{ settings.SOFTWARE_VERSION|ljust:30 }}\r\n{% endautoescape %}"
         ),
-        "GRH": Template(
+        "GRH": LazyTemplate(
             "{% load cwr_generators %}{% autoescape off %}"
             "GRH{{ transaction_type|ljust:3 }}0000102.20"
             "0000000000  \r\n{% endautoescape %}"
         ),
-        "PWR": Template(
+        "PWR": LazyTemplate(
             "{% load cwr_generators %}{% autoescape off %}"
             "PWR{{ transaction_sequence|rjust:8 }}"
             "{{ record_sequence|rjust:8 }}{{ publisher_code|ljust:9 }}"
@@ -213,7 +244,7 @@ TEMPLATES_22.update(
             "{{ saan|ljust:14 }}"
             "{{ code|ljust:9 }}01\r\n{% endautoescape %}"
         ),
-        "ORN": Template(
+        "ORN": LazyTemplate(
             "{% load cwr_generators %}{% autoescape off %}"
             "ORN{{ transaction_sequence|rjust:8 }}"
             "{{ record_sequence|rjust:8 }}LIB"
@@ -225,7 +256,7 @@ TEMPLATES_22.update(
             + "\r\n"
             "{% endautoescape %}"
         ),
-        "REC": Template(
+        "REC": LazyTemplate(
             "{% load cwr_generators %}{% autoescape off %}"
             "REC{{ transaction_sequence|rjust:8 }}"
             "{{ record_sequence|rjust:8 }}"
@@ -239,7 +270,7 @@ TEMPLATES_22.update(
             "{{ isrc_validity|ljust:20 }}{{ code|ljust:14 }}"
             "\r\n{% endautoescape %}"
         ),
-        "XRF": Template(
+        "XRF": LazyTemplate(
             "{% load cwr_generators %}{% autoescape off %}"
             "XRF{{ transaction_sequence|rjust:8 }}"
             "{{ record_sequence|rjust:8 }}{{ organization.code|soc }}"
@@ -249,7 +280,7 @@ TEMPLATES_22.update(
 )
 
 TEMPLATES_30 = {
-    "HDR": Template(
+    "HDR": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "HDRPB{{ code|ljust:4 }}"
         "{{ name|ljust:45 }}" + " " * 11 + '{{ creation_date|date:"Ymd" }}'
@@ -259,12 +290,12 @@ TEMPLATES_30 = {
         "{{ settings.SOFTWARE_VERSION|ljust:30 }}"
         "{{ filename|ljust:27 }}\r\n{% endautoescape %}"
     ),
-    "GRH": Template(
+    "GRH": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "GRH{{ transaction_type|ljust:3 }}0000103.000000000000"
         "\r\n{% endautoescape %}"
     ),
-    "WRK": Template(
+    "WRK": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "WRK{{ transaction_sequence|rjust:8 }}00000000"
         "{{ work_title|ljust:60 }}  {{ code|ljust:14 }}"
@@ -274,7 +305,7 @@ TEMPLATES_30 = {
         + " " * 51
         + "N\r\n{% endautoescape %}"
     ),
-    "SPU": Template(
+    "SPU": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "SPU{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}01"
@@ -283,7 +314,7 @@ TEMPLATES_30 = {
         "000000000{{ ipi_name_number|rjust:11 }}"
         "{{ ipi_base_number|ljust:13 }} \r\n{% endautoescape %}"
     ),
-    "SPT": Template(
+    "SPT": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "SPT{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}001{{ code|ljust:9 }}"
@@ -294,7 +325,7 @@ TEMPLATES_30 = {
         "{{ mr_society|ljust:4 }}"
         "{{ sr_society|ljust:4 }}" + " " * 32 + "0000\r\n{% endautoescape %}"
     ),
-    "SWR": Template(
+    "SWR": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "SWR{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ code|ljust:9 }}"
@@ -303,7 +334,7 @@ TEMPLATES_30 = {
         "{{ ipi_base_number|ljust:13 }} N  \r\n"
         "{% endautoescape %}"
     ),
-    "SWT": Template(
+    "SWT": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "SWT{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}001{{ code|ljust:9 }}"
@@ -314,7 +345,7 @@ TEMPLATES_30 = {
         + " " * 32
         + "0000\r\n{% endautoescape %}"
     ),
-    "OWT": Template(
+    "OWT": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "OWT{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}001{{ code|ljust:9 }}"
@@ -326,7 +357,7 @@ TEMPLATES_30 = {
         + " " * 32
         + "0000\r\n{% endautoescape %}"
     ),
-    "PWR": Template(
+    "PWR": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "PWR{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}"
@@ -336,14 +367,14 @@ TEMPLATES_30 = {
         "{{ original_publishers.0.agreement.agreement_type.code|ljust:2 }}"
         "\r\n{% endautoescape %}"
     ),
-    "OPU": Template(
+    "OPU": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "OPU{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ sequence|rjust:2 }}"
         + " " * 54
         + "YE 00000000000000000000              \r\n{% endautoescape %}"
     ),
-    "OPT": Template(
+    "OPT": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "OPT{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}001         "
@@ -352,7 +383,7 @@ TEMPLATES_30 = {
         "{{ sr_share|default:0|cwrshare }}I2136" + " " * 44 + "0000\r\n"
         "{% endautoescape %}"
     ),
-    "OWR": Template(
+    "OWR": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "OWR{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ code|ljust:9 }}"
@@ -362,20 +393,20 @@ TEMPLATES_30 = {
         "{{ ipi_base_number|ljust:13 }} N  \r\n"
         "{% endautoescape %}"
     ),
-    "ALT": Template(
+    "ALT": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "ALT{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ alternate_title|ljust:60 }}{{ title_type|ljust:2 }}  "
         "\r\n{% endautoescape %}"
     ),
-    "OWK": Template(
+    "OWK": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "OWK{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ work_title|ljust:60 }}"
         + " " * (11 + 14 + 50 + 8 + 45 + 30 + 11 + 13 + 45 + 30 + 11 + 13)
         + "\r\n{% endautoescape %}"
     ),
-    "PER": Template(
+    "PER": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "PER{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ last_name|ljust:45 }}"
@@ -383,7 +414,7 @@ TEMPLATES_30 = {
         + " " * 11
         + "{{ isni|ljust:16 }}     \r\n{% endautoescape %}"
     ),
-    "REC": Template(
+    "REC": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "REC{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}"
@@ -396,7 +427,7 @@ TEMPLATES_30 = {
         "{{ isrc_validity|ljust:20 }}{{ code|ljust:14 }}\r\n"
         "{% endautoescape %}"
     ),
-    "ORN": Template(
+    "ORN": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "ORN{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}LIB"
@@ -407,19 +438,19 @@ TEMPLATES_30 = {
         + " " * (19 + 26 + 21 + 40)
         + "\r\n{% endautoescape %}"
     ),
-    "XRF": Template(
+    "XRF": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "XRF{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ organization.code|ljust:4 }}"
         "{{ identifier|ljust:14 }}WY\r\n{% endautoescape %}"
     ),
-    "ISR": Template(
+    "ISR": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "ISR{{ transaction_sequence|rjust:8 }}00000000"
         "{{ work_title|ljust:60 }}  {{ work_id|ljust:14 }}"
         "{{ iswc|ljust:11 }}{{ indicator|ljust:1 }}\r\n{% endautoescape %}"
     ),
-    "WRI": Template(
+    "WRI": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "WRI{{ transaction_sequence|rjust:8 }}"
         "{{ record_sequence|rjust:8 }}{{ code|ljust:9 }}"
@@ -427,23 +458,23 @@ TEMPLATES_30 = {
         "{{ first_name|ljust:30 }}{{ capacity|ljust:2 }}\r\n"
         "{% endautoescape %}"
     ),
-    "GRT": Template(
+    "GRT": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "GRT00001{{ transaction_count|rjust:8 }}"
         "{{ record_count|rjust:8 }}\r\n{% endautoescape %}"
     ),
-    "TRL": Template(
+    "TRL": LazyTemplate(
         "{% load cwr_generators %}{% autoescape off %}"
         "TRL00001{{ transaction_count|rjust:8 }}"
         "{{ record_count|rjust:8 }}{% endautoescape %}"
     ),
-    "MAN": Template(""),
+    "MAN": LazyTemplate(""),
 }
 
 TEMPLATES_31 = TEMPLATES_30.copy()
 TEMPLATES_31.update(
     {
-        "HDR": Template(
+        "HDR": LazyTemplate(
             "{% load cwr_generators %}{% autoescape off %}"
             "HDRPB{{ code|ljust:4 }}"
             "{{ name|ljust:45 }}" + " " * 11 + '{{ creation_date|date:"Ymd" }}'
@@ -453,12 +484,12 @@ TEMPLATES_31.update(
             "{{ settings.SOFTWARE_VERSION|ljust:30 }}"
             "{{ filename|ljust:27 }}\r\n{% endautoescape %}"
         ),
-        "GRH": Template(
+        "GRH": LazyTemplate(
             "{% load cwr_generators %}{% autoescape off %}"
             "GRHWRK0000103.100000000000"
             "\r\n{% endautoescape %}"
         ),
-        "MAN": Template(
+        "MAN": LazyTemplate(
             "{% load cwr_generators %}{% autoescape off %}"
             "MAN{{ transaction_sequence|rjust:8 }}"
             "{{ record_sequence|rjust:8 }}{{ code|ljust:9 }}"
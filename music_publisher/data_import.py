@@ -4,19 +4,25 @@ All the code related to importing data from external files.
 Currently, only works (with writers, artists, library data and ISRCs) are
 imported. (ISRCs will be used for importing recording data the in future.)
 
+Files can be validated first, see :meth:`DataImporter.validate`. All rows
+are checked without saving anything, and all errors are reported at once.
+
 """
 
 import csv
 import re
 from collections import defaultdict, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from decimal import Decimal
+from functools import partial
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError, transaction
 from django.forms import inlineformset_factory
 from django.utils.text import slugify
 
-from .societies import SOCIETIES
+from .societies import NO_SOCIETY, SOCIETIES
 from .models import (
     Work,
     Artist,
@@ -28,13 +34,23 @@ from .models import (
     LibraryRelease,
     Recording,
     WorkAcknowledgement,
+    WorkRegistrationStatus,
+    chunked,
 )
 from .forms import WriterInWorkFormSet
+from .work_index import get_work_index
 from django.utils.timezone import now
 
 
 class DataImporter(object):
-    """ """
+    """Import works from a CSV file.
+
+    Attributes:
+        parallel_min_rows (int): minimal number of rows for validation in
+            worker processes
+    """
+
+    parallel_min_rows = 1000
 
     FLAT_FIELDS = [
         "work_id",
@@ -92,6 +108,11 @@ class DataImporter(object):
         self.reader = csv.DictReader(filelike)
         self.report = ""
         self.unknown_keys = set()
+        self.columns = {}
+        self.cache = {}
+        self.validate_only = False
+        self.unsaved = []
+        self.acknowledged_work_ids = set()
 
     def log(self, obj, message, change=False):
         """Helper function for logging history."""
@@ -113,6 +134,24 @@ class DataImporter(object):
             message,
         )
 
+    def save(self, obj, message=None, change=False):
+        """Save and log an object, only collect it when validating."""
+        if self.validate_only:
+            self.unsaved.append(obj)
+            return
+        obj.save()
+        if message:
+            self.log(obj, message, change=change)
+
+    def clean(self, obj):
+        """Clean and validate an object related to the imported work.
+
+        When validating, the work is not saved and writers are already
+        checked, so relations are not validated, without queries."""
+        exclude = ["work", "writer"] if self.validate_only else None
+        obj.clean_fields(exclude=exclude)
+        obj.clean()
+
     @staticmethod
     def get_clean_key(value, tup, name):
         """Try to match either key or value from a user input mess."""
@@ -127,108 +166,124 @@ class DataImporter(object):
                 'Unknown value: "{}" for "{}".'.format(value, name)
             )
 
+    @classmethod
+    def clean_writer_role(cls, value):
+        value = cls.get_clean_key(
+            value.ljust(2), WriterInWork.ROLES, "writer role"
+        )
+        return value.ljust(2), False
+
+    @classmethod
+    def clean_writer_society(cls, value):
+        value = cls.get_clean_key(value, SOCIETIES + (NO_SOCIETY,), "society")
+        return value, False
+
+    @staticmethod
+    def clean_writer_share(value):
+        if isinstance(value, str) and value[-1] == "%":
+            value = Decimal(value[0:-1])
+        else:
+            value = Decimal(value) * 100
+        return value.quantize(Decimal("0.01")), False
+
+    @staticmethod
+    def clean_writer_controlled(value):
+        """Controlled is a boolean, "G" also means general agreement."""
+        general_agreement = False
+        if isinstance(value, str):
+            value = value[0].upper()
+            if not value or value in ["N", "F"]:  # F for False
+                value = False
+            else:
+                if value == "G":
+                    general_agreement = True
+                value = True
+        else:
+            value = bool(value)
+        return value, general_agreement
+
+    @staticmethod
+    def clean_writer_other(value):
+        return value, False
+
+    def get_writer_cleaner(self, field):
+        """Return the function cleaning values for a writer field.
+
+        Functions return a tuple: value and general agreement."""
+        if field == "role":
+            return self.clean_writer_role
+        elif field == "pro":
+            return self.clean_writer_society
+        elif field in self.SHARE_FIELDS:
+            return self.clean_writer_share
+        elif field == "controlled":
+            return self.clean_writer_controlled
+        return self.clean_writer_other
+
     def process_writer_value(self, key, key_elements, value):
         """Clean a value for a writer and return it.
 
         If it is a 'controlled', then also calculate general agreement.
         Always return a tuple."""
 
-        general_agreement = False
         if len(key_elements) < 3 or key_elements[2] not in self.WRITER_FIELDS:
             raise AttributeError('Unknown column: "{}".'.format(key))
-        if key_elements[2] == "role":
-            value = self.get_clean_key(
-                value.ljust(2), WriterInWork.ROLES, "writer role"
-            )
-            value = value.ljust(2)
-        elif key_elements[2] == "pro":
-            value = self.get_clean_key(
-                value, SOCIETIES + [("99", "NO SOCIETY")], "society"
-            )
-        elif key_elements[2] in self.SHARE_FIELDS:
-            if isinstance(value, str) and value[-1] == "%":
-                value = Decimal(value[0:-1])
-            else:
-                value = Decimal(value) * 100
-            value = value.quantize(Decimal("0.01"))
-        elif key_elements[2] == "controlled":
-            if isinstance(value, str):
-                value = value[0].upper()
-                if not value or value in ["N", "F"]:  # F for False
-                    value = False
-                else:
-                    if value == "G":
-                        general_agreement = True
-                    value = True
-            else:
-                value = bool(value)
-        return value, general_agreement
+        return self.get_writer_cleaner(key_elements[2])(value)
 
-    def unflatten_writer_record(self, out_dict, clean_key, key, value):
-        key_elements = clean_key.split("_", 2)
-        if len(key_elements) < 3 or key_elements[2] not in self.WRITER_FIELDS:
-            self.unknown_keys.add(key)
-            return
-        value, general_agreement = self.process_writer_value(
-            key, key_elements, value
-        )
+    @staticmethod
+    def set_value(name, out_dict, value):
+        out_dict[name] = value
+
+    @staticmethod
+    def append_alt_title(out_dict, value):
+        out_dict["alt_titles"].append(value)
+
+    @staticmethod
+    def set_nested_value(group, number, field, out_dict, value):
+        out_dict[group][number][field] = value
+
+    @staticmethod
+    def set_writer_value(number, field, cleaner, out_dict, value):
+        value, general_agreement = cleaner(value)
         if general_agreement:
-            out_dict["writers"][key_elements[1]]["general_agreement"] = True
-        out_dict["writers"][key_elements[1]][key_elements[2]] = value
+            out_dict["writers"][number]["general_agreement"] = True
+        out_dict["writers"][number][field] = value
 
-    def unflatten_record(self, out_dict, key, value):
-        if value is None:
-            return
-        if isinstance(value, str):
-            value = value.strip()
+    def compile_column(self, key):
+        """Return the plan for a column, ``None`` if it is unknown.
+
+        The plan is a function that cleans a value from the column and puts
+        it into the unflattened dictionary."""
         clean_key = slugify(key).replace("-", "_")
         prefix = clean_key.split("_")[0]
-        if value == "":
-            return
         if clean_key in self.FLAT_FIELDS:
-            out_dict[clean_key] = value
+            return partial(self.set_value, clean_key)
         elif prefix == "alt":
             key_elements = clean_key.rsplit("_", 1)
             if len(key_elements) < 2 or key_elements[0] != "alt_title":
-                self.unknown_keys.add(key)
-                return
-            out_dict["alt_titles"].append(value)
-        elif prefix == "writer":
-            return self.unflatten_writer_record(
-                out_dict, clean_key, key, value
-            )
-        elif prefix == "artist":
-            key_elements = clean_key.split("_", 2)
-            if (
-                len(key_elements) < 3
-                or key_elements[2] not in self.ARTIST_FIELDS
-            ):
-                self.unknown_keys.add(key)
-                return
-            out_dict["artists"][key_elements[1]][key_elements[2]] = value
-        elif prefix == "recording":
-            key_elements = clean_key.split("_", 2)
-            if (
-                len(key_elements) < 3
-                or key_elements[2] not in self.RECORDING_FIELDS
-            ):
-                self.unknown_keys.add(key)
-                return
-            out_dict["recordings"][key_elements[1]][key_elements[2]] = value
-        elif prefix == "reference":
-            key_elements = clean_key.split("_", 2)
-            if (
-                len(key_elements) < 3
-                or key_elements[2] not in self.REFERENCE_FIELDS
-            ):
-                self.unknown_keys.add(key)
-                return
-            out_dict["references"][key_elements[1]][key_elements[2]] = value
-        else:
-            self.unknown_keys.add(key)
+                return None
+            return self.append_alt_title
+        key_elements = clean_key.split("_", 2)
+        if len(key_elements) < 3:
+            return None
+        number, field = key_elements[1:]
+        if prefix == "writer" and field in self.WRITER_FIELDS:
+            cleaner = self.get_writer_cleaner(field)
+            return partial(self.set_writer_value, number, field, cleaner)
+        fields = {
+            "artist": self.ARTIST_FIELDS,
+            "recording": self.RECORDING_FIELDS,
+            "reference": self.REFERENCE_FIELDS,
+        }.get(prefix, [])
+        if field in fields:
+            return partial(self.set_nested_value, prefix + "s", number, field)
+        return None
 
     def unflatten(self, in_dict):
-        """Create a well-structured dictionary with cleaner values."""
+        """Create a well-structured dictionary with cleaner values.
+
+        Columns are compiled once, on first use, see
+        :meth:`compile_column`."""
         out_dict = {
             "alt_titles": [],
             "writers": defaultdict(OrderedDict),
@@ -236,10 +291,72 @@ class DataImporter(object):
             "recordings": defaultdict(OrderedDict),
             "references": defaultdict(OrderedDict),
         }
+        columns = self.columns
         for key, value in in_dict.items():
-            self.unflatten_record(out_dict, key, value)
+            if value is None:
+                continue
+            if isinstance(value, str):
+                value = value.strip()
+                if value == "":
+                    continue
+            try:
+                column = columns[key]
+            except KeyError:
+                column = columns[key] = self.compile_column(key)
+            if column is None:
+                self.unknown_keys.add(key)
+            else:
+                column(out_dict, value)
         return out_dict
 
+    @staticmethod
+    def get_person_key(last_name, first_name, code):
+        """Return the cache key for a writer or artist.
+
+        Names are compared case-insensitively, as in lookups with
+        ``iexact``."""
+        return (last_name or "").upper(), (first_name or "").upper(), code
+
+    def get_cache(self, name):
+        """Return the import-scoped cache for writers, artists, libraries or
+        library releases.
+
+        Each cache is loaded with one query on first use and updated as
+        objects are created, so entities are not looked up for every row.
+        Objects are loaded in model ordering and the first one is kept for
+        each key, same as with ``.first()``.
+
+        Returns:
+            tuple: for writers and artists, {name and code key: object} and
+                {code: object}, for libraries {name: object} and for library
+                releases {(library id, CD identifier): object}
+        """
+        if name in self.cache:
+            return self.cache[name]
+        if name in ("writers", "artists"):
+            model, field = {
+                "writers": (Writer, "ipi_name"),
+                "artists": (Artist, "isni"),
+            }[name]
+            by_key, by_code = {}, {}
+            for obj in model.objects.all():
+                code = getattr(obj, field)
+                key = self.get_person_key(obj.last_name, obj.first_name, code)
+                by_key.setdefault(key, obj)
+                if code:
+                    by_code[code] = obj
+            self.cache[name] = by_key, by_code
+        elif name == "libraries":
+            self.cache[name] = {}
+            for library in Library.objects.all():
+                self.cache[name].setdefault(library.name.upper(), library)
+        elif name == "library_releases":
+            self.cache[name] = {}
+            for release in LibraryRelease.objects.all():
+                key = (release.library_id, release.cd_identifier.upper())
+                self.cache[name].setdefault(key, release)
+        return self.cache[name]
+
     def get_writers(self, writer_dict):
         """Yield Writer objects, create if needed."""
         for value in writer_dict.values():
@@ -280,11 +397,13 @@ class DataImporter(object):
             )
             lookup_writer.clean_fields()
             lookup_writer.clean()
-            writer = Writer.objects.filter(
-                last_name__iexact=lookup_writer.last_name,
-                first_name__iexact=lookup_writer.first_name,
-                ipi_name=None if ipi_name_unset else lookup_writer.ipi_name,
-            ).first()
+            writers, writers_by_ipi = self.get_cache("writers")
+            key = self.get_person_key(
+                lookup_writer.last_name,
+                lookup_writer.first_name,
+                None if ipi_name_unset else lookup_writer.ipi_name,
+            )
+            writer = writers.get(key)
             if writer:
                 # No existing general agreement for this writer
                 if (
@@ -293,8 +412,7 @@ class DataImporter(object):
                 ):
                     writer.saan = saan
                     writer.generally_controlled = True
-                    writer.save()
-                    self.log(
+                    self.save(
                         writer,
                         "General agreement set during import.",
                         change=True,
@@ -320,8 +438,9 @@ class DataImporter(object):
             else:
                 writer = lookup_writer
                 try:
-                    writer.save()
-                    self.log(writer, "Added during import.")
+                    if writer.ipi_name in writers_by_ipi:
+                        raise IntegrityError()
+                    self.save(writer, "Added during import.")
                 except IntegrityError:
                     raise ValueError(
                         "A writer with this IPI already "
@@ -330,6 +449,9 @@ class DataImporter(object):
                             writer
                         )
                     )
+                writers[key] = writer
+                if writer.ipi_name:
+                    writers_by_ipi[writer.ipi_name] = writer
             yield writer
 
     def get_artists(self, artist_dict):
@@ -342,16 +464,19 @@ class DataImporter(object):
             )
             lookup_artist.clean_fields()
             lookup_artist.clean()
-            artist = Artist.objects.filter(
-                last_name__iexact=lookup_artist.last_name,
-                first_name__iexact=lookup_artist.first_name,
-                isni=lookup_artist.isni,
-            ).first()
+            artists, artists_by_isni = self.get_cache("artists")
+            key = self.get_person_key(
+                lookup_artist.last_name,
+                lookup_artist.first_name,
+                lookup_artist.isni,
+            )
+            artist = artists.get(key)
             if not artist:
                 artist = lookup_artist
                 try:
-                    artist.save()
-                    self.log(artist, "Added during import.")
+                    if artist.isni in artists_by_isni:
+                        raise IntegrityError()
+                    self.save(artist, "Added during import.")
                 except IntegrityError:
                     raise ValueError(
                         "An artist with this ISNI already "
@@ -360,40 +485,49 @@ class DataImporter(object):
                             artist
                         )
                     )
+                artists[key] = artist
+                if artist.isni:
+                    artists_by_isni[artist.isni] = artist
             yield artist
 
     def get_library_release(self, library_name, cd_identifier):
         """Yield LibraryRelease objects, create if needed."""
         lookup_library = Library(name=library_name)
         lookup_library.clean_fields()
-        library = Library.objects.filter(
-            name__iexact=lookup_library.name
-        ).first()
+        libraries = self.get_cache("libraries")
+        library = libraries.get(lookup_library.name.upper())
         if not library:
             library = lookup_library
-            library.save()
-            self.log(library, "Added during import.")
+            self.save(library, "Added during import.")
+            libraries[library.name.upper()] = library
         lookup_library_release = LibraryRelease(
             library_id=library.id, cd_identifier=cd_identifier
         )
-        library_release = LibraryRelease.objects.filter(
-            library_id=lookup_library_release.library_id,
-            cd_identifier__iexact=lookup_library_release.cd_identifier,
-        ).first()
+        library_releases = self.get_cache("library_releases")
+        key = (library.id, lookup_library_release.cd_identifier.upper())
+        library_release = library_releases.get(key)
         if not library_release:
             library_release = lookup_library_release
-            library_release.save()
-            self.log(library_release, "Added during import.")
+            self.save(library_release, "Added during import.")
+            library_releases[key] = library_release
         return library_release
 
-    def process_row(self, row):
-        """Process one row from the incoming data."""
+    @staticmethod
+    def is_empty(row):
+        """Return ``True`` if all values in the row are empty."""
         for value in row.values():
             if value.strip():
-                break
-        else:
+                return False
+        return True
+
+    def process_row(self, row):
+        """Process one row from the incoming data."""
+        if self.is_empty(row):
             return
-        row_dict = self.unflatten(row)
+        yield from self.process_row_dict(self.unflatten(row))
+
+    def process_row_dict(self, row_dict):
+        """Process one unflattened row."""
         writers = self.get_writers(row_dict["writers"])
         artists = self.get_artists(row_dict["artists"])
         library = row_dict.get("library")
@@ -414,10 +548,12 @@ class DataImporter(object):
             original_title=row_dict.get("original_title", ""),
             library_release=library_release,
         )
-        work.clean_fields()
+        work.clean_fields(
+            exclude=["library_release"] if self.validate_only else None
+        )
         work.clean()
         try:
-            work.save()
+            self.save(work, "Added during import.")
         except IntegrityError:
             raise ValidationError(
                 f'Work "{ work.title }", '
@@ -426,9 +562,9 @@ class DataImporter(object):
                 + "clashes with an existing work. "
                 "Data imports can only be used for adding new works."
             )
-        self.log(work, "Added during import.")
-        for artist in set(artists):
-            ArtistInWork(artist=artist, work=work).save()
+        # artists are not hashable when validating, as they are not saved
+        for artist in {id(artist): artist for artist in artists}.values():
+            self.save(ArtistInWork(artist=artist, work=work))
         wiws = []
         for w_dict in row_dict["writers"].values():
             writer = next(writers)
@@ -448,9 +584,8 @@ class DataImporter(object):
                 controlled=w_dict.get("controlled", False),
                 saan=saan,
             )
-            wiw.clean_fields()
-            wiw.clean()
-            wiw.save()
+            self.clean(wiw)
+            self.save(wiw)
             wiws.append(wiw)
         factory_fields = [
             "work",
@@ -483,9 +618,8 @@ class DataImporter(object):
         formset.clean()
         for alt_title in row_dict["alt_titles"]:
             at = AlternateTitle(work=work, title=alt_title)
-            at.clean_fields()
-            at.clean()
-            at.save()
+            self.clean(at)
+            self.save(at)
         for recording in row_dict["recordings"].values():
             recording = Recording(
                 work=work,
@@ -495,10 +629,8 @@ class DataImporter(object):
                 recording_title=recording.get("recording_title", ""),
                 version_title=recording.get("version_title", ""),
             )
-            recording.clean_fields()
-            recording.clean()
-            recording.save()
-            self.log(recording, "Added during import.")
+            self.clean(recording)
+            self.save(recording, "Added during import.")
         for reference in row_dict["references"].values():
             society_code = self.get_clean_key(
                 reference.get("cmo", "") or "", SOCIETIES, "reference cmo"
@@ -510,13 +642,185 @@ class DataImporter(object):
                 status="AS",
                 date=now(),
             )
-            workack.clean_fields()
-            workack.clean()
-            workack.save()
-            self.log(workack, "Added during import.")
+            self.clean(workack)
+            self.save(workack, "Added during import.")
+            self.acknowledged_work_ids.add(work.id)
         yield work
 
     def run(self):
         """Run the import."""
         for row in self.reader:
             yield from self.process_row(row)
+        WorkRegistrationStatus.objects.refresh(
+            sorted(self.acknowledged_work_ids)
+        )
+
+    def validate(self):
+        """Validate all rows without saving anything.
+
+        Rows are validated in ``OPTION_IMPORT_PROCESSES`` worker processes,
+        if set and the file has at least :attr:`parallel_min_rows` rows.
+        Writers, artists and libraries are loaded here and passed to
+        workers, so workers make no queries. Then writers and artists are
+        checked across rows, and work IDs, ISWCs and ISRCs across rows and
+        against the database.
+
+        Returns:
+            list: (line number, error message) tuples, sorted by line
+        """
+        self.validate_only = True
+        rows = [(self.reader.line_num, row) for row in self.reader]
+        processes = settings.OPTION_IMPORT_PROCESSES
+        if processes > 1 and len(rows) >= self.parallel_min_rows:
+            for name in (
+                "writers",
+                "artists",
+                "libraries",
+                "library_releases",
+            ):
+                self.get_cache(name)
+            chunk_size = max(1, min(500, len(rows) // (processes * 4)))
+            with ProcessPoolExecutor(
+                processes,
+                initializer=init_validation_worker,
+                initargs=(self.cache,),
+            ) as executor:
+                results = []
+                for chunk_results, unknown_keys in executor.map(
+                    validate_rows, chunked(rows, chunk_size)
+                ):
+                    results += chunk_results
+                    self.unknown_keys |= unknown_keys
+        else:
+            results, unknown_keys = validate_rows(rows)
+            self.unknown_keys |= unknown_keys
+
+        # writers and artists new in this file, across rows
+        self.cache = {"writers": ({}, {}), "artists": ({}, {})}
+        codes = defaultdict(dict)
+        errors = []
+        for line, error, result in results:
+            if error:
+                errors.append((line, error))
+                continue
+            writers, artists, row_codes = result
+            try:
+                list(self.get_writers(writers))
+                list(self.get_artists(artists))
+                for label, value in row_codes:
+                    if value in codes[label]:
+                        raise ValueError(
+                            '{} "{}" is also in line {}.'.format(
+                                label, value, codes[label][value]
+                            )
+                        )
+                    codes[label][value] = line
+            except Exception as e:  # user garbage, too many possibilities
+                errors.append((line, get_error_message(e)))
+        errors += self.get_clashes(codes)
+        return sorted(errors)
+
+    @staticmethod
+    def get_clashes(codes):
+        """Return errors for codes that already exist in the database.
+
+        Codes are looked up in the :mod:`.work_index`.
+
+        Args:
+            codes (dict): {label: {code: line number}}
+
+        Returns:
+            list: (line number, error message) tuples
+        """
+        index = get_work_index()
+        errors = []
+        for label, kind, name in (
+            ("Work ID", "WORK_ID", "work"),
+            ("ISWC", "ISWC", "work"),
+            ("ISRC", "ISRC", "recording"),
+        ):
+            for value in index.lookup(kind, codes[label]):
+                errors.append(
+                    (
+                        codes[label][value],
+                        '{} "{}" clashes with an existing {}.'.format(
+                            label, value, name
+                        ),
+                    )
+                )
+        return errors
+
+
+def get_error_message(error):
+    """Return the message of an exception raised while processing a row."""
+    if isinstance(error, ValidationError):
+        return " ".join(error.messages)
+    return str(error)
+
+
+worker_cache = None
+
+
+def init_validation_worker(cache):
+    """Initialize a worker process for parallel validation.
+
+    ``django.setup()`` is required with ``spawn`` start method, harmless
+    with ``fork``.
+
+    Args:
+        cache (dict): :attr:`DataImporter.cache` from the main process
+    """
+    import django
+
+    global worker_cache
+
+    django.setup()
+    worker_cache = cache
+
+
+def validate_rows(rows):
+    """Validate rows, in a worker process or in the main one.
+
+    Args:
+        rows (list): (line number, row) tuples
+
+    Returns:
+        tuple: list of (line number, error message, result) tuples and
+            the set of unknown columns; result is ``None`` for invalid rows,
+            otherwise writers and artists from the row and (label, code)
+            tuples for work IDs, ISWCs and ISRCs
+    """
+    importer = DataImporter([])
+    importer.validate_only = True
+    if worker_cache is not None:
+        importer.cache = worker_cache
+    results = []
+    for line, row in rows:
+        importer.unsaved = []
+        try:
+            if importer.is_empty(row):
+                continue
+            row_dict = importer.unflatten(row)
+            for work in importer.process_row_dict(row_dict):
+                pass
+        except Exception as e:  # user garbage, too many possibilities
+            results.append((line, get_error_message(e), None))
+            continue
+        codes = [("Work ID", work._work_id), ("ISWC", work.iswc)]
+        codes += [
+            ("ISRC", obj.isrc)
+            for obj in importer.unsaved
+            if isinstance(obj, Recording)
+        ]
+        results.append(
+            (
+                line,
+                None,
+                (
+                    row_dict["writers"],
+                    row_dict["artists"],
+                    [(label, code) for label, code in codes if code],
+                ),
+            )
+        )
+    return results, importer.unknown_keys
@@ -285,6 +285,11 @@ class DataImportForm(ModelForm):
 
     data_file = FileField()
     ignore_unknown_columns = BooleanField(required=False, initial=False)
+    validate_only = BooleanField(
+        required=False,
+        initial=False,
+        help_text="Report errors in all rows, do not import.",
+    )
 
     def clean(self):
         """
@@ -302,6 +307,8 @@ class DataImportForm(ModelForm):
 
         cd = self.cleaned_data
         f = cd.get("data_file")
+        if cd.get("validate_only"):
+            self.validate_file(f, cd.get("ignore_unknown_columns"))
         report = ""
         with transaction.atomic():
             try:
@@ -331,3 +338,27 @@ class DataImportForm(ModelForm):
             except Exception as e:  # user garbage, too many possibilities
                 raise ValidationError(str(e))
         self.cleaned_data["report"] = report
+
+    def validate_file(self, f, ignore_unknown_columns):
+        """Validate all rows and report errors, nothing is imported.
+
+        Raises:
+            ValidationError: always, with the report
+        """
+        from .data_import import DataImporter
+        from io import TextIOWrapper
+
+        try:
+            importer = DataImporter(TextIOWrapper(f), self.user)
+            errors = importer.validate()
+        except Exception as e:  # user garbage, too many possibilities
+            raise ValidationError(str(e))
+        messages = ["Validation only, nothing was imported."]
+        if importer.unknown_keys and not ignore_unknown_columns:
+            messages.append(
+                "Unknown columns: " + ", ".join(sorted(importer.unknown_keys))
+            )
+        messages += ["Line {}: {}".format(*error) for error in errors]
+        if len(messages) == 1:
+            messages.append("No errors found.")
+        raise ValidationError(messages)
@@ -0,0 +1,270 @@
+"""Per-request query and timing instrumentation.
+
+Instrumentation is opt-in, set ``OPTION_INSTRUMENTATION`` to enable
+:class:`InstrumentationMiddleware`. For every request, it records the
+number of database queries, duplicate queries (same SQL and parameters),
+similar queries (same SQL, usually a sign of a missing
+``select_related`` or ``prefetch_related``), time spent in the database
+and in Python. If ``OPTION_INSTRUMENTATION`` is set to ``memory``, peak
+memory is recorded as well, using :mod:`tracemalloc`, which makes
+everything slower. Peak memory is for the whole process, so it is only
+accurate if requests are not served concurrently.
+
+Admin actions are recorded separately from other views, e.g.
+``admin:music_publisher_work_changelist create_cwr``. For streaming
+responses, queries and memory are recorded until the response is returned,
+time until the last chunk is sent.
+
+Recent profiles are kept in memory, in each process, and shown on a
+staff-only page. Each profile is also logged as a JSON line to the
+``music_publisher.instrumentation`` logger.
+
+:func:`instrument` records any block of code, e.g. in management commands.
+
+    Attributes:
+        PROFILES (collections.deque): recent profiles, newest last
+"""
+
+import json
+import logging
+import time
+import tracemalloc
+from collections import Counter, deque
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.urls import Resolver404, resolve
+from django.utils.decorators import method_decorator
+from django.utils.timezone import now
+from django.views.generic import TemplateView
+
+logger = logging.getLogger(__name__)
+
+BUFFER_SIZE = 100
+PROFILES = deque(maxlen=BUFFER_SIZE)
+
+
+class Profile(object):
+    """Queries, time and memory of one request or block of code.
+
+    Attributes:
+        label (str): view name, admin action or any other label
+        started (datetime.datetime): start time
+        queries (int): number of queries
+        duplicates (int): queries with the same SQL and parameters as an
+            earlier one
+        similar (int): queries with the same SQL as an earlier one
+        db_time (float): time spent in the database, in ms
+        python_time (float): the rest of total time, in ms
+        total_time (float): total time, in ms
+        peak_memory (float): peak memory in MB, or ``None``
+        top_queries (list): (count, SQL) of the most repeated queries
+    """
+
+    do_not_call_in_templates = True  # it is a database execute wrapper
+
+    def __init__(self, label, memory=False):
+        self.label = label
+        self.memory = memory
+        self.started = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.total_time = 0.0
+        self.peak_memory = None
+        self.statements = Counter()
+        self.executions = Counter()
+        self._start = None
+        self._tracing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper, see :meth:`connection.execute_wrapper`."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += (time.perf_counter() - start) * 1e3
+            self.queries += 1
+            self.statements[sql] += 1
+            try:
+                self.executions[(sql, repr(params))] += 1
+            except Exception:  # pragma: no cover
+                pass
+
+    @property
+    def duplicates(self):
+        return sum(count - 1 for count in self.executions.values())
+
+    @property
+    def similar(self):
+        return sum(count - 1 for count in self.statements.values())
+
+    @property
+    def python_time(self):
+        return max(self.total_time - self.db_time, 0.0)
+
+    @property
+    def top_queries(self):
+        return [
+            (count, sql)
+            for sql, count in self.statements.most_common(5)
+            if count > 1
+        ]
+
+    def start(self):
+        """Start recording queries, time and memory."""
+        self.started = now()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        elif self.memory:
+            tracemalloc.reset_peak()
+        connection.execute_wrappers.append(self)
+        self._start = time.perf_counter()
+
+    def detach(self):
+        """Stop recording queries and memory, time is still recorded."""
+        if self in connection.execute_wrappers:
+            connection.execute_wrappers.remove(self)
+        if self.memory and self.peak_memory is None:
+            self.peak_memory = tracemalloc.get_traced_memory()[1] / 2**20
+            if self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+
+    def stop(self):
+        """Stop recording, store and log the profile."""
+        if self._start is None:
+            return
+        self.total_time = (time.perf_counter() - self._start) * 1e3
+        self._start = None
+        self.detach()
+        PROFILES.append(self)
+        logger.info(json.dumps(self.as_dict()))
+
+    def as_dict(self):
+        """Return the profile as a dict, for logging."""
+        return {
+            "label": self.label,
+            "started": self.started.isoformat(),
+            "queries": self.queries,
+            "duplicates": self.duplicates,
+            "similar": self.similar,
+            "db_ms": round(self.db_time, 3),
+            "python_ms": round(self.python_time, 3),
+            "total_ms": round(self.total_time, 3),
+            "peak_mb": (
+                None
+                if self.peak_memory is None
+                else round(self.peak_memory, 3)
+            ),
+        }
+
+
+@contextmanager
+def instrument(label, memory=None):
+    """Record queries, time and memory of a block of code.
+
+    Args:
+        label (str): label for the profile
+        memory (bool): record peak memory, default from settings
+
+    Yields:
+        Profile: filled in when the block is done
+    """
+    if memory is None:
+        memory = settings.OPTION_INSTRUMENTATION == "memory"
+    profile = Profile(label, memory=memory)
+    profile.start()
+    try:
+        yield profile
+    finally:
+        profile.stop()
+
+
+def get_label(request):
+    """Return the label for a request: view name and admin action.
+
+    Called before the view, so only form-encoded data is read, multipart
+    data is left to the view, e.g. to set upload handlers."""
+    try:
+        label = resolve(
+            request.path_info, getattr(request, "urlconf", None)
+        ).view_name
+    except Resolver404:
+        label = request.path
+    if (
+        request.method == "POST"
+        and request.content_type == "application/x-www-form-urlencoded"
+        and "action" in request.POST
+    ):
+        label += " " + request.POST["action"]
+    return label
+
+
+class InstrumentationMiddleware(object):
+    """Record a :class:`Profile` for every request.
+
+    Not used unless ``OPTION_INSTRUMENTATION`` is set."""
+
+    def __init__(self, get_response):
+        if not settings.OPTION_INSTRUMENTATION:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = Profile(
+            "{} {}".format(request.method, get_label(request)),
+            memory=settings.OPTION_INSTRUMENTATION == "memory",
+        )
+        profile.start()
+        try:
+            response = self.get_response(request)
+        except Exception:
+            profile.stop()
+            raise
+        if response.streaming:
+            profile.detach()
+            response.streaming_content = self.stream(
+                response.streaming_content, profile
+            )
+        else:
+            profile.stop()
+        return response
+
+    @staticmethod
+    def stream(content, profile):
+        """Yield from streaming content, stop the profile at the end."""
+        try:
+            yield from content
+        finally:
+            profile.stop()
+
+
+@method_decorator(staff_member_required, name="dispatch")
+class InstrumentationView(TemplateView):
+    """Staff-only page with recent profiles, the slowest first."""
+
+    template_name = "music_publisher/instrumentation.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["enabled"] = bool(settings.OPTION_INSTRUMENTATION)
+        context["profiles"] = sorted(
+            PROFILES, key=lambda p: p.total_time, reverse=True
+        )
+        return context
+
+    def render_to_response(self, context, **response_kwargs):
+        """Prepare the context, required since we use admin template."""
+        context["site_header"] = settings.PUBLISHER_NAME
+        context["opts"] = {
+            "app_label": "music_publisher",
+            "model_name": "instrumentation",
+        }
+        context["title"] = "Instrumentation"
+        context["has_permission"] = True
+        context["is_nav_sidebar_enabled"] = False  # Permission issue
+        return super().render_to_response(context, **response_kwargs)
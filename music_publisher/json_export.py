@@ -0,0 +1,194 @@
+"""JSON encoders and streaming JSON exports.
+
+Two encoders are available, one using :mod:`json` from the standard
+library, and one using `orjson <https://github.com/ijl/orjson>`_, if it
+is installed. ``orjson`` is used by default, ``OPTION_JSON_ENCODER`` can be
+set to ``json`` or ``orjson`` to choose one.
+
+Both encoders produce the same values for all types used in
+``get_dict`` structures. Dates, times and datetimes, as well as
+:class:`decimal.Decimal` and :class:`datetime.timedelta` objects are
+encoded with :class:`django.core.serializers.json.DjangoJSONEncoder`.
+
+Output is either compact, for machine consumers, or indented, for humans.
+Indentation is 2 spaces with both, ``orjson`` supports no other.
+
+Exports are encoded piece by piece, as they are produced, so the complete
+data set and the complete JSON document never have to be in memory at once.
+The streamed output is the same as the whole document encoded at once.
+
+    Attributes:
+        ENCODERS (OrderedDict): {name: encoder}, available encoders, in the
+            order of preference
+"""
+
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+BUFFER_SIZE = 65536
+
+
+class StdlibEncoder(object):
+    """JSON encoder using :mod:`json` from the standard library."""
+
+    name = "json"
+    indent = 2
+
+    def dumps(self, data, compact=False):
+        """Return ``data`` encoded as JSON, compact or indented.
+
+        Returns:
+            bytes: UTF-8 encoded JSON
+        """
+        if compact:
+            return json.dumps(
+                data,
+                cls=DjangoJSONEncoder,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode()
+        return json.dumps(
+            data,
+            cls=DjangoJSONEncoder,
+            ensure_ascii=False,
+            indent=self.indent,
+        ).encode()
+
+
+class OrjsonEncoder(object):
+    """JSON encoder using ``orjson``."""
+
+    name = "orjson"
+    indent = 2
+
+    def __init__(self):
+        self.default = DjangoJSONEncoder().default
+
+    def dumps(self, data, compact=False):
+        """Return ``data`` encoded as JSON, compact or indented.
+
+        Returns:
+            bytes: UTF-8 encoded JSON
+        """
+        option = orjson.OPT_PASSTHROUGH_DATETIME
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=self.default, option=option)
+
+
+ENCODERS = OrderedDict()
+if orjson:
+    ENCODERS[OrjsonEncoder.name] = OrjsonEncoder()
+ENCODERS[StdlibEncoder.name] = StdlibEncoder()
+
+
+def get_encoder(name=None):
+    """Return the encoder by name, or the one set in settings.
+
+    Args:
+        name (str): ``json`` or ``orjson``, default from settings, or the
+            fastest available
+
+    Returns:
+        encoder object with ``name``, ``indent`` and ``dumps``
+
+    Raises:
+        ImproperlyConfigured: if the encoder is not available
+    """
+    name = name or settings.OPTION_JSON_ENCODER
+    if not name:
+        return next(iter(ENCODERS.values()))
+    if name not in ENCODERS:
+        raise ImproperlyConfigured(
+            'JSON encoder "{}" is not available.'.format(name)
+        )
+    return ENCODERS[name]
+
+
+def iter_json(arrays, compact=False, encoder=None, buffer_size=BUFFER_SIZE):
+    """Yield a JSON object with arrays as values, encoded item by item.
+
+    Args:
+        arrays (iterable): (key, iterable) pairs, items are encoded as
+            soon as they are yielded
+        compact (bool): compact or indented output
+        encoder: encoder object, see :func:`get_encoder`
+        buffer_size (int): minimal size of yielded chunks, except the last
+
+    Yields:
+        bytes: parts of the JSON document
+    """
+    encoder = encoder or get_encoder()
+    if compact:
+        open_array, separator, close_array, end = b"[", b",", b"]", b"}"
+        key_separator, newline = b":", b""
+    else:
+        indent = b" " * encoder.indent
+        newline = b"\n" + indent * 2
+        open_array, separator = b"[" + newline, b"," + newline
+        close_array = b"\n" + indent + b"]"
+        end = b"\n}"
+        key_separator = b": "
+    buffer = [b"{"]
+    size = 1
+    i = -1
+    for i, (key, items) in enumerate(arrays):
+        prefix = b"," if i else b""
+        if not compact:
+            prefix += b"\n" + indent
+        buffer.append(prefix + encoder.dumps(key) + key_separator)
+        empty = True
+        for item in items:
+            encoded = encoder.dumps(item, compact=compact)
+            if newline:
+                encoded = encoded.replace(b"\n", newline)
+            buffer.append((open_array if empty else separator) + encoded)
+            empty = False
+            size += len(buffer[-1])
+            if size >= buffer_size:
+                yield b"".join(buffer)
+                buffer = []
+                size = 0
+        buffer.append(b"[]" if empty else close_array)
+    buffer.append(end if i >= 0 else b"}")
+    yield b"".join(buffer)
+
+
+def set_attachment(response, filename):
+    """Set ``Content-Disposition`` header for a JSON file download."""
+    cd = 'attachment; filename="{}.json"'.format(filename)
+    response["Content-Disposition"] = cd
+    return response
+
+
+def streaming_json_response(
+    arrays, filename=None, compact=False, encoder=None
+):
+    """Return a streaming response with a JSON object with arrays.
+
+    Args:
+        arrays (iterable): (key, iterable) pairs, see :func:`iter_json`
+        filename (str): file name for the attachment, without extension
+        compact (bool): compact or indented output
+        encoder: encoder object, see :func:`get_encoder`
+
+    Returns:
+        django.http.StreamingHttpResponse
+    """
+    response = StreamingHttpResponse(
+        iter_json(arrays, compact=compact, encoder=encoder),
+        content_type="application/json",
+    )
+    if filename:
+        set_attachment(response, filename)
+    return response
@@ -0,0 +1 @@
+"""Management commands for :mod:`music_publisher`."""
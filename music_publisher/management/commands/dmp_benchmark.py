@@ -0,0 +1,69 @@
+"""Run benchmarks registered in :mod:`music_publisher.benchmarks`."""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from music_publisher.benchmarks import (
+    BENCHMARKS,
+    compare_results,
+    get_environment,
+    run_benchmarks,
+)
+
+
+class Command(BaseCommand):
+    help = "Run performance benchmarks, all of them or the ones listed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "names", nargs="*", help=", ".join(BENCHMARKS.keys())
+        )
+        parser.add_argument(
+            "--output",
+            help="Write results to this JSON file.",
+        )
+        parser.add_argument(
+            "--compare",
+            help="Compare results with a JSON file written with --output.",
+        )
+
+    def format(self, value):
+        if isinstance(value, float):
+            return "{:.3f}".format(value)
+        return value
+
+    def handle(self, *args, **options):
+        names = options["names"]
+        unknown = set(names) - set(BENCHMARKS.keys())
+        if unknown:
+            raise CommandError(
+                "Unknown benchmark(s): {}.".format(", ".join(sorted(unknown)))
+            )
+        baseline = {}
+        if options["compare"]:
+            try:
+                with open(options["compare"]) as f:
+                    baseline = json.load(f)["benchmarks"]
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(
+                    "Can not read {}: {}".format(options["compare"], e)
+                )
+        results = {}
+        for name, values in run_benchmarks(names):
+            results[name] = values
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for benchmark, key, value, base, change in compare_results(
+                {name: values}, baseline
+            ):
+                line = "  {}: {}".format(key, self.format(value))
+                if change is not None:
+                    line += " ({}, {:+.1f}%)".format(self.format(base), change)
+                self.stdout.write(line)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(
+                    {"environment": get_environment(), "benchmarks": results},
+                    f,
+                    indent=4,
+                )
@@ -0,0 +1,66 @@
+"""Generate a synthetic catalog, see :mod:`music_publisher.synthetic`."""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from music_publisher.synthetic import generate_catalog
+
+
+class Command(BaseCommand):
+    help = "Generate a synthetic catalog for benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--works", type=int, default=1000, help="Number of works."
+        )
+        parser.add_argument(
+            "--writers",
+            type=int,
+            help="Number of writers, default is one per five works.",
+        )
+        parser.add_argument(
+            "--recordings",
+            type=int,
+            help="Number of recordings, default is one per work.",
+        )
+        parser.add_argument(
+            "--acks",
+            type=int,
+            help="Number of acknowledgements, default is 1.5 per work.",
+        )
+        parser.add_argument(
+            "--tracks-per-release",
+            type=int,
+            default=10,
+            help="Number of tracks in each release.",
+        )
+        parser.add_argument(
+            "--start",
+            type=int,
+            default=1,
+            help="First number in titles and codes, must be higher than "
+            "in previously generated catalogs.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+
+    def handle(self, *args, **options):
+        for key in ("works", "tracks_per_release"):
+            if options[key] < 1:
+                raise CommandError("{} must be positive.".format(key))
+        try:
+            counts = generate_catalog(
+                works=options["works"],
+                writers=options["writers"],
+                recordings=options["recordings"],
+                acks=options["acks"],
+                tracks_per_release=options["tracks_per_release"],
+                start=options["start"],
+                seed=options["seed"],
+            )
+        except IntegrityError as e:
+            raise CommandError(
+                "Codes clash with existing data, use a higher --start. "
+                "{}".format(e)
+            )
+        for key, value in counts.items():
+            self.stdout.write("{}: {}".format(key, value))
@@ -0,0 +1,42 @@
+"""Show cold import times, measured with ``python -X importtime``."""
+
+from django.core.management.base import BaseCommand
+
+from music_publisher.benchmarks import import_times
+
+
+class Command(BaseCommand):
+    help = "Show the slowest imports during Django setup in a new process."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "modules",
+            nargs="*",
+            default=["music_publisher.admin", "music_publisher.urls"],
+            help="Modules to import after django.setup().",
+        )
+        parser.add_argument(
+            "--top", type=int, default=25, help="Number of imports shown."
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Show all modules, not only music_publisher.",
+        )
+
+    def handle(self, *args, **options):
+        wall, setup, rows = import_times(options["modules"])
+        if not options["all"]:
+            rows = [row for row in rows if row[0].startswith("music_pub")]
+        rows = sorted(rows, key=lambda row: row[2], reverse=True)
+        self.stdout.write(
+            "{:>10} {:>10}  {}".format("self [ms]", "cumul [ms]", "module")
+        )
+        for module, own, cumulative in rows[: options["top"]]:
+            self.stdout.write(
+                "{:>10.1f} {:>10.1f}  {}".format(
+                    own / 1e3, cumulative / 1e3, module
+                )
+            )
+        self.stdout.write("django.setup(): {:.1f} ms".format(setup))
+        self.stdout.write("Total wall time: {:.1f} ms".format(wall))
@@ -0,0 +1,62 @@
+"""Request ISWCs for all works without one, see
+:meth:`music_publisher.models.CWRExportManager.create_iswc_requests`."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from music_publisher.models import CWRExport
+
+
+class Command(BaseCommand):
+    help = (
+        "Create ISWC requests (CWR 3.0 ISR files) for all works without "
+        "ISWC, split into files of limited size. Import ACK files with "
+        "responses in the admin, with ISWC import enabled."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=CWRExport.iswc_request_size,
+            help="Maximal number of works in one file.",
+        )
+        parser.add_argument(
+            "--resend",
+            action="store_true",
+            help="Include works already in ISWC requests.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only show how many works would be included.",
+        )
+        parser.add_argument(
+            "--status",
+            action="store_true",
+            help="Show works still without ISWC in each request.",
+        )
+
+    def handle(self, *args, **options):
+        if options["size"] < 1:
+            raise CommandError("Size must be a positive number.")
+        if options["status"]:
+            for export in CWRExport.objects.get_iswc_requests():
+                self.stdout.write(
+                    "{}: {} works, {} pending".format(
+                        export.filename, export.work_count, export.pending
+                    )
+                )
+            return
+        work_ids = CWRExport.objects.get_iswc_request_work_ids(
+            resend=options["resend"]
+        )
+        if options["dry_run"]:
+            self.stdout.write("works: {}".format(len(work_ids)))
+            return
+        exports = CWRExport.objects.create_iswc_requests(
+            work_ids, size=options["size"], description="ISWC request batch"
+        )
+        for export in exports:
+            self.stdout.write(
+                "{}: {} works".format(export.filename, export.works.count())
+            )
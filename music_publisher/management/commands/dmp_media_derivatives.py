@@ -0,0 +1,29 @@
+"""Create derivatives of uploaded files, see :mod:`music_publisher.media`."""
+
+from django.core.management.base import BaseCommand
+
+from music_publisher.media import create_derivatives, needs_derivatives
+from music_publisher.models import Artist, Label, Recording, Release, Writer
+
+
+class Command(BaseCommand):
+    help = "Create resized images and audio previews for uploaded files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Create derivatives also for files that already have them.",
+        )
+
+    def handle(self, *args, **options):
+        for model in (Artist, Writer, Label, Release, Recording):
+            qs = model._base_manager.exclude(**{model.MEDIA_FIELD: ""})
+            count = 0
+            for instance in qs.order_by("id").iterator():
+                if options["force"] or needs_derivatives(instance):
+                    create_derivatives(instance)
+                    count += 1
+            self.stdout.write(
+                "{}: {}".format(model._meta.verbose_name_plural, count)
+            )
@@ -0,0 +1,38 @@
+"""Store last names of writers in works, see
+:attr:`music_publisher.models.Work.writer_last_names`."""
+
+from django.core.management.base import BaseCommand
+
+from music_publisher.models import Work, chunked
+
+
+class Command(BaseCommand):
+    help = (
+        "Store last names of writers in works, e.g. after writers in "
+        "works were created or changed without signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=900,
+            help="Number of works loaded at once.",
+        )
+
+    def handle(self, *args, **options):
+        work_ids = list(
+            Work.objects.order_by("id").values_list("id", flat=True)
+        )
+        changed = 0
+        for chunk in chunked(work_ids, options["batch_size"]):
+            old = dict(
+                Work.objects.filter(id__in=chunk).values_list(
+                    "id", "writer_last_names"
+                )
+            )
+            new = Work.objects.update_writer_last_names(chunk)
+            changed += sum(old[pk] != names for pk, names in new.items())
+        self.stdout.write(
+            "works: {}, changed: {}".format(len(work_ids), changed)
+        )
@@ -0,0 +1,157 @@
+"""Derivatives of uploaded media files.
+
+Images are resized to a thumbnail and a medium size, audio files are
+converted to lower bitrate MP3 previews, if ``ffmpeg`` is installed.
+Derivatives are stored next to the originals, with the same name
+and a suffix, e.g. ``artist/<uuid>.thumbnail.jpg``.
+
+Derivatives are created after the object with a new or changed file is
+saved, during the request, or in background threads if
+``OPTION_MEDIA_WORKERS`` is set. ``dmp_media_derivatives`` management
+command creates them for existing files.
+
+    Attributes:
+        IMAGE_SIZES (dict): {name: maximal width and height in pixels}
+        AUDIO_BITRATE (str): bitrate of audio previews, for ``ffmpeg``
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+
+IMAGE_SIZES = {"thumbnail": 160, "medium": 800}
+AUDIO_BITRATE = "96k"
+
+
+def get_derivative_name(name, derivative, ext):
+    """Return file name for a derivative, next to the original."""
+    return "{}.{}.{}".format(name.rsplit(".", 1)[0], derivative, ext)
+
+
+def save_derivative(field, derivative, ext, content):
+    """Save the content of a derivative, replacing the existing file."""
+    name = get_derivative_name(field.name, derivative, ext)
+    if field.storage.exists(name):
+        field.storage.delete(name)
+    return field.storage.save(name, ContentFile(content))
+
+
+def create_image_derivatives(field):
+    """Create resized images, return {name: file name}."""
+    from PIL import Image
+
+    with field.open("rb") as f:
+        image = Image.open(f)
+        image.load()
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    derivatives = {}
+    for derivative, size in IMAGE_SIZES.items():
+        copy = image.copy()
+        copy.thumbnail((size, size))
+        content = BytesIO()
+        copy.save(content, "JPEG", quality=85, optimize=True)
+        derivatives[derivative] = save_derivative(
+            field, derivative, "jpg", content.getvalue()
+        )
+    return derivatives
+
+
+def create_audio_derivatives(field):
+    """Create audio preview, return {name: file name}.
+
+    Original is copied to a local temporary file, as it may be in remote
+    storage. Without ``ffmpeg``, there are no previews.
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        return {}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source")
+        target = os.path.join(tmp, "preview.mp3")
+        with field.open("rb") as f, open(source, "wb") as out:
+            shutil.copyfileobj(f, out)
+        subprocess.run(
+            [ffmpeg, "-nostdin", "-loglevel", "error", "-i", source]
+            + ["-vn", "-b:a", AUDIO_BITRATE, "-f", "mp3", target],
+            check=True,
+        )
+        with open(target, "rb") as f:
+            content = f.read()
+    return {"preview": save_derivative(field, "preview", "mp3", content)}
+
+
+def needs_derivatives(instance):
+    """Return ``True`` if the file changed since derivatives were made."""
+    field = getattr(instance, instance.MEDIA_FIELD)
+    return (field.name or "") != instance.derivatives.get("source", "")
+
+
+def create_derivatives(instance):
+    """Create derivatives for the current file and delete old ones.
+
+    Derivatives are saved only if the file did not change in the meantime.
+    If the file can not be processed, there are no derivatives and
+    originals are used.
+    """
+    field = getattr(instance, instance.MEDIA_FIELD)
+    old = dict(instance.derivatives)
+    derivatives = {"source": field.name or ""}
+    try:
+        if field and instance.MEDIA_FIELD == "audio_file":
+            derivatives.update(create_audio_derivatives(field))
+        elif field:
+            derivatives.update(create_image_derivatives(field))
+    except (OSError, subprocess.CalledProcessError):
+        # not an image or audio file, originals are used
+        pass
+    for name, path in old.items():
+        if name != "source" and path not in derivatives.values():
+            field.storage.delete(path)
+    model = type(instance)
+    model._base_manager.filter(
+        pk=instance.pk, **{instance.MEDIA_FIELD: field.name or ""}
+    ).update(derivatives=derivatives)
+    instance.derivatives = derivatives
+    return derivatives
+
+
+def process(label, pk):
+    """Create derivatives for an object, used in workers."""
+    model = apps.get_model(label)
+    try:
+        instance = model._base_manager.filter(pk=pk).first()
+        if instance is not None and needs_derivatives(instance):
+            create_derivatives(instance)
+    finally:
+        connection.close()
+
+
+@lru_cache(maxsize=None)
+def get_executor(workers):
+    """Return the thread pool with ``workers`` threads."""
+    return ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="dmp-media"
+    )
+
+
+def schedule_derivatives(instance):
+    """Create derivatives after the current transaction is committed."""
+    label = instance._meta.label
+    workers = settings.OPTION_MEDIA_WORKERS
+    if workers:
+        func = partial(
+            get_executor(workers).submit, process, label, instance.pk
+        )
+    else:
+        func = partial(create_derivatives, instance)
+    transaction.on_commit(func)
@@ -0,0 +1,575 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_registration_statuses(apps, schema_editor):
+    """Store the latest acknowledgement per work and society."""
+    WorkAcknowledgement = apps.get_model(
+        "music_publisher", "WorkAcknowledgement"
+    )
+    WorkRegistrationStatus = apps.get_model(
+        "music_publisher", "WorkRegistrationStatus"
+    )
+    acks = WorkAcknowledgement.objects.order_by(
+        "work_id", "society_code", "-date", "-id"
+    ).values_list(
+        "work_id", "society_code", "status", "date", "remote_work_id"
+    )
+    latest = {}
+    for work_id, society_code, status, date, remote_work_id in acks.iterator():
+        latest.setdefault(
+            (work_id, society_code), (status, date, remote_work_id)
+        )
+    WorkRegistrationStatus.objects.bulk_create(
+        (
+            WorkRegistrationStatus(
+                work_id=work_id,
+                society_code=society_code,
+                status=status,
+                date=date,
+                remote_work_id=remote_work_id,
+            )
+            for (work_id, society_code), (
+                status,
+                date,
+                remote_work_id,
+            ) in latest.items()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music_publisher", "0011_alter_alternatetitle_title_type_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="cwrexport",
+            name="nwr_rev",
+            field=models.CharField(
+                choices=[
+                    ("NWR", "CWR 2.1: New work registrations"),
+                    ("REV", "CWR 2.1: Revisions of registered works"),
+                    ("NW2", "CWR 2.2: New work registrations"),
+                    ("RE2", "CWR 2.2: Revisions of registered works"),
+                    ("WRK", "CWR 3.0: Work registration"),
+                    ("ISR", "CWR 3.0: ISWC request"),
+                    ("WR1", "CWR 3.1: Work registration"),
+                    ("IS1", "CWR 3.1: ISWC request"),
+                ],
+                db_index=True,
+                default="NWR",
+                max_length=3,
+                verbose_name="CWR version/type",
+            ),
+        ),
+        migrations.CreateModel(
+            name="WorkRegistrationStatus",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "society_code",
+                    models.CharField(
+                        choices=[
+                            ("226", "AACIMH (HONDURAS)"),
+                            ("253", "AAS (AZERBAIJAN)"),
+                            ("217", "ABRAC (BRAZIL)"),
+                            ("201", "ABRAMUS (BRAZIL)"),
+                            ("288", "ABYROY (KAZAKHSTAN)"),
+                            ("107", "ACAM (COSTA RICA)"),
+                            ("210", "ACCESS COPYRIGHT (CANADA)"),
+                            ("306", "ACCS (TRINIDAD AND TOBAGO)"),
+                            ("103", "ACDAM (CUBA)"),
+                            ("76", "ACEMLA (PUERTO RICO)"),
+                            ("260", "ACS (UNITED KINGDOM)"),
+                            ("1", "ACUM (ISRAEL)"),
+                            ("148", "ADAGP (FRANCE)"),
+                            ("230", "ADAVIS (CUBA)"),
+                            ("2", "ADDAF (BRAZIL)"),
+                            ("250", "AEI-GUATEMALA (GUATEMALA)"),
+                            ("3", "AEPI (GREECE)"),
+                            ("4", "AGADU (URUGUAY)"),
+                            ("114", "AGAYC (GUATEMALA)"),
+                            ("289", "AIPA (SLOVENIA)"),
+                            ("122", "AKKA-LAA (LATVIA)"),
+                            ("5", "AKM (AUSTRIA)"),
+                            ("127", "ALBAUTOR (ALBANIA)"),
+                            ("54", "ALCS (UNITED KINGDOM)"),
+                            ("786", "ALLTRACK (USA)"),
+                            ("30", "AMAR (BRAZIL)"),
+                            ("12", "AMCOS (AUSTRALIA)"),
+                            ("162", "AMPAL (AUSTRALIA)"),
+                            ("17", "AMRA (UNITED STATES)"),
+                            ("273", "AMUS (BOSNIA AND HERZEGOVINA)"),
+                            ("218", "ANACIM (BRAZIL)"),
+                            ("323", "ANCO (MOLDOVA)"),
+                            ("15", "APA (PARAGUAY)"),
+                            ("7", "APDAYC (PERU)"),
+                            ("163", "APG-Japan (JAPAN)"),
+                            ("8", "APRA (AUSTRALIA)"),
+                            ("164", "APSAV (PERU)"),
+                            ("14", "ARGENTORES (ARGENTINA)"),
+                            ("209", "ARMAUTHOR NGO (ARMENIA)"),
+                            ("320", "ARMONIA (FRANCE)"),
+                            ("149", "ARS (UNITED STATES)"),
+                            ("236", "ARTEGESTION (ECUADOR)"),
+                            ("9", "ARTISJUS (HUNGARY)"),
+                            ("10", "ASCAP (UNITED STATES)"),
+                            ("334", "ASCRL (USA)"),
+                            ("251", "ASDACS (AUSTRALIA)"),
+                            ("219", "ASSIM (BRAZIL)"),
+                            ("131", "ATHINA-SADA (GREECE)"),
+                            ("220", "ATIDA (BRAZIL)"),
+                            ("791", "ATLAS (ASIA PACIFIC)"),
+                            ("141", "ATN (CHILE)"),
+                            ("11", "AUSTRO-MECHANA (AUME) (AUSTRIA)"),
+                            ("275", "AUTODIA (GREECE)"),
+                            ("166", "AUTORARTE (VENEZUELA)"),
+                            ("231", "AUTVIS (BRAZIL)"),
+                            ("348", "AVRS (NIGERIA)"),
+                            ("341", "AVTE (FRANCE)"),
+                            ("13", "AWA (GERMANY)"),
+                            ("203", "AWGACS (AUSTRALIA)"),
+                            ("290", "AZDG (AZERBAIJAN)"),
+                            ("202", "AsDAC (MOLDOVA, REPUBLIC OF)"),
+                            ("274", "AuPO CINEMA (UKRAINE)"),
+                            ("592", "BACKOFFICE (0)"),
+                            ("45", "BBDA (BURKINA FASO)"),
+                            ("47", "BCDA (CONGO)"),
+                            ("150", "BEELDRECHT (NETHERLANDS)"),
+                            ("18", "BGDA (GUINEA)"),
+                            ("157", "BILDRECHT GmbH (AUSTRIA)"),
+                            ("19", "BMDAV (MOROCCO)"),
+                            ("702", "BMG (0)"),
+                            ("21", "BMI (UNITED STATES)"),
+                            ("125", "BNDA (NIGER)"),
+                            ("151", "BONO (NORWAY)"),
+                            ("792", "BRIDGER (BELGIUM)"),
+                            ("238", "BSCAP (BELIZE)"),
+                            ("37", "BUBEDRA (BENIN)"),
+                            ("6", "BUCADA (CENTRAL AFRICAN REPUBLIC)"),
+                            ("23", "BUMA (NETHERLANDS)"),
+                            ("16", "BUMDA (MALI)"),
+                            ("167", "BURAFO (NETHERLANDS)"),
+                            ("24", "BURIDA (COTE D'IVOIRE)"),
+                            ("130", "BUTODRA (TOGO)"),
+                            ("266", "BeAT (BRUNEI DARUSSALAM)"),
+                            (
+                                "152",
+                                "Bildupphovsrätt (Visual Copyright Society) (SWEDEN)",
+                            ),
+                            ("27", "CAPAC (CANADA)"),
+                            ("283", "CAPASSO (SOUTH AFRICA)"),
+                            ("264", "CARCC (CANADA)"),
+                            ("26", "CASH (HONG KONG)"),
+                            ("777", "CELAS (GERMANY/UK)"),
+                            ("108", "CHA (TAIWAN, CHINESE TAIPEI)"),
+                            ("316", "CIS-Net AVI (FRANCE)"),
+                            ("312", "CISAC (FRANCE)"),
+                            ("239", "CMC (CAMEROON)"),
+                            ("88", "CMRRA (CANADA)"),
+                            ("324", "CNRCMSE (ETHIOPIA)"),
+                            ("252", "COLCCMA (TAIWAN, CHINESE TAIPEI)"),
+                            ("106", "COMPASS (SINGAPORE)"),
+                            ("337", "COPYSWEDE (SWEDEN)"),
+                            ("331", "COSBOTS (BOTSWANA)"),
+                            ("169", "COSCAP (BARBADOS)"),
+                            ("123", "COSGA (GHANA)"),
+                            ("124", "COSOMA (MALAWI)"),
+                            ("268", "COSON (NIGERIA)"),
+                            ("223", "COSOTA (TANZANIA, UNITED REPUBLIC OF)"),
+                            ("284", "COSOZA (TANZANIA, UNITED REPUBLIC OF)"),
+                            ("96", "COTT (TRINIDAD AND TOBAGO)"),
+                            ("170", "CPSN (NEPAL)"),
+                            ("171", "CREAIMAGEN (CHILE)"),
+                            ("325", "CRSEA (RUSSIA)"),
+                            ("212", "CSCS (CANADA)"),
+                            ("315", "CSI (FRANCE)"),
+                            ("175", "CopyRo (ROMANIA)"),
+                            ("168", "Copyright Agency (AUSTRALIA)"),
+                            ("248", "DAC (ARGENTINA)"),
+                            ("296", "DACIN-SARA (ROMANIA)"),
+                            ("153", "DACS (UNITED KINGDOM)"),
+                            ("142", "DALRO (SOUTH AFRICA)"),
+                            ("240", "DAMA (SPAIN)"),
+                            ("276", "DASC (COLOMBIA)"),
+                            ("293", "DBCA (BRAZIL)"),
+                            ("332", "DEGNZ (NEW ZEALAND)"),
+                            ("172", "DGA (UNITED STATES)"),
+                            ("342", "DGJ (JAPAN)"),
+                            ("333", "DGK (REPUBLIC OF KOREA)"),
+                            ("271", "DHFR (CROATIA)"),
+                            ("31", "DILIA (CZECH REPUBLIC)"),
+                            ("173", "DIRECTORES (MEXICO)"),
+                            ("145", "DIRECTORS UK (UNITED KINGDOM)"),
+                            ("704", "DISCOVERY (0)"),
+                            ("310", "DIVA (HONG KONG)"),
+                            ("213", "DRCC (CANADA)"),
+                            ("349", "DYGA (CHILE)"),
+                            ("116", "EAU (ESTONIA)"),
+                            ("308", "ECAD (BRAZIL)"),
+                            ("214", "ECCO (SAINT LUCIA)"),
+                            ("338", "EDEM (GREECE)"),
+                            ("339", "EKKI (SPAIN)"),
+                            ("784", "ESMAA  (UNITED ARAB EMIRATES)"),
+                            ("322", "EVA (BELGIUM)"),
+                            ("147", "FILMAUTOR (BULGARIA)"),
+                            ("174", "FILMJUS (HUNGARY)"),
+                            ("32", "FILSCAP (PHILIPPINES)"),
+                            ("222", "FONOPERU (PERU)"),
+                            ("313", "FastTrack DCN (FRANCE)"),
+                            ("261", "GAI Uz (UZBEKISTAN)"),
+                            ("204", "GCA (GEORGIA)"),
+                            ("789", "GDSDX (Asia Pacific)"),
+                            ("297", "GEDAR (BRAZIL)"),
+                            ("35", "GEMA (GERMANY)"),
+                            ("635", "GEMA-US (Additional CIS-Net Node)"),
+                            ("301", "GESAC (BELGIUM)"),
+                            ("232", "GESTOR (CZECH REPUBLIC)"),
+                            ("285", "GHAMRO (GHANA)"),
+                            ("778", "GMR (UNITED STATES)"),
+                            ("555", "GRD (FASTTRACK/GRD)"),
+                            ("144", "HAA (CROATIA)"),
+                            ("111", "HDS-ZAMP (CROATIA)"),
+                            ("783", "HEXACORP LTD  (USA)"),
+                            ("34", "HFA (UNITED STATES)"),
+                            ("154", "HUNGART (HUNGARY)"),
+                            ("347", "IAF (UNITED KINGDOM)"),
+                            ("319", "ICE Services AB (SWEDEN)"),
+                            ("229", "ICG (UNITED STATES)"),
+                            ("329", "ICSC (CHINA)"),
+                            ("314", "IDA (FRANCE)"),
+                            ("305", "IMJV (NETHERLANDS)"),
+                            ("326", "IMPF (BELGIUM)"),
+                            ("128", "IMRO (IRELAND)"),
+                            ("317", "INTL-REP (FRANCE)"),
+                            ("36", "IPRS (INDIA)"),
+                            ("710", "ISAN (SWITZERLAND)"),
+                            ("335", "ISOCRATIS (GREECE)"),
+                            ("247", "IVARO (IRELAND)"),
+                            ("176", "JACAP (JAMAICA)"),
+                            ("270", "JASPAR (JAPAN)"),
+                            ("38", "JASRAC (JAPAN)"),
+                            ("109", "KCI (INDONESIA)"),
+                            ("705", "KOBALT (0)"),
+                            ("40", "KODA (DENMARK)"),
+                            ("287", "KOLAA (KOREA)"),
+                            ("118", "KOMCA (KOREA, REPUBLIC OF)"),
+                            ("138", "KOPIOSTO (FINLAND)"),
+                            ("178", "KOSA (KOREA, REPUBLIC OF)"),
+                            ("336", "KOSCAP (REPUBLIC OF KOREA)"),
+                            ("179", "KUVASTO (FINLAND)"),
+                            ("177", "KazAK (KAZAKSTAN)"),
+                            ("215", "Kyrgyzpatent (KYRGYZSTAN)"),
+                            ("113", "LAA (LATVIA)"),
+                            ("110", "LATGA (LITHUANIA)"),
+                            ("302", "LATINAUTOR (URUGUAY)"),
+                            ("785", "LEA (ITALY)"),
+                            ("350", "LESCOSAA (LESOTHO)"),
+                            ("120", "LIRA (NETHERLANDS)"),
+                            ("28", "LITA (SLOVAKIA)"),
+                            ("41", "LITERAR-MECHANA (AUSTRIA)"),
+                            ("42", "LVG (AUSTRIA)"),
+                            ("309", "LatinNet (SPAIN)"),
+                            ("265", "MACA (MACAU)"),
+                            ("104", "MACP (MALAYSIA)"),
+                            ("105", "MASA  (MAURITIUS)"),
+                            ("44", "MCPS (UNITED KINGDOM)"),
+                            ("311", "MCPS-PRS Alliance (UNITED KINGDOM)"),
+                            ("119", "MCSC (CHINA)"),
+                            ("43", "MCSK (KENYA)"),
+                            ("22", "MCSN (NIGERIA)"),
+                            ("126", "MCT (THAILAND)"),
+                            ("117", "MESAM (TURKEY)"),
+                            ("790", "MESAM / MSG  (Turkey)"),
+                            (
+                                "788",
+                                "MINT (Hub of 16 Societies established by SESAC and SUISA)",
+                            ),
+                            ("307", "MIS@ASIA (SINGAPORE)"),
+                            ("708", "MLC (USA)"),
+                            ("272", "MOSCAP (MONGOLIA)"),
+                            ("258", "MRCSN (NEPAL)"),
+                            ("46", "MRS (UNITED KINGDOM)"),
+                            ("200", "MSG (TURKEY)"),
+                            ("39", "MUSICAUTOR (BULGARIA)"),
+                            ("180", "MUSIKEDITION (AUSTRIA)"),
+                            ("340", "MYNDSTEF (ICELAND)"),
+                            ("343", "Mali Maliki Institute (GHANA)"),
+                            ("707", "MusicMark (USA)"),
+                            ("161", "MÜST (TAIWAN, CHINESE TAIPEI)"),
+                            ("102", "NASCAM (NAMIBIA)"),
+                            ("48", "NCB (DENMARK)"),
+                            ("160", "NCIP (BELARUS)"),
+                            ("140", "NGO-UACRR (UKRAINE)"),
+                            ("241", "NICAUTOR (NICARAGUA)"),
+                            ("793", "NMP (SWEDEN)"),
+                            ("181", "NMPA (UNITED STATES)"),
+                            ("303", "NORD-DOC (SWEDEN)"),
+                            ("782", "NexTone (JAPAN)"),
+                            ("327", "OAZA (CZECH REPUBLIC)"),
+                            ("286", "ODDA (DJIBOUTI)"),
+                            ("291", "OFA (SERBIA)"),
+                            ("33", "OMDA (MADAGASCAR)"),
+                            ("49", "ONDA (ALGERIA)"),
+                            ("298", "OOA-S (CZECH REPUBLIC)"),
+                            ("787", "ORFIUM Greece (GREECE)"),
+                            ("50", "OSA (CZECH REPUBLIC)"),
+                            ("82", "OTDAV (TUNISIA)"),
+                            ("888", "PAECOL (Additional CIS-Net Node)"),
+                            ("249", "PAM CG (MONTENEGRO)"),
+                            ("182", "PAPPRI (INDONESIA)"),
+                            ("256", "PICTORIGHT (NETHERLANDS)"),
+                            ("53", "PROCAN (CANADA)"),
+                            ("51", "PROLITTERIS (SWITZERLAND)"),
+                            ("52", "PRS (UNITED KINGDOM)"),
+                            ("321", "PUBLISHERS (0)"),
+                            ("779", "Polaris Nordic  (SCANDINAVIA)"),
+                            ("94", "RAO (RUSSIAN FEDERATION)"),
+                            ("294", "REDES SGC (COLOMBIA)"),
+                            ("228", "ROMS (RUSSIAN FEDERATION)"),
+                            ("277", "RSAU (RWANDA)"),
+                            ("278", "RUR (RUSSIAN FEDERATION)"),
+                            ("328", "SAA (BELGIUM)"),
+                            ("55", "SABAM (BELGIUM)"),
+                            ("221", "SABEM (BRAZIL)"),
+                            ("56", "SACD (FRANCE)"),
+                            ("58", "SACEM (FRANCE)"),
+                            ("591", "SACEM Deal (SACEM-FRANCE)"),
+                            (
+                                "590",
+                                "SACEM Deal Multi territorial (SACEM-FRANCE)",
+                            ),
+                            ("758", "SACEM-LIBAN (Additional CIS-Net Node)"),
+                            ("658", "SACEM-US (Additional CIS-Net Node)"),
+                            ("233", "SACEMLUXEMBOURG (LUXEMBOURG)"),
+                            ("235", "SACENC (FRANCE)"),
+                            ("57", "SACERAU (EGYPT)"),
+                            ("242", "SACIM (EL SALVADOR)"),
+                            ("183", "SACK (KOREA, REPUBLIC OF)"),
+                            ("59", "SACM (MEXICO)"),
+                            ("263", "SACS (SEYCHELLES)"),
+                            ("60", "SACVEN (VENEZUELA)"),
+                            ("61", "SADAIC (ARGENTINA)"),
+                            ("62", "SADEMBRA (BRAZIL)"),
+                            ("135", "SADH (GREECE)"),
+                            ("243", "SADIA (ANGOLA)"),
+                            ("295", "SAGCRYT (MEXICO)"),
+                            ("225", "SAIF (FRANCE)"),
+                            ("63", "SAMRO (SOUTH AFRICA)"),
+                            ("280", "SANASTO (FINLAND)"),
+                            ("81", "SARRAL (SOUTH AFRICA)"),
+                            ("184", "SARTEC (CANADA)"),
+                            ("244", "SASUR (SURINAME)"),
+                            ("257", "SAVA (ARGENTINA)"),
+                            ("65", "SAYCE (ECUADOR)"),
+                            ("84", "SAYCO (COLOMBIA)"),
+                            ("112", "SAZAS (SLOVENIA)"),
+                            ("66", "SBACEM (BRAZIL)"),
+                            ("67", "SBAT (BRAZIL)"),
+                            ("73", "SCAM (FRANCE)"),
+                            ("29", "SCD (CHILE)"),
+                            ("299", "SCM-COOPERATIVA (CAPE VERDE)"),
+                            ("279", "SDADV (ANDORRA)"),
+                            ("259", "SDCSI (IRELAND)"),
+                            ("68", "SDRM (FRANCE)"),
+                            ("344", "SEDA (SPAIN)"),
+                            ("351", "SEF (TURKEY)"),
+                            ("71", "SESAC Inc. (UNITED STATES)"),
+                            ("185", "SESAM (FRANCE)"),
+                            ("245", "SETEM (TURKEY)"),
+                            ("192", "SFF (SWEDEN)"),
+                            ("199", "SFP-ZAPA (POLAND)"),
+                            ("208", "SGA (GUINEA-BISSAU)"),
+                            ("227", "SGACEDOM (DOMINICAN REPUBLIC)"),
+                            ("72", "SGAE (SPAIN)"),
+                            ("672", "SGAE-NY (Additional CIS-Net Node)"),
+                            ("186", "SGDL (FRANCE)"),
+                            ("318", "SGS (FRANCE)"),
+                            ("74", "SIAE (ITALY)"),
+                            ("86", "SICAM (BRAZIL)"),
+                            ("345", "SIIP (UZBEKISTAN)"),
+                            ("262", "SINEBIR (TURKEY)"),
+                            ("330", "SINGCAPS  (SINGAPORE)"),
+                            ("134", "SLPRS (SRI LANKA)"),
+                            ("187", "SNAC (FRANCE)"),
+                            ("129", "SOBODAYCOM (BOLIVIA)"),
+                            ("101", "SOCAN (CANADA)"),
+                            ("20", "SOCAN RR (CANADA)"),
+                            ("254", "SOCILADRA (CAMEROON)"),
+                            ("92", "SOCINADA (CAMEROON)"),
+                            ("189", "SOCINPRO (BRAZIL)"),
+                            ("205", "SODART (CANADA)"),
+                            ("25", "SODAV (SENEGAL)"),
+                            ("255", "SODOMAPLA (DOMINICAN REPUBLIC)"),
+                            ("137", "SOFAM (BELGIUM)"),
+                            ("70", "SOGEM (MEXICO)"),
+                            ("64", "SOKOJ (SERBIA AND MONTENEGRO)"),
+                            ("155", "SOMAAP (MEXICO)"),
+                            ("224", "SOMAS (MOZAMBIQUE)"),
+                            (
+                                "83",
+                                "SONECA (CONGO, THE DEMOCRATIC REPUBLIC OF THE)",
+                            ),
+                            ("304", "SONGCODE (UNITED STATES)"),
+                            ("701", "SONY (0)"),
+                            ("190", "SOPE (GREECE)"),
+                            ("781", "SOUNDREEF (ENGLAND and WALES)"),
+                            ("85", "SOZA (SLOVAKIA)"),
+                            ("69", "SPA (PORTUGAL)"),
+                            ("146", "SPAC (PANAMA)"),
+                            ("87", "SPACEM (FRANCE (TAHITI))"),
+                            ("191", "SPACQ-AE (CANADA)"),
+                            ("216", "SQN (BOSNIA AND HERZEGOVINA)"),
+                            ("91", "SSA (SWITZERLAND)"),
+                            ("77", "STEF (ICELAND)"),
+                            ("78", "STEMRA (NETHERLANDS)"),
+                            ("79", "STIM (SWEDEN)"),
+                            ("80", "SUISA (SWITZERLAND)"),
+                            ("75", "SUISSIMAGE (SWITZERLAND)"),
+                            ("188", "Société de l'Image (FRANCE)"),
+                            ("775", "Solar EMI (GERMANY/UK)"),
+                            ("776", "Solar Sony (GERMANY/UK)"),
+                            ("237", "TALI (ISRAEL)"),
+                            ("346", "TAMRISO (TANZANIA, UNITED REPUBLIC OF)"),
+                            ("143", "TEATERAUTOR (BULGARIA)"),
+                            ("89", "TEOSTO (FINLAND)"),
+                            ("90", "TONO (NORWAY)"),
+                            (
+                                "207",
+                                "The Author's Registry Inc. (UNITED STATES)",
+                            ),
+                            (
+                                "193",
+                                "The Society of Authors (SOA) (UNITED KINGDOM)",
+                            ),
+                            ("93", "UBC (BRAZIL)"),
+                            ("115", "UCMR-ADA (ROMANIA)"),
+                            (
+                                "194",
+                                "UFFICIO GIURIDICO (HOLY SEE (VATICAN CITY STATE))",
+                            ),
+                            ("206", "UFW  (FINLAND)"),
+                            ("282", "UNAC-SA (ANGOLA)"),
+                            ("780", "UNISON (SPAIN)"),
+                            ("703", "UNIVERSAL (0)"),
+                            ("267", "UPRAVIS (RUSSIAN FEDERATION)"),
+                            ("234", "UPRS (UGANDA)"),
+                            ("156", "VAGA (UNITED STATES)"),
+                            ("246", "VCPMC (VIET NAM)"),
+                            ("121", "VDFS (AUSTRIA)"),
+                            ("158", "VEGAP (SPAIN)"),
+                            ("195", "VEVAM (NETHERLANDS)"),
+                            ("132", "VG BILD-KUNST (GERMANY)"),
+                            ("95", "VG WORT (GERMANY)"),
+                            ("352", "VISARTA (ROMANIA)"),
+                            ("159", "VISCOPY (AUSTRALIA)"),
+                            ("139", "VISDA (DENMARK)"),
+                            ("269", "WAMI (INDONESIA)"),
+                            ("196", "WGAW (UNITED STATES)"),
+                            ("197", "WGJ (JAPAN)"),
+                            ("300", "WID Centre (UNITED STATES)"),
+                            (
+                                "700",
+                                "WIPO (Code used for the Deployment of the WIPO test CIS-Net node)",
+                            ),
+                            ("97", "ZAIKS (POLAND)"),
+                            ("133", "ZAMCOPS (ZAMBIA)"),
+                            (
+                                "136",
+                                "ZAMP - Macédoine (MACEDONIA, THE FORMER YUGOSLAV REPUBLIC OF)",
+                            ),
+                            ("198", "ZAMP Association of Slovenia (SLOVENIA)"),
+                            ("98", "ZIMURA (ZIMBABWE)"),
+                            ("292", "ZPAP (POLAND)"),
+                        ],
+                        max_length=3,
+                        verbose_name="Society",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("CO", "Conflict"),
+                            ("DU", "Duplicate"),
+                            ("RA", "Transaction Accepted"),
+                            ("AS", "Registration Accepted"),
+                            ("AC", "Registration Accepted with Changes"),
+                            (
+                                "SR",
+                                "Registration Accepted - Ready for Payment",
+                            ),
+                            (
+                                "CR",
+                                "Registration Accepted with Changes - Ready for Payment",
+                            ),
+                            ("RJ", "Rejected"),
+                            ("NP", "No Participation"),
+                            ("RC", "Claim rejected"),
+                            ("NA", "Rejected - No Society Agreement Number"),
+                            (
+                                "WA",
+                                "Rejected - Wrong Society Agreement Number",
+                            ),
+                        ],
+                        max_length=2,
+                    ),
+                ),
+                ("date", models.DateField()),
+                (
+                    "remote_work_id",
+                    models.CharField(
+                        blank=True,
+                        max_length=20,
+                        verbose_name="Remote work ID",
+                    ),
+                ),
+                (
+                    "work",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="registration_statuses",
+                        to="music_publisher.work",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Registration Status",
+                "verbose_name_plural": "Registration Statuses",
+                "indexes": [
+                    models.Index(
+                        fields=["society_code", "status", "work"],
+                        name="music_publi_society_68cf77_idx",
+                    ),
+                    models.Index(
+                        fields=["status", "work"],
+                        name="music_publi_status_e0b48c_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="workregistrationstatus",
+            constraint=models.UniqueConstraint(
+                fields=("work", "society_code"),
+                name="music_publisher_workregistrationstatus_unique",
+            ),
+        ),
+        migrations.RunPython(
+            populate_registration_statuses, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:20
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music_publisher", "0012_workregistrationstatus"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="work",
+            index=models.Index(
+                django.db.models.functions.text.Upper("iswc"),
+                name="music_publisher_work_iswc_up",
+            ),
+        ),
+    ]
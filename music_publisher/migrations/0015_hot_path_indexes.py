@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music_publisher", "0014_media_derivatives"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="work",
+            index=models.Index(
+                fields=["last_change"], name="music_publi_last_ch_c658f1_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workacknowledgement",
+            index=models.Index(
+                fields=["work", "society_code", "status"],
+                name="music_publi_work_id_2d4c8d_idx",
+            ),
+        ),
+    ]
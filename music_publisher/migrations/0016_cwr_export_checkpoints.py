@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music_publisher", "0015_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CWRExportChunk",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("number", models.PositiveIntegerField()),
+                ("last_work_id", models.PositiveIntegerField()),
+                ("work_count", models.PositiveIntegerField()),
+                ("transaction_count", models.PositiveIntegerField()),
+                ("record_count", models.PositiveIntegerField()),
+                ("duration", models.FloatField()),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                ("cwr", models.TextField(blank=True)),
+                (
+                    "export",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chunks",
+                        to="music_publisher.cwrexport",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "CWR Export Checkpoint",
+                "ordering": ("export", "number"),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="cwrexportchunk",
+            constraint=models.UniqueConstraint(
+                fields=("export", "number"),
+                name="music_publisher_cwrexportchunk_unique",
+            ),
+        ),
+    ]
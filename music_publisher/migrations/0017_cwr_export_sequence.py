@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:43
+
+from django.db import migrations, models
+
+
+def populate_sequences(apps, schema_editor):
+    """Start sequences from the highest number in each year."""
+    CWRExport = apps.get_model("music_publisher", "CWRExport")
+    CWRExportSequence = apps.get_model("music_publisher", "CWRExportSequence")
+    qs = CWRExport.objects.exclude(year="").order_by()
+    qs = qs.values("year").annotate(last_number=models.Max("num_in_year"))
+    CWRExportSequence.objects.bulk_create(
+        CWRExportSequence(year=row["year"], last_number=row["last_number"])
+        for row in qs
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music_publisher", "0016_cwr_export_checkpoints"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CWRExportSequence",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.CharField(max_length=2, unique=True)),
+                ("last_number", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "CWR Export Sequence",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="cwrexport",
+            index=models.Index(
+                fields=["year", "num_in_year"],
+                name="music_publi_year_56f952_idx",
+            ),
+        ),
+        migrations.RunPython(populate_sequences, migrations.RunPython.noop),
+    ]
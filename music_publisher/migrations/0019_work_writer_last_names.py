@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:16
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def populate_writer_last_names(apps, schema_editor):
+    """Store last names of writers in works."""
+    Work = apps.get_model("music_publisher", "Work")
+    WriterInWork = apps.get_model("music_publisher", "WriterInWork")
+    writers = defaultdict(dict)
+    rows = WriterInWork.objects.values_list(
+        "work_id", "writer_id", "writer__last_name"
+    )
+    for work_id, writer_id, last_name in rows.iterator():
+        writers[work_id][writer_id] = last_name
+    works = [
+        Work(
+            id=work_id,
+            writer_last_names=" / ".join(
+                sorted(name.upper() for name in names.values() if name)
+            )[:255],
+        )
+        for work_id, names in writers.items()
+    ]
+    Work.objects.bulk_update(works, ["writer_last_names"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music_publisher", "0018_work_index_change"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="work",
+            name="writer_last_names",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                max_length=255,
+                verbose_name="Writers' last names",
+            ),
+        ),
+        migrations.RunPython(
+            populate_writer_last_names, migrations.RunPython.noop
+        ),
+    ]
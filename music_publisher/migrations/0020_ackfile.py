@@ -0,0 +1,84 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:25
+
+import hashlib
+import zlib
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def store_ack_files(apps, schema_editor):
+    """Move contents of ACK imports to ACK files, one per content."""
+    ACKFile = apps.get_model("music_publisher", "ACKFile")
+    ACKImport = apps.get_model("music_publisher", "ACKImport")
+    ids = list(ACKImport.objects.exclude(cwr="").values_list("id", flat=True))
+    for start in range(0, len(ids), 100):
+        imports = list(
+            ACKImport.objects.filter(id__in=ids[start : start + 100])
+        )
+        for ack_import in imports:
+            raw = ack_import.cwr.encode("latin1")
+            ack_import.ack_file, _ = ACKFile.objects.get_or_create(
+                sha256=hashlib.sha256(raw).hexdigest(),
+                defaults={"size": len(raw), "data": zlib.compress(raw)},
+            )
+            ack_import.cwr = ""
+        ACKImport.objects.bulk_update(imports, ["ack_file", "cwr"])
+
+
+def restore_cwr(apps, schema_editor):
+    """Copy contents of ACK files back to ACK imports."""
+    ACKImport = apps.get_model("music_publisher", "ACKImport")
+    for ack_import in ACKImport.objects.exclude(ack_file=None).iterator():
+        ack_import.cwr = zlib.decompress(ack_import.ack_file.data).decode(
+            "latin1"
+        )
+        ack_import.save(update_fields=["cwr"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music_publisher", "0019_work_writer_last_names"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ACKFile",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "sha256",
+                    models.CharField(
+                        editable=False, max_length=64, unique=True
+                    ),
+                ),
+                ("size", models.PositiveIntegerField(editable=False)),
+                ("data", models.BinaryField()),
+            ],
+            options={
+                "verbose_name": "CWR ACK File",
+            },
+        ),
+        migrations.AddField(
+            model_name="ackimport",
+            name="ack_file",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="imports",
+                to="music_publisher.ackfile",
+            ),
+        ),
+        migrations.RunPython(store_ack_files, restore_cwr),
+    ]
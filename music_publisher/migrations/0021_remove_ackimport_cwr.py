@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:25
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music_publisher", "0020_ackfile"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="ackimport",
+            name="cwr",
+        ),
+    ]
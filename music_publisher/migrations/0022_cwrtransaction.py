@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("music_publisher", "0021_remove_ackimport_cwr"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CWRTransaction",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=8)),
+                ("fingerprint", models.CharField(max_length=64)),
+                ("lines", models.JSONField(default=list)),
+                ("record_count", models.PositiveIntegerField()),
+                (
+                    "work",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cwr_transactions",
+                        to="music_publisher.work",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "CWR Transaction",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="cwrtransaction",
+            constraint=models.UniqueConstraint(
+                fields=("work", "key"),
+                name="music_publisher_cwrtransaction_unique",
+            ),
+        ),
+    ]
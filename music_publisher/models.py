@@ -5,45 +5,406 @@ They mostly inherit from classes in :mod:`.base`.
 """
 
 import base64
+import hashlib
+import json
+import time
+import zlib
 import uuid
 from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime
 from decimal import Decimal
+from itertools import chain
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-from django.db.models.signals import pre_save
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Upper
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 from django.template import Context
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.duration import duration_string
+from django.utils.functional import cached_property
 
 from .base import (
     ArtistBase,
     IPIBase,
     LabelBase,
     LibraryBase,
+    MediaBase,
     PersonBase,
     ReleaseBase,
     TitleBase,
     WriterBase,
     upload_to,
 )
+from .changes import (
+    get_label,
+    get_work_ids,
+    has_changed,
+    schedule_propagation,
+)
+from .media import needs_derivatives, schedule_derivatives
 from .cwr_templates import (
     TEMPLATES_21,
     TEMPLATES_22,
     TEMPLATES_30,
     TEMPLATES_31,
 )
-from .societies import SOCIETIES, SOCIETY_DICT
+from .societies import SOCIETIES, SOCIETY_DICT, get_registry
 from .validators import CWRFieldValidator
 
 WORLD_DICT = {"tis-a": "2WL", "tis-n": "2136", "name": "World"}
 
 
+def chunked(iterable, size):
+    """Yield lists of up to ``size`` elements from ``iterable``.
+
+    Used to keep ``IN`` lists in queries within database limits.
+    """
+    chunk = []
+    for element in iterable:
+        chunk.append(element)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Dictionaries returned by ``get_dict`` methods are created from field
+# values with the functions below, shared with :mod:`.cwr_loader`, which
+# reads field values without creating model instances.
+
+AFFILIATION_TYPES = (
+    ("PR", "Performance Rights"),
+    ("MR", "Mechanical Rights"),
+    ("SR", "Synchronization Rights"),
+)
+
+
+def get_work_code(work_id, code=None):
+    """Return the work ID used in registrations, see :attr:`Work.work_id`.
+
+    Args:
+        work_id (int): primary key of the work
+        code (str): work ID set on import, if any
+    """
+    if code:
+        return code
+    if work_id is None:
+        return ""
+    return "{}{:06}".format(settings.PUBLISHER_CODE, work_id)
+
+
+def get_recording_code(recording_id, code=None):
+    """Return the recording ID used in registrations, see
+    :attr:`Recording.recording_id`.
+
+    Args:
+        recording_id (int): primary key of the recording
+        code (str): recording ID set on import, if any
+    """
+    if code:
+        return code
+    if recording_id is None:
+        return ""
+    return "{}{:06}R".format(settings.PUBLISHER_CODE, recording_id)
+
+
+def get_artist_dict(artist_id, last_name, first_name, isni):
+    """Return the dict of an artist, see :meth:`Artist.get_dict`."""
+    return {
+        "id": artist_id,
+        "code": "A{:06d}".format(artist_id),
+        "last_name": last_name,
+        "first_name": first_name or None,
+        "isni": isni or None,
+    }
+
+
+def get_label_dict(label_id, name):
+    """Return the dict of a music label, see :meth:`Label.get_dict`."""
+    return {"id": label_id, "code": "LA{:06d}".format(label_id), "name": name}
+
+
+def get_library_dict(library_id, name):
+    """Return the dict of a music library, see :meth:`Library.get_dict`."""
+    return {
+        "id": library_id,
+        "code": "LI{:06d}".format(library_id),
+        "name": name,
+    }
+
+
+def get_origin_dict(cd_identifier, library):
+    """Return the origin of a library work, see
+    :meth:`LibraryRelease.get_origin_dict`.
+
+    Args:
+        cd_identifier (str): CD identifier of the library release
+        library (dict): see :func:`get_library_dict`
+    """
+    return {
+        "origin_type": {"code": "LIB", "name": "Library Work"},
+        "cd_identifier": cd_identifier,
+        "library": library,
+    }
+
+
+def get_writer_dict(
+    writer_id,
+    first_name,
+    last_name,
+    ipi_name,
+    ipi_base,
+    account_number,
+    societies,
+):
+    """Return the dict of a writer, see :meth:`Writer.get_dict`.
+
+    Args:
+        societies (tuple): PR, MR and SR society codes, empty if not set
+    """
+    short_name = get_registry().short_name
+    affiliations = []
+    for (code, name), society in zip(AFFILIATION_TYPES, societies):
+        if not society:
+            continue
+        affiliations.append(
+            {
+                "organization": {
+                    "code": society,
+                    "name": short_name(society, society),
+                },
+                "affiliation_type": {"code": code, "name": name},
+                "territory": WORLD_DICT,
+            }
+        )
+    return {
+        "id": writer_id,
+        "code": "W{:06d}".format(writer_id) if writer_id else "",
+        "first_name": first_name or None,
+        "last_name": last_name or None,
+        "ipi_name_number": ipi_name or None,
+        "ipi_base_number": ipi_base or None,
+        "account_number": account_number,
+        "affiliations": affiliations,
+    }
+
+
+def get_agreement_dict(saan, generally_controlled, general_saan):
+    """Return the agreement of a controlled writer in work, see
+    :meth:`WriterInWork.get_agreement_dict`.
+
+    Args:
+        saan (str): specific agreement number of the writer in work
+        generally_controlled (bool): writer is generally controlled
+        general_saan (str): general agreement number of the writer
+    """
+    pub_pr_soc = settings.PUBLISHER_SOCIETY_PR
+    if generally_controlled and not saan:
+        return {
+            "recipient_organization": {
+                "code": pub_pr_soc,
+                "name": get_registry().short_name(pub_pr_soc),
+            },
+            "recipient_agreement_number": general_saan,
+            "agreement_type": {"code": "OG", "name": "Original General"},
+        }
+    return {
+        "recipient_organization": {"code": pub_pr_soc},
+        "recipient_agreement_number": saan,
+        "agreement_type": {"code": "OS", "name": "Original Specific"},
+    }
+
+
+def get_writer_in_work_dict(
+    writer, controlled, relative_share, capacity, agreement
+):
+    """Return the dict of a writer in work, see
+    :meth:`WriterInWork.get_dict`.
+
+    Args:
+        writer (dict): see :func:`get_writer_dict`, or ``None``
+        agreement (dict): see :func:`get_agreement_dict`, or ``None``
+    """
+    if controlled:
+        ops = [
+            {
+                "publisher": Work.get_publisher_dict(),
+                "publisher_role": {"code": "E", "name": "Original publisher"},
+                "agreement": agreement,
+            }
+        ]
+    else:
+        ops = []
+    role = (
+        {
+            "code": capacity.strip(),
+            "name": dict(WriterInWork.ROLES).get(capacity, capacity),
+        }
+        if capacity
+        else None
+    )
+    return {
+        "writer": writer,
+        "controlled": controlled,
+        "relative_share": str(relative_share / 100),
+        "writer_role": role,
+        "original_publishers": ops,
+    }
+
+
+def get_complete_titles(
+    work_title,
+    recording_title,
+    recording_title_suffix,
+    version_title,
+    version_title_suffix,
+):
+    """Return complete recording and version titles, see
+    :attr:`Recording.complete_recording_title`.
+
+    Returns:
+        tuple: (recording title, version title)
+    """
+    if recording_title_suffix:
+        recording_title = "{} {}".format(work_title, recording_title).strip()
+    if version_title_suffix:
+        version_title = "{} {}".format(
+            recording_title or work_title, version_title
+        ).strip()
+    return recording_title, version_title
+
+
+def get_recording_dict(
+    recording_id,
+    code,
+    work_title,
+    recording_title,
+    version_title,
+    release_date,
+    duration,
+    isrc,
+    artist,
+    label,
+):
+    """Return the dict of a recording, see :meth:`Recording.get_dict`.
+
+    Args:
+        code (str): see :attr:`Recording.recording_id`
+        recording_title (str): complete recording title
+        version_title (str): complete version title
+        artist (dict): see :func:`get_artist_dict`, or ``None``
+        label (dict): see :func:`get_label_dict`, or ``None``
+    """
+    return {
+        "id": recording_id,
+        "code": code,
+        "recording_title": recording_title or work_title,
+        "version_title": version_title,
+        "release_date": (
+            release_date.strftime("%Y%m%d") if release_date else None
+        ),
+        "duration": duration_string(duration) if duration else None,
+        "isrc": isrc,
+        "recording_artist": artist,
+        "record_label": label,
+    }
+
+
+def get_alternate_title_dict(work_title, title, suffix, title_type):
+    """Return the dict of an alternate title, see
+    :meth:`AlternateTitle.get_dict`."""
+    return {
+        "title": "{} {}".format(work_title, title) if suffix else title,
+        "title_type": {
+            "code": title_type,
+            "name": dict(AlternateTitle.TITLE_TYPES).get(
+                title_type, title_type
+            ),
+        },
+    }
+
+
+def get_cross_reference_dict(society_code, remote_work_id):
+    """Return a work ID assigned by a society, see
+    :meth:`WorkAcknowledgement.get_dict`."""
+    return {
+        "organization": {
+            "code": society_code,
+            "name": get_registry().short_name(society_code, society_code),
+        },
+        "identifier": remote_work_id,
+    }
+
+
+def get_work_dict(
+    work_id,
+    code,
+    title,
+    last_change,
+    original_title,
+    iswc,
+    other_titles,
+    origin,
+    writers,
+    performing_artists,
+    acknowledgements,
+):
+    """Return the dict of a work, without recordings, see
+    :meth:`Work.get_dict`.
+
+    Args:
+        code (str): see :attr:`Work.work_id`
+        other_titles (list): see :func:`get_alternate_title_dict`
+        origin (dict): see :func:`get_origin_dict`, or ``None``
+        writers (list): see :func:`get_writer_in_work_dict`
+        performing_artists (list): dicts with artists, see
+            :meth:`ArtistInWork.get_dict`
+        acknowledgements (iterable): (society code, remote work ID), only
+            the first one with a remote work ID for each society is used
+    """
+    cross_references = []
+    used_society_codes = set()
+    for society_code, remote_work_id in acknowledgements:
+        if not remote_work_id or society_code in used_society_codes:
+            continue
+        used_society_codes.add(society_code)
+        cross_references.append(
+            get_cross_reference_dict(society_code, remote_work_id)
+        )
+    return {
+        "id": work_id,
+        "code": code,
+        "work_title": title,
+        "last_change": last_change,
+        "version_type": (
+            {"code": "MOD", "name": "Modified Version of a musical work"}
+            if original_title
+            else {"code": "ORI", "name": "Original Work"}
+        ),
+        "iswc": iswc,
+        "other_titles": other_titles,
+        "origin": origin,
+        "writers": writers,
+        "performing_artists": performing_artists,
+        "original_works": (
+            [{"work_title": original_title}] if original_title else []
+        ),
+        "cross_references": cross_references,
+    }
+
+
 class Artist(ArtistBase):
     """Performing artist."""
 
@@ -53,13 +414,9 @@ class Artist(ArtistBase):
         Returns:
             dict: internal dict format
         """
-        return {
-            "id": self.id,
-            "code": self.artist_id,
-            "last_name": self.last_name,
-            "first_name": self.first_name or None,
-            "isni": self.isni or None,
-        }
+        return get_artist_dict(
+            self.id, self.last_name, self.first_name, self.isni
+        )
 
     @property
     def artist_id(self):
@@ -95,11 +452,7 @@ class Label(LabelBase):
         Returns:
             dict: internal dict format
         """
-        return {
-            "id": self.id,
-            "code": self.label_id,
-            "name": self.name,
-        }
+        return get_label_dict(self.id, self.name)
 
 
 class Library(LibraryBase):
@@ -129,13 +482,59 @@ class Library(LibraryBase):
     def get_dict(self):
         """Get the object in an internal dictionary format
 
+        Returns:
+            dict: internal dict format
+        """
+        return get_library_dict(self.id, self.name)
+
+
+class ReleaseManager(models.Manager):
+    """Manager for :class:`.models.Release` and its proxy classes.
+
+    Attributes:
+        chunk_size (int): number of releases fetched (with all prefetches)
+            at once
+    """
+
+    chunk_size = 100
+
+    def get_dict_items(self, qs):
+        """
+        Yield dictionaries for releases from the queryset, with tracks
+
+        Related objects used in :meth:`.models.Release.get_dict` and all the
+        methods it calls are prefetched, and releases are fetched in chunks,
+        so the number of queries depends only on the number of chunks.
+
+        Args:
+            qs (django.db.models.query.QuerySet)
+
+        Yields:
+            dict: internal dict format
+        """
+        qs = qs.select_related("release_label", "artist")
+        qs = qs.prefetch_related("tracks__recording__record_label")
+        qs = qs.prefetch_related("tracks__recording__artist")
+        work = "tracks__recording__work__"
+        qs = qs.prefetch_related(work + "alternatetitle_set")
+        qs = qs.prefetch_related(work + "writerinwork_set__writer")
+        qs = qs.prefetch_related(work + "artistinwork_set__artist")
+        qs = qs.prefetch_related(work + "library_release__library")
+        qs = qs.prefetch_related(work + "workacknowledgement_set")
+        for release in qs.iterator(chunk_size=self.chunk_size):
+            yield release.get_dict(with_tracks=True)
+
+    def get_dict(self, qs):
+        """Get the object in an internal dictionary format
+
+        Args:
+            qs (django.db.models.query.QuerySet)
+
         Returns:
             dict: internal dict format
         """
         return {
-            "id": self.id,
-            "code": self.library_id,
-            "name": self.name,
+            "releases": [release.get_dict(with_tracks=True) for release in qs]
         }
 
 
@@ -154,6 +553,8 @@ class Release(ReleaseBase):
     class Meta:
         verbose_name = "Release"
 
+    objects = ReleaseManager()
+
     library = models.ForeignKey(
         Library, null=True, blank=True, on_delete=models.PROTECT
     )
@@ -231,7 +632,7 @@ class Release(ReleaseBase):
         return d
 
 
-class LibraryReleaseManager(models.Manager):
+class LibraryReleaseManager(ReleaseManager):
     """Manager for a proxy class :class:`.models.LibraryRelease`"""
 
     def get_queryset(self):
@@ -247,19 +648,6 @@ class LibraryReleaseManager(models.Manager):
             .filter(cd_identifier__isnull=False, library__isnull=False)
         )
 
-    def get_dict(self, qs):
-        """Get the object in an internal dictionary format
-
-        Args:
-            qs (django.db.models.query.QuerySet)
-
-        Returns:
-            dict: internal dict format
-        """
-        return {
-            "releases": [release.get_dict(with_tracks=True) for release in qs]
-        }
-
 
 class LibraryRelease(Release):
     """Proxy class for Library Releases (AKA Library CDs)
@@ -296,14 +684,10 @@ class LibraryRelease(Release):
         Returns:
             dict: internal dict format
         """
-        return {
-            "origin_type": {"code": "LIB", "name": "Library Work"},
-            "cd_identifier": self.cd_identifier,
-            "library": self.library.get_dict(),
-        }
+        return get_origin_dict(self.cd_identifier, self.library.get_dict())
 
 
-class CommercialReleaseManager(models.Manager):
+class CommercialReleaseManager(ReleaseManager):
     """Manager for a proxy class :class:`.models.CommercialRelease`"""
 
     def get_queryset(self):
@@ -319,19 +703,6 @@ class CommercialReleaseManager(models.Manager):
             .filter(cd_identifier__isnull=True, library__isnull=True)
         )
 
-    def get_dict(self, qs):
-        """Get the object in an internal dictionary format
-
-        Args:
-            qs (django.db.models.query.QuerySet)
-
-        Returns:
-            dict: internal dict format
-        """
-        return {
-            "releases": [release.get_dict(with_tracks=True) for release in qs]
-        }
-
 
 class CommercialRelease(Release):
     """Proxy class for Commercial Releases
@@ -348,7 +719,7 @@ class CommercialRelease(Release):
     objects = CommercialReleaseManager()
 
 
-class PlaylistManager(models.Manager):
+class PlaylistManager(ReleaseManager):
     """Manager for a proxy class :class:`.models.Playlist`"""
 
     def get_queryset(self):
@@ -364,19 +735,6 @@ class PlaylistManager(models.Manager):
             .filter(cd_identifier__isnull=False, library__isnull=True)
         )
 
-    def get_dict(self, qs):
-        """Get the object in an internal dictionary format
-
-        Args:
-            qs (django.db.models.query.QuerySet)
-
-        Returns:
-            dict: internal dict format
-        """
-        return {
-            "releases": [release.get_dict(with_tracks=True) for release in qs]
-        }
-
 
 class Playlist(Release):
     """Proxy class for Playlists
@@ -462,59 +820,15 @@ class Writer(WriterBase):
             dict: JSON-serializable data structure
         """
 
-        d = {
-            "id": self.id,
-            "code": self.writer_id,
-            "first_name": self.first_name or None,
-            "last_name": self.last_name or None,
-            "ipi_name_number": self.ipi_name or None,
-            "ipi_base_number": self.ipi_base or None,
-            "account_number": self.account_number,
-            "affiliations": [],
-        }
-        if self.pr_society:
-            d["affiliations"].append(
-                {
-                    "organization": {
-                        "code": self.pr_society,
-                        "name": self.get_pr_society_display().split(",")[0],
-                    },
-                    "affiliation_type": {
-                        "code": "PR",
-                        "name": "Performance Rights",
-                    },
-                    "territory": WORLD_DICT,
-                }
-            )
-        if self.mr_society:
-            d["affiliations"].append(
-                {
-                    "organization": {
-                        "code": self.mr_society,
-                        "name": self.get_mr_society_display().split(",")[0],
-                    },
-                    "affiliation_type": {
-                        "code": "MR",
-                        "name": "Mechanical Rights",
-                    },
-                    "territory": WORLD_DICT,
-                }
-            )
-        if self.sr_society:
-            d["affiliations"].append(
-                {
-                    "organization": {
-                        "code": self.sr_society,
-                        "name": self.get_sr_society_display().split(",")[0],
-                    },
-                    "affiliation_type": {
-                        "code": "SR",
-                        "name": "Synchronization Rights",
-                    },
-                    "territory": WORLD_DICT,
-                }
-            )
-        return d
+        return get_writer_dict(
+            self.id,
+            self.first_name,
+            self.last_name,
+            self.ipi_name,
+            self.ipi_base,
+            self.account_number,
+            (self.pr_society, self.mr_society, self.sr_society),
+        )
 
 
 class WorkManager(models.Manager):
@@ -528,7 +842,7 @@ class WorkManager(models.Manager):
             django.db.models.query.QuerySet: Queryset with instances of \
             :class:`.models.Work`
         """
-        return super().get_queryset().prefetch_related("writers")
+        return super().get_queryset()
 
     def get_dict_items(self, qs):
         """
@@ -573,6 +887,45 @@ class WorkManager(models.Manager):
             "works": works,
         }
 
+    def update_writer_last_names(self, work_ids):
+        """Update :attr:`Work.writer_last_names` from writers in works.
+
+        Args:
+            work_ids (iterable): IDs of works
+
+        Returns:
+            dict: {work ID: writer last names}
+        """
+        result = {}
+        for chunk in chunked(work_ids, 500):
+            rows = WriterInWork.objects.filter(work_id__in=chunk)
+            rows = rows.values_list(
+                "work_id", "writer_id", "writer__last_name"
+            )
+            writers = defaultdict(dict)
+            for work_id, writer_id, last_name in rows:
+                writers[work_id][writer_id] = last_name
+            names = {
+                work_id: get_writer_last_names(writers[work_id].values())
+                for work_id in chunk
+            }
+            self.bulk_update(
+                [
+                    Work(id=work_id, writer_last_names=n)
+                    for work_id, n in names.items()
+                ],
+                ["writer_last_names"],
+            )
+            result.update(names)
+        return result
+
+
+def get_writer_last_names(last_names):
+    """Return last names of writers as shown with works, sorted and upper
+    case, trimmed to fit :attr:`Work.writer_last_names`."""
+    names = sorted(name.upper() for name in last_names if name)
+    return " / ".join(names)[:255]
+
 
 class Work(TitleBase):
     """Concrete class, with references to foreign objects.
@@ -592,6 +945,10 @@ class Work(TitleBase):
             Artists performing the work
         writers (django.db.models.ManyToManyField):
             Writers who created the work
+        writer_last_names (django.db.models.CharField): last names of
+            writers, kept up to date when writers or writers in work are
+            changed, so works can be shown and searched without joins,
+            not indexed, as search is by substring
         objects (WorkManager): Database Manager
     """
 
@@ -601,6 +958,10 @@ class Work(TitleBase):
         permissions = (
             ("can_process_royalties", "Can perform royalty calculations"),
         )
+        indexes = [
+            models.Index(Upper("iswc"), name="music_publisher_work_iswc_up"),
+            models.Index(fields=["last_change"]),
+        ]
 
     @staticmethod
     def persist_work_ids(qs):
@@ -652,6 +1013,13 @@ class Work(TitleBase):
     writers = models.ManyToManyField(
         "Writer", through="WriterInWork", related_name="works"
     )
+    writer_last_names = models.CharField(
+        "Writers' last names",
+        max_length=255,
+        blank=True,
+        default="",
+        editable=False,
+    )
 
     objects = WorkManager()
 
@@ -662,14 +1030,7 @@ class Work(TitleBase):
         Returns:
             str: Internal Work ID
         """
-        if self._work_id:
-            return self._work_id
-        if self.id is None:
-            return ""
-        return "{}{:06}".format(
-            settings.PUBLISHER_CODE,
-            self.id,
-        )
+        return get_work_code(self.id, self._work_id)
 
     @work_id.setter
     def work_id(self, value):
@@ -696,13 +1057,9 @@ class Work(TitleBase):
             self.iswc = self.iswc.replace("-", "").replace(".", "")
         return super().clean_fields(*args, **kwargs)
 
-    def writer_last_names(self):
-        writers = sorted(set(self.writers.all()), key=lambda w: w.last_name)
-        return " / ".join(w.last_name.upper() for w in writers)
-
     def __str__(self):
         return "{}: {} ({})".format(
-            self.work_id, self.title.upper(), self.writer_last_names()
+            self.work_id, self.title.upper(), self.writer_last_names
         )
 
     @staticmethod
@@ -712,6 +1069,7 @@ class Work(TitleBase):
         Returns:
             dict: JSON-serializable data structure
         """
+        short_name = get_registry().short_name
         j = {
             "id": 1,
             "code": settings.PUBLISHER_CODE,
@@ -722,9 +1080,7 @@ class Work(TitleBase):
                 {
                     "organization": {
                         "code": settings.PUBLISHER_SOCIETY_PR,
-                        "name": SOCIETY_DICT.get(
-                            settings.PUBLISHER_SOCIETY_PR, ""
-                        ).split(",")[0],
+                        "name": short_name(settings.PUBLISHER_SOCIETY_PR),
                     },
                     "affiliation_type": {
                         "code": "PR",
@@ -741,9 +1097,7 @@ class Work(TitleBase):
                 {
                     "organization": {
                         "code": settings.PUBLISHER_SOCIETY_MR,
-                        "name": SOCIETY_DICT.get(
-                            settings.PUBLISHER_SOCIETY_MR, ""
-                        ).split(",")[0],
+                        "name": short_name(settings.PUBLISHER_SOCIETY_MR),
                     },
                     "affiliation_type": {
                         "code": "MR",
@@ -759,9 +1113,7 @@ class Work(TitleBase):
                 {
                     "organization": {
                         "code": settings.PUBLISHER_SOCIETY_SR,
-                        "name": SOCIETY_DICT.get(
-                            settings.PUBLISHER_SOCIETY_SR, ""
-                        ).split(",")[0],
+                        "name": short_name(settings.PUBLISHER_SOCIETY_SR),
                     },
                     "affiliation_type": {
                         "code": "SR",
@@ -782,68 +1134,31 @@ class Work(TitleBase):
             dict: JSON-serializable data structure
         """
 
-        j = {
-            "id": self.id,
-            "code": self.work_id,
-            "work_title": self.title,
-            "last_change": self.last_change,
-            "version_type": (
-                {
-                    "code": "MOD",
-                    "name": "Modified Version of a musical work",
-                }
-                if self.original_title
-                else {
-                    "code": "ORI",
-                    "name": "Original Work",
-                }
-            ),
-            "iswc": self.iswc,
-            "other_titles": [
-                at.get_dict() for at in self.alternatetitle_set.all()
-            ],
-            "origin": (
+        j = get_work_dict(
+            self.id,
+            self.work_id,
+            self.title,
+            self.last_change,
+            self.original_title,
+            self.iswc,
+            [at.get_dict() for at in self.alternatetitle_set.all()],
+            (
                 self.library_release.get_origin_dict()
                 if self.library_release
                 else None
             ),
-            "writers": [],
-            "performing_artists": [],
-            "original_works": [],
-            "cross_references": [],
-        }
-
-        if self.original_title:
-            d = {"work_title": self.original_title}
-            j["original_works"].append(d)
-
-        # add data for (live) artists in work, normalize of required
-        for aiw in self.artistinwork_set.all():
-            d = aiw.get_dict()
-            j["performing_artists"].append(d)
-
-        # add data for writers in work, normalize of required
-        for wiw in self.writerinwork_set.all():
-            d = wiw.get_dict()
-            j["writers"].append(d)
-
+            [wiw.get_dict() for wiw in self.writerinwork_set.all()],
+            [aiw.get_dict() for aiw in self.artistinwork_set.all()],
+            (
+                (wa.society_code, wa.remote_work_id)
+                for wa in self.workacknowledgement_set.all()
+            ),
+        )
         if with_recordings:
             j["recordings"] = [
                 recording.get_dict(with_releases=True, with_work=False)
                 for recording in self.recordings.all()
             ]
-
-        # add cross references, currently only society work ids from ACKs
-        used_society_codes = []
-        for wa in self.workacknowledgement_set.all():
-            if not wa.remote_work_id:
-                continue
-            if wa.society_code in used_society_codes:
-                continue
-            used_society_codes.append(wa.society_code)
-            d = wa.get_dict()
-            j["cross_references"].append(d)
-
         return j
 
 
@@ -875,13 +1190,9 @@ class AlternateTitle(TitleBase):
         Returns:
             dict: JSON-serializable data structure
         """
-        return {
-            "title": str(self),
-            "title_type": {
-                "code": self.title_type,
-                "name": self.get_title_type_display(),
-            },
-        }
+        return get_alternate_title_dict(
+            self.work.title, self.title, self.suffix, self.title_type
+        )
 
     def __str__(self):
         if self.suffix:
@@ -1056,35 +1367,11 @@ class WriterInWork(models.Model):
     def get_agreement_dict(self):
         """Get agreement dictionary for this writer in work."""
 
-        pub_pr_soc = settings.PUBLISHER_SOCIETY_PR
-        pub_pr_name = SOCIETY_DICT.get(pub_pr_soc, "").split(",")[0]
-
         if not self.controlled or not self.writer:
             return None
-        if self.writer.generally_controlled and not self.saan:
-            # General
-            return {
-                "recipient_organization": {
-                    "code": pub_pr_soc,
-                    "name": pub_pr_name,
-                },
-                "recipient_agreement_number": self.writer.saan,
-                "agreement_type": {
-                    "code": "OG",
-                    "name": "Original General",
-                },
-            }
-        else:
-            return {
-                "recipient_organization": {
-                    "code": pub_pr_soc,
-                },
-                "recipient_agreement_number": self.saan,
-                "agreement_type": {
-                    "code": "OS",
-                    "name": "Original Specific",
-                },
-            }
+        return get_agreement_dict(
+            self.saan, self.writer.generally_controlled, self.writer.saan
+        )
 
     def get_dict(self):
         """Create a data structure that can be serialized as JSON.
@@ -1092,40 +1379,16 @@ class WriterInWork(models.Model):
         Returns:
             dict: JSON-serializable data structure
         """
-        writer = self.writer.get_dict() if self.writer else None
-        relative_share = str(self.relative_share / 100)
-        role = (
-            {
-                "code": self.capacity.strip(),
-                "name": self.get_capacity_display(),
-            }
-            if self.capacity
-            else None
+        return get_writer_in_work_dict(
+            self.writer.get_dict() if self.writer else None,
+            self.controlled,
+            self.relative_share,
+            self.capacity,
+            self.get_agreement_dict(),
         )
-        if self.controlled:
-            ops = [
-                {
-                    "publisher": self.work.get_publisher_dict(),
-                    "publisher_role": {
-                        "code": "E",
-                        "name": "Original publisher",
-                    },
-                    "agreement": self.get_agreement_dict(),
-                }
-            ]
-        else:
-            ops = []
-        j = {
-            "writer": writer,
-            "controlled": self.controlled,
-            "relative_share": relative_share,
-            "writer_role": role,
-            "original_publishers": ops,
-        }
-        return j
 
 
-class Recording(models.Model):
+class Recording(MediaBase):
     """Recording.
 
     Attributes:
@@ -1141,6 +1404,9 @@ class Recording(models.Model):
         verbose_name_plural = "Recordings"
         ordering = ("-id",)
 
+    MEDIA_FIELD = "audio_file"
+    DERIVATIVES = ("preview",)
+
     _recording_id = models.CharField(
         "Recording ID",
         max_length=14,
@@ -1236,11 +1502,7 @@ class Recording(models.Model):
         Returns:
             str
         """
-        if self.recording_title_suffix:
-            return "{} {}".format(
-                self.work.title, self.recording_title
-            ).strip()
-        return self.recording_title
+        return self.get_complete_titles()[0]
 
     @property
     def complete_version_title(self):
@@ -1250,12 +1512,25 @@ class Recording(models.Model):
         Returns:
             str
         """
-        if self.version_title_suffix:
-            return "{} {}".format(
-                self.complete_recording_title or self.work.title,
-                self.version_title,
-            ).strip()
-        return self.version_title
+        return self.get_complete_titles()[1]
+
+    def get_complete_titles(self):
+        """Return complete recording and version titles.
+
+        Returns:
+            tuple: (recording title, version title)
+        """
+        if self.recording_title_suffix or self.version_title_suffix:
+            work_title = self.work.title
+        else:
+            work_title = None
+        return get_complete_titles(
+            work_title,
+            self.recording_title,
+            self.recording_title_suffix,
+            self.version_title,
+            self.version_title_suffix,
+        )
 
     @property
     def title(self):
@@ -1277,14 +1552,7 @@ class Recording(models.Model):
         Returns:
             str: Internal Recording ID
         """
-        if self._recording_id:
-            return self._recording_id
-        if self.id is None:
-            return ""
-        return "{}{:06}R".format(
-            settings.PUBLISHER_CODE,
-            self.id,
-        )
+        return get_recording_code(self.id, self._recording_id)
 
     @recording_id.setter
     def recording_id(self, value):
@@ -1313,24 +1581,19 @@ class Recording(models.Model):
             dict: JSON-serializable data structure
 
         """
-        recording_title = self.complete_recording_title or self.work.title
-        date = (
-            self.release_date.strftime("%Y%m%d") if self.release_date else None
+        recording_title, version_title = self.get_complete_titles()
+        j = get_recording_dict(
+            self.id,
+            self.recording_id,
+            None if recording_title else self.work.title,
+            recording_title,
+            version_title,
+            self.release_date,
+            self.duration,
+            self.isrc,
+            self.artist.get_dict() if self.artist else None,
+            self.record_label.get_dict() if self.record_label else None,
         )
-        duration = duration_string(self.duration) if self.duration else None
-        artist = self.artist.get_dict() if self.artist else None
-        label = self.record_label.get_dict() if self.record_label else None
-        j = {
-            "id": self.id,
-            "code": self.recording_id,
-            "recording_title": recording_title,
-            "version_title": self.complete_version_title,
-            "release_date": date,
-            "duration": duration,
-            "isrc": self.isrc,
-            "recording_artist": artist,
-            "record_label": label,
-        }
         if with_releases:
             j["tracks"] = []
             for track in self.tracks.all():
@@ -1398,9 +1661,9 @@ class Track(models.Model):
 
 
 class DeferCwrManager(models.Manager):
-    """Manager for CWR Exports and ACK Imports.
+    """Manager for CWR Exports.
 
-    Defers :attr:`CWRExport.cwr` and :attr:`AckImport.cwr` fields.
+    Defers the :attr:`CWRExport.cwr` field.
 
     """
 
@@ -1410,22 +1673,129 @@ class DeferCwrManager(models.Manager):
         return qs
 
 
-class CWRExport(models.Model):
-    """Export in CWR format.
+class CWRExportManager(DeferCwrManager):
+    """Manager for :class:`CWRExport`, with ISWC request batches."""
 
-    Common Works Registration format is a standard format for registration of
-    musical works world-wide. Exports are available in CWR 2.1 revision 8 and
-    CWR 3.0 (experimental).
+    def get_iswc_request_work_ids(self, resend=False):
+        """Return IDs of works without ISWC, in order.
 
-    Attributes:
-        nwr_rev (django.db.models.CharField): choice field where user can
-            select which version and type of CWR it is
-        cwr (django.db.models.TextField): contents of CWR file
-        year (django.db.models.CharField): 2-digit year format
+        Args:
+            resend (bool): include works already in ISWC requests
+
+        Returns:
+            list: work IDs
+        """
+        qs = Work.objects.filter(models.Q(iswc=None) | models.Q(iswc=""))
+        if not resend:
+            requested = self.model.works.through.objects.filter(
+                cwrexport__nwr_rev="ISR"
+            ).values("work_id")
+            qs = qs.exclude(id__in=requested)
+        return list(qs.order_by("id").values_list("id", flat=True))
+
+    def create_iswc_requests(self, work_ids, size=None, description=""):
+        """Create ISWC requests (ISR files) for works, in batches.
+
+        Each request holds up to ``size`` works and is generated right
+        away, works in it are recorded in :attr:`CWRExport.works`.
+        Responses are matched by work IDs when ACK files are imported.
+
+        Args:
+            work_ids (list): IDs of works
+            size (int): maximal number of works in one file, default is
+                :attr:`CWRExport.iswc_request_size`
+            description (str): internal note for all requests
+
+        Returns:
+            list: created :class:`CWRExport` objects
+        """
+        size = size or self.model.iswc_request_size
+        through = self.model.works.through
+        exports = []
+        for chunk in chunked(work_ids, size):
+            with transaction.atomic():
+                export = self.create(nwr_rev="ISR", description=description)
+                through.objects.bulk_create(
+                    (through(cwrexport=export, work_id=pk) for pk in chunk),
+                    batch_size=1000,
+                )
+            export.create_cwr()
+            exports.append(export)
+        return exports
+
+    def get_iswc_requests(self):
+        """Return ISWC requests, annotated with the number of works
+        (``work_count``) and of works still without ISWC (``pending``)."""
+        no_iswc = models.Q(works__iswc=None) | models.Q(works__iswc="")
+        qs = self.filter(nwr_rev="ISR").order_by("id")
+        return qs.annotate(
+            work_count=models.Count("works"),
+            pending=models.Count("works", filter=no_iswc),
+        )
+
+
+def init_cwr_worker():
+    """Initialize a worker process for parallel CWR generation.
+
+    Required with ``spawn`` start method, harmless with ``fork``.
+    """
+    import django
+
+    django.setup()
+
+
+def render_cwr_transactions(attributes, works):
+    """Render CWR transactions in a worker process.
+
+    Args:
+        attributes (dict): :class:`CWRExport` attributes
+        works (list): list of work dicts
+
+    Returns:
+        list: see :meth:`CWRExport.render_transactions`
+    """
+    cwr_export = CWRExport()
+    for key, value in attributes.items():
+        setattr(cwr_export, key, value)
+    return cwr_export.render_transactions(works)
+
+
+def get_cwr_fingerprint(attributes, work):
+    """Return the fingerprint of a work dict, before it is rendered.
+
+    Args:
+        attributes (dict): :class:`CWRExport` attributes
+        work (dict): work dict
+
+    Returns:
+        str: hex digest
+    """
+    data = json.dumps([attributes, work], sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class CWRExport(models.Model):
+    """Export in CWR format.
+
+    Common Works Registration format is a standard format for registration of
+    musical works world-wide. Exports are available in CWR 2.1 revision 8 and
+    CWR 3.0 (experimental).
+
+    Attributes:
+        nwr_rev (django.db.models.CharField): choice field where user can
+            select which version and type of CWR it is
+        cwr (django.db.models.TextField): contents of CWR file
+        year (django.db.models.CharField): 2-digit year format
         num_in_year (django.db.models.PositiveSmallIntegerField): \
         CWR sequential number in a year
         works (django.db.models.ManyToManyField): included works
         description (django.db.models.CharField): internal note
+        iswc_request_size (int): default maximal number of works in one
+            ISWC request, see :meth:`CWRExportManager.create_iswc_requests`
+        cache_transactions (bool): reuse transactions rendered in earlier
+            exports, set from ``OPTION_CWR_CACHE`` in :meth:`create_cwr`
+        executor (concurrent.futures.ProcessPoolExecutor): process pool
+            kept for all chunks, see :meth:`process_pool`
 
     """
 
@@ -1433,8 +1803,11 @@ class CWRExport(models.Model):
         verbose_name = "CWR Export"
         verbose_name_plural = "CWR Exports"
         ordering = ("-id",)
+        indexes = [
+            models.Index(fields=["year", "num_in_year"]),
+        ]
 
-    objects = DeferCwrManager()
+    objects = CWRExportManager()
 
     nwr_rev = models.CharField(
         "CWR version/type",
@@ -1462,6 +1835,10 @@ class CWRExport(models.Model):
     description = models.CharField("Internal Note", blank=True, max_length=60)
 
     publisher_code = None
+    checkpoint_size = 1000
+    cache_transactions = False
+    executor = None
+    iswc_request_size = 10000
     agreement_pr = settings.PUBLISHING_AGREEMENT_PUBLISHER_PR
     agreement_mr = settings.PUBLISHING_AGREEMENT_PUBLISHER_MR
     agreement_sr = settings.PUBLISHING_AGREEMENT_PUBLISHER_SR
@@ -1477,6 +1854,24 @@ class CWRExport(models.Model):
             return "22"
         return "21"
 
+    @property
+    def transaction_type(self):
+        """Return the transaction type, NWR and REV in CWR 2.2 too."""
+        return {"NW2": "NWR", "RE2": "REV"}.get(self.nwr_rev, self.nwr_rev)
+
+    @property
+    def transaction_cache(self):
+        """Return the key of transactions in :class:`CWRTransaction` and the
+        record type set in their first record.
+
+        In CWR 2.x, NWR and REV transactions differ only in the record
+        type of the first record, so they share the key and the record type
+        is set when lines are yielded. Other transactions are kept as
+        rendered, under a key of their own."""
+        if self.version in ["21", "22"]:
+            return self.version, self.transaction_type
+        return self.version + self.nwr_rev, None
+
     @property
     def filename(self):
         """Return CWR file name.
@@ -1671,13 +2066,7 @@ class CWRExport(models.Model):
         for work in works:
             # WRK
             self.record_sequence = 0
-            if self.version == "22":
-                if self.nwr_rev == "NW2":
-                    record_type = "NWR"
-                elif self.nwr_rev == "RE2":
-                    record_type = "REV"
-            else:
-                record_type = self.nwr_rev
+            record_type = self.transaction_type
             indicator = "Y" if work["recordings"] else "U"
             version_type = (
                 "MOD   UNSUNS"
@@ -1981,6 +2370,183 @@ class CWRExport(models.Model):
         for xrf in work["cross_references"]:
             yield self.get_transaction_record("XRF", xrf)
 
+    def yield_transaction_lines(self, works):
+        """Yield transaction lines, ISR or registrations, for works."""
+        if self.nwr_rev == "ISR":
+            return self.yield_iswc_request_lines(works)
+        return self.yield_registration_lines(works)
+
+    def render_transactions(self, works):
+        """Render transactions for works, each one numbered as the first.
+
+        Record sequences are already relative to the transaction, so only
+        the transaction sequence has to be set when lines are merged.
+
+        Args:
+            works (list): list of work dicts
+
+        Returns:
+            list: (lines, record_count) tuple for each work
+        """
+        transactions = []
+        for work in works:
+            self.record_count = self.transaction_count = 0
+            lines = [
+                line for line in self.yield_transaction_lines([work]) if line
+            ]
+            transactions.append((lines, self.record_count))
+        return transactions
+
+    def get_attributes(self):
+        """Return attributes needed to render transactions elsewhere, see
+        :func:`render_cwr_transactions`."""
+        return {
+            "nwr_rev": self.nwr_rev,
+            "publisher_code": self.publisher_code,
+            "agreement_pr": self.agreement_pr,
+            "agreement_mr": self.agreement_mr,
+            "agreement_sr": self.agreement_sr,
+        }
+
+    @contextmanager
+    def process_pool(self, processes):
+        """Keep a process pool in :attr:`executor` while in the block.
+
+        Without processes, or if a pool is already kept, nothing is done.
+        """
+        if not processes or self.executor is not None:
+            yield
+            return
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            processes, initializer=init_cwr_worker
+        ) as self.executor:
+            try:
+                yield
+            finally:
+                self.executor = None
+
+    def render_parallel_transactions(self, works, processes):
+        """Render transactions in a process pool, in order.
+
+        The pool in :attr:`executor` is used, if kept, a new one otherwise.
+
+        Args:
+            works (list): list of work dicts
+            processes (int): number of worker processes
+
+        Yields:
+            tuple: (lines, record_count), see :meth:`render_transactions`
+        """
+        attributes = self.get_attributes()
+        chunk_size = max(1, min(500, len(works) // (processes * 4)))
+        with self.process_pool(processes):
+            results = self.executor.map(
+                render_cwr_transactions,
+                [attributes] * ((len(works) - 1) // chunk_size + 1),
+                chunked(works, chunk_size),
+            )
+            for transactions in results:
+                yield from transactions
+
+    def yield_numbered_lines(self, transactions, record_type=None):
+        """Yield lines of transactions rendered as the first one.
+
+        Transaction sequences (columns 4-11) are set here, the same way
+        the ``rjust`` filter does it, and counters are updated for GRT
+        and TRL records.
+
+        Args:
+            transactions (iterable): (lines, record_count) tuples
+            record_type (str): record type set in the first record of each
+                transaction, if given
+
+        Yields:
+            str: CWR record (row/line)
+        """
+        for lines, record_count in transactions:
+            sequence = str(self.transaction_count).rjust(8, "0")[:8]
+            for i, line in enumerate(lines):
+                if i == 0 and record_type:
+                    yield record_type + sequence + line[11:]
+                else:
+                    yield line[:3] + sequence + line[11:]
+            self.record_count += record_count
+            self.transaction_count += 1
+
+    def yield_parallel_transaction_lines(self, works, processes):
+        """Render transactions in a process pool and merge them in order.
+
+        Args:
+            works (list): list of work dicts
+            processes (int): number of worker processes
+
+        Yields:
+            str: CWR record (row/line)
+        """
+        return self.yield_numbered_lines(
+            self.render_parallel_transactions(works, processes)
+        )
+
+    def yield_cached_transaction_lines(self, works, processes=0):
+        """Yield transaction lines, reusing transactions from earlier
+        exports, see :class:`CWRTransaction`.
+
+        Transactions of works with a different fingerprint, or never
+        rendered for :attr:`transaction_cache`, are rendered, in worker processes
+        if set, and stored.
+
+        Args:
+            works (list): list of work dicts
+            processes (int): number of worker processes, or ``0``
+
+        Yields:
+            str: CWR record (row/line)
+        """
+        attributes = self.get_attributes()
+        key, record_type = self.transaction_cache
+        # the record type is set when lines are yielded
+        context = dict(attributes, nwr_rev=None)
+        fingerprints = {
+            work["id"]: get_cwr_fingerprint(context, work) for work in works
+        }
+        cached = {}
+        for chunk in chunked(fingerprints, 900):
+            qs = CWRTransaction.objects.filter(key=key, work_id__in=chunk)
+            for work_id, fingerprint, lines, count in qs.values_list(
+                "work_id", "fingerprint", "lines", "record_count"
+            ):
+                if fingerprints[work_id] == fingerprint:
+                    cached[work_id] = (lines, count)
+        missing = [work for work in works if work["id"] not in cached]
+        if processes:
+            rendered = self.render_parallel_transactions(missing, processes)
+        else:
+            rendered = render_cwr_transactions(attributes, missing)
+        objs = []
+        for work, (lines, count) in zip(missing, rendered):
+            cached[work["id"]] = (lines, count)
+            objs.append(
+                CWRTransaction(
+                    work_id=work["id"],
+                    key=key,
+                    fingerprint=fingerprints[work["id"]],
+                    lines=lines,
+                    record_count=count,
+                )
+            )
+        CWRTransaction.objects.bulk_create(
+            objs,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["work", "key"],
+            update_fields=["fingerprint", "lines", "record_count"],
+        )
+        return self.yield_numbered_lines(
+            (cached[work["id"]] for work in works), record_type
+        )
+
     def get_header(self):
         """Construct CWR HDR record."""
         return self.get_record(
@@ -1994,6 +2560,14 @@ class CWRExport(models.Model):
             },
         )
 
+    def yield_header_lines(self):
+        """Yield HDR and GRH records."""
+        yield self.get_header()
+
+        yield self.get_record(
+            "GRH", {"transaction_type": self.transaction_type}
+        )
+
     def yield_lines(self, works):
         """Yield CWR transaction records (rows/lines) for works
 
@@ -2006,23 +2580,35 @@ class CWRExport(models.Model):
 
         self.record_count = self.record_sequence = self.transaction_count = 0
 
-        yield self.get_header()
-
-        if self.nwr_rev == "NW2":
-            yield self.get_record("GRH", {"transaction_type": "NWR"})
-        elif self.nwr_rev == "RE2":
-            yield self.get_record("GRH", {"transaction_type": "REV"})
-        else:
-            yield self.get_record("GRH", {"transaction_type": self.nwr_rev})
-
-        if self.nwr_rev == "ISR":
-            lines = self.yield_iswc_request_lines(works)
-        else:
-            lines = self.yield_registration_lines(works)
-
-        for line in lines:
-            yield line
+        yield from self.yield_header_lines()
+        processes = self.get_processes(len(works))
+        yield from self.yield_works_lines(works, processes)
+        yield from self.yield_trailer_lines()
 
+    @staticmethod
+    def get_processes(work_count):
+        """Return the number of worker processes for ``work_count`` works,
+        ``0`` if transactions should be rendered in this process."""
+        processes = settings.OPTION_CWR_PROCESSES
+        if (
+            processes > 1
+            and work_count >= settings.OPTION_CWR_PARALLEL_MIN_WORKS
+        ):
+            return processes
+        return 0
+
+    def yield_works_lines(self, works, processes=0):
+        """Yield transaction lines, in worker processes if set, reusing
+        transactions from earlier exports if :attr:`cache_transactions`
+        is set."""
+        if self.cache_transactions:
+            return self.yield_cached_transaction_lines(works, processes)
+        if processes:
+            return self.yield_parallel_transaction_lines(works, processes)
+        return self.yield_transaction_lines(works)
+
+    def yield_trailer_lines(self):
+        """Yield GRT and TRL records, counters must be set."""
         yield self.get_record(
             "GRT",
             {
@@ -2038,31 +2624,232 @@ class CWRExport(models.Model):
             },
         )
 
+    def allocate_number(self):
+        """Set year and the sequential number in the year, and save.
+
+        See :meth:`CWRExportSequenceManager.next_number`."""
+        year = timezone.now().strftime("%y")
+        with transaction.atomic():
+            self.year = year
+            self.num_in_year = CWRExportSequence.objects.next_number(year)
+            self.save(update_fields=["year", "num_in_year"])
+
+    def get_progress(self):
+        """Return progress of CWR generation, from checkpoints.
+
+        Returns:
+            dict: ``total`` and ``done`` works, ``rate`` in works per
+            second and ``eta`` in seconds, both ``None`` if unknown
+        """
+        totals = self.chunks.aggregate(
+            done=models.Sum("work_count"), duration=models.Sum("duration")
+        )
+        total = self.works.count()
+        done = totals["done"] or 0
+        rate = eta = None
+        if totals["duration"]:
+            rate = done / totals["duration"]
+            eta = (total - done) / rate if rate else None
+        return {"total": total, "done": done, "rate": rate, "eta": eta}
+
     def create_cwr(self, publisher_code=None):
-        """Create CWR and save."""
-        now = timezone.now()
+        """Create CWR and save.
+
+        Transactions are generated in chunks of ``checkpoint_size`` works,
+        each one saved as a :class:`CWRExportChunk` with the counters, in
+        one process pool, if worker processes are used. If
+        generation is interrupted, calling this method again resumes it
+        from the last checkpoint, with the same number in the year.
+        Checkpoints are joined and deleted when all works are done.
+        """
         if publisher_code is None:
             publisher_code = settings.PUBLISHER_CODE
         self.publisher_code = publisher_code
         if self.cwr:
             return
-        self.created_on = now
-        self.year = now.strftime("%y")
-        nr = type(self).objects.filter(year=self.year)
-        nr = nr.order_by("-num_in_year").first()
-        if nr:
-            self.num_in_year = nr.num_in_year + 1
+        if not self.num_in_year:
+            self.allocate_number()
+        from .cwr_loader import get_cwr_dict_items
+
+        qs = self.works.order_by("id")
+        processes = self.get_processes(qs.count())
+        self.cache_transactions = settings.OPTION_CWR_CACHE
+        last = self.chunks.order_by("-number").first()
+        if last:
+            qs = qs.filter(id__gt=last.last_work_id)
+            self.transaction_count = last.transaction_count
+            self.record_count = last.record_count
+            number = last.number
         else:
-            self.num_in_year = 1
-        qs = self.works.order_by(
-            "id",
+            self.transaction_count = self.record_count = 0
+            number = 0
+        with self.process_pool(processes):
+            for works in chunked(get_cwr_dict_items(qs), self.checkpoint_size):
+                start = time.perf_counter()
+                self.record_sequence = 0
+                cwr = "".join(self.yield_works_lines(works, processes))
+                number += 1
+                CWRExportChunk.objects.create(
+                    export=self,
+                    number=number,
+                    last_work_id=works[-1]["id"],
+                    work_count=len(works),
+                    transaction_count=self.transaction_count,
+                    record_count=self.record_count,
+                    duration=time.perf_counter() - start,
+                    cwr=cwr,
+                )
+        self.created_on = timezone.now()
+        chunks = self.chunks.order_by("number").values_list("cwr", flat=True)
+        self.cwr = "".join(
+            chain(
+                self.yield_header_lines(), chunks, self.yield_trailer_lines()
+            )
         )
-        works = Work.objects.get_dict(qs)["works"]
-        self.cwr = "".join(self.yield_lines(works))
-        self.save()
+        with transaction.atomic():
+            self.save()
+            self.chunks.all().delete()
         Work.persist_work_ids(self.works)
 
 
+class CWRExportSequenceManager(models.Manager):
+    """Manager for :class:`CWRExportSequence`."""
+
+    def next_number(self, year):
+        """Return the next sequential number of CWR files in the year.
+
+        The increment is the first statement in the transaction, so the
+        sequence row (the database in SQLite) is locked before it is read
+        and concurrent exports get different numbers. If there is no row
+        for the year, it starts from the highest number in exports.
+
+        Args:
+            year (str): 2-digit year
+
+        Returns:
+            int: the number
+        """
+        qs = self.filter(year=year)
+        with transaction.atomic():
+            if not qs.update(last_number=models.F("last_number") + 1):
+                last = CWRExport.objects.filter(year=year).aggregate(
+                    models.Max("num_in_year")
+                )["num_in_year__max"]
+                try:
+                    with transaction.atomic():
+                        self.create(year=year, last_number=(last or 0) + 1)
+                except IntegrityError:
+                    # created in the meantime
+                    qs.update(last_number=models.F("last_number") + 1)
+            return qs.values_list("last_number", flat=True)[0]
+
+
+class CWRExportSequence(models.Model):
+    """The last sequential number of CWR files in a year.
+
+    Attributes:
+        year (django.db.models.CharField): 2-digit year
+        last_number (django.db.models.PositiveIntegerField): the last
+            allocated number
+    """
+
+    class Meta:
+        verbose_name = "CWR Export Sequence"
+
+    objects = CWRExportSequenceManager()
+
+    year = models.CharField(max_length=2, unique=True)
+    last_number = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return "{}: {}".format(self.year, self.last_number)
+
+
+class CWRExportChunk(models.Model):
+    """Checkpoint of CWR generation, see :meth:`CWRExport.create_cwr`.
+
+    Attributes:
+        export (django.db.models.ForeignKey): FK to CWRExport
+        number (django.db.models.PositiveIntegerField): sequential number
+        last_work_id (django.db.models.PositiveIntegerField): ID of the
+            last work in this chunk, works are ordered by ID
+        work_count (django.db.models.PositiveIntegerField): works in this
+            chunk
+        transaction_count (django.db.models.PositiveIntegerField): \
+        transactions in all chunks so far
+        record_count (django.db.models.PositiveIntegerField): \
+        transaction records in all chunks so far
+        duration (django.db.models.FloatField): seconds spent generating
+        cwr (django.db.models.TextField): transaction lines
+    """
+
+    class Meta:
+        verbose_name = "CWR Export Checkpoint"
+        ordering = ("export", "number")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["export", "number"],
+                name="music_publisher_cwrexportchunk_unique",
+            ),
+        ]
+
+    export = models.ForeignKey(
+        CWRExport, on_delete=models.CASCADE, related_name="chunks"
+    )
+    number = models.PositiveIntegerField()
+    last_work_id = models.PositiveIntegerField()
+    work_count = models.PositiveIntegerField()
+    transaction_count = models.PositiveIntegerField()
+    record_count = models.PositiveIntegerField()
+    duration = models.FloatField()
+    created_on = models.DateTimeField(auto_now_add=True)
+    cwr = models.TextField(blank=True)
+
+    def __str__(self):
+        return "{} #{}".format(self.export, self.number)
+
+
+class CWRTransaction(models.Model):
+    """Rendered CWR transaction of a work, reused in later exports.
+
+    Lines are rendered as the first transaction in a file, sequence
+    numbers and the record type are set when they are used, see
+    :meth:`CWRExport.yield_cached_transaction_lines`. The transaction is
+    rendered again if the fingerprint of the work dict changes, so any
+    change of the work or related objects invalidates it.
+
+    Attributes:
+        work (django.db.models.ForeignKey): FK to Work
+        key (django.db.models.CharField): see
+            :attr:`CWRExport.transaction_cache`
+        fingerprint (django.db.models.CharField): see
+            :func:`get_cwr_fingerprint`
+        lines (django.db.models.JSONField): rendered lines
+        record_count (django.db.models.PositiveIntegerField): records in
+            the transaction
+    """
+
+    class Meta:
+        verbose_name = "CWR Transaction"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["work", "key"],
+                name="music_publisher_cwrtransaction_unique",
+            ),
+        ]
+
+    work = models.ForeignKey(
+        Work, on_delete=models.CASCADE, related_name="cwr_transactions"
+    )
+    key = models.CharField(max_length=8)
+    fingerprint = models.CharField(max_length=64)
+    lines = models.JSONField(default=list)
+    record_count = models.PositiveIntegerField()
+
+    def __str__(self):
+        return "{} {}".format(self.work_id, self.key)
+
+
 class WorkAcknowledgement(models.Model):
     """Acknowledgement of work registration.
 
@@ -2080,6 +2867,7 @@ class WorkAcknowledgement(models.Model):
         ordering = ("-date", "-id")
         indexes = [
             models.Index(fields=["society_code", "remote_work_id"]),
+            models.Index(fields=["work", "society_code", "status"]),
         ]
 
     TRANSACTION_STATUS_CHOICES = (
@@ -2112,16 +2900,200 @@ class WorkAcknowledgement(models.Model):
         Returns:
             dict: JSON-serializable data structure
         """
-        # if not self.remote_work_id:
-        #     return None
-        j = {
-            "organization": {
-                "code": self.society_code,
-                "name": self.get_society_code_display().split(",")[0],
-            },
-            "identifier": self.remote_work_id,
-        }
-        return j
+        return get_cross_reference_dict(self.society_code, self.remote_work_id)
+
+
+class WorkRegistrationStatusManager(models.Manager):
+    """Manager for :class:`.models.WorkRegistrationStatus`."""
+
+    chunk_size = 500
+
+    def refresh(self, work_ids=None):
+        """Rebuild the latest statuses for works, all of them by default.
+
+        Acknowledgements are read one chunk of works at a time, the latest
+        one per society is picked in Python and written with
+        ``bulk_create``.
+
+        Args:
+            work_ids (iterable): ids of works with changed acknowledgements
+        """
+        if work_ids is None:
+            work_ids = Work.objects.order_by("id").values_list("id", flat=True)
+        for chunk in chunked(work_ids, self.chunk_size):
+            acks = WorkAcknowledgement.objects.filter(work_id__in=chunk)
+            acks = acks.order_by("work_id", "society_code", "-date", "-id")
+            acks = acks.values_list(
+                "work_id", "society_code", "status", "date", "remote_work_id"
+            )
+            latest = {}
+            for row in acks:
+                latest.setdefault(row[:2], row)
+            self.filter(work_id__in=chunk).delete()
+            self.bulk_create(
+                WorkRegistrationStatus(
+                    work_id=work_id,
+                    society_code=society_code,
+                    status=status,
+                    date=date,
+                    remote_work_id=remote_work_id,
+                )
+                for work_id, society_code, status, date, remote_work_id in (
+                    latest.values()
+                )
+            )
+
+
+class WorkRegistrationStatus(models.Model):
+    """The latest acknowledgement status of a work per society.
+
+    This is a summary of :class:`.models.WorkAcknowledgement`, used by list
+    filters and the registration status matrix. It is rebuilt with
+    :meth:`WorkRegistrationStatusManager.refresh` when acknowledgements
+    are imported or edited.
+
+    Attributes:
+        work (django.db.models.ForeignKey): FK to Work
+        society_code (django.db.models.CharField): 3-digit society code
+        status (django.db.models.CharField): 2-letter status code
+        date (django.db.models.DateField): Date of the latest acknowledgement
+        remote_work_id (django.db.models.CharField): Remote work ID
+    """
+
+    class Meta:
+        verbose_name = "Registration Status"
+        verbose_name_plural = "Registration Statuses"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["work", "society_code"],
+                name="music_publisher_workregistrationstatus_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["society_code", "status", "work"]),
+            models.Index(fields=["status", "work"]),
+        ]
+
+    objects = WorkRegistrationStatusManager()
+
+    work = models.ForeignKey(
+        Work, on_delete=models.CASCADE, related_name="registration_statuses"
+    )
+    society_code = models.CharField("Society", max_length=3, choices=SOCIETIES)
+    status = models.CharField(
+        max_length=2, choices=WorkAcknowledgement.TRANSACTION_STATUS_CHOICES
+    )
+    date = models.DateField()
+    remote_work_id = models.CharField(
+        "Remote work ID", max_length=20, blank=True
+    )
+
+    def __str__(self):
+        return "{} {}".format(self.society_code, self.status)
+
+
+class WorkIndexChangeManager(models.Manager):
+    """Manager for :class:`.models.WorkIndexChange`.
+
+    Attributes:
+        keep (int): number of the latest changes kept in the log
+    """
+
+    keep = 10000
+
+    def log(self, work_ids):
+        """Log changes of works, their recordings or acknowledgements.
+
+        Called from signals, and explicitly after bulk operations. Every
+        :attr:`keep` changes, older ones are deleted.
+
+        Args:
+            work_ids (iterable): ids of changed works
+        """
+        changes = self.bulk_create(
+            (WorkIndexChange(work_id=work_id) for work_id in work_ids),
+            batch_size=1000,
+        )
+        if changes and changes[-1].id is None:
+            # some databases do not return IDs from bulk inserts
+            changes[-1] = self.order_by("-id").first()
+        last_id = changes[-1].id if changes else 0
+        if last_id // self.keep != (last_id - len(changes)) // self.keep:
+            self.filter(id__lte=last_id - self.keep).delete()
+
+
+class WorkIndexChange(models.Model):
+    """A change of work identifiers, for :mod:`.work_index`.
+
+    The latest applied change is the version of data in the index, and
+    changes not applied by a process yet are applied incrementally.
+    Time is a part of the version, IDs may be reused after rollbacks.
+
+    Attributes:
+        work_id (django.db.models.PositiveIntegerField): ID of the work,
+            not a foreign key, as the work may be deleted
+        time (django.db.models.DateTimeField): time of the change
+    """
+
+    objects = WorkIndexChangeManager()
+
+    work_id = models.PositiveIntegerField()
+    time = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return "{} {}".format(self.work_id, self.time)
+
+
+class ACKFileManager(models.Manager):
+    """Manager for :class:`ACKFile`."""
+
+    def store(self, content):
+        """Return the stored file with this content, store it if new.
+
+        Args:
+            content (str): contents of the ACK file
+
+        Returns:
+            tuple: (:class:`ACKFile`, ``True`` if it was stored now)
+        """
+        raw = content.encode("latin1")
+        digest = hashlib.sha256(raw).hexdigest()
+        return self.get_or_create(
+            sha256=digest,
+            defaults={"size": len(raw), "data": zlib.compress(raw)},
+        )
+
+
+class ACKFile(models.Model):
+    """Contents of an acknowledgement file, stored once.
+
+    Files are identified by the SHA-256 hash of their contents, so files
+    uploaded again are found with one indexed lookup and not stored again.
+    Contents are compressed. A file is deleted with its last import, see
+    :func:`delete_unused_ack_file`.
+
+    Attributes:
+        sha256 (django.db.models.CharField): hex digest of contents
+        size (django.db.models.PositiveIntegerField): uncompressed size
+        data (django.db.models.BinaryField): zlib-compressed contents
+    """
+
+    class Meta:
+        verbose_name = "CWR ACK File"
+
+    objects = ACKFileManager()
+
+    sha256 = models.CharField(max_length=64, unique=True, editable=False)
+    size = models.PositiveIntegerField(editable=False)
+    data = models.BinaryField(editable=False)
+
+    @cached_property
+    def content(self):
+        """Return decompressed contents, decompressed only once."""
+        return zlib.decompress(self.data).decode("latin1")
+
+    def __str__(self):
+        return self.sha256
 
 
 class ACKImport(models.Model):
@@ -2135,21 +3107,34 @@ class ACKImport(models.Model):
             used if society code is missing.
         date (django.db.models.DateField): Acknowledgement date
         report (django.db.models.CharField): Basically a log
-        cwr (django.db.models.TextField): contents of CWR file
+        ack_file (django.db.models.ForeignKey): stored file, shared by
+            all imports of the same file
     """
 
     class Meta:
         verbose_name = "CWR ACK Import"
         ordering = ("-date", "-id")
 
-    objects = DeferCwrManager()
-
     filename = models.CharField(max_length=60, editable=False)
     society_code = models.CharField(max_length=3, editable=False)
     society_name = models.CharField(max_length=45, editable=False)
     date = models.DateField(editable=False)
     report = models.TextField(editable=False)
-    cwr = models.TextField(blank=True, editable=False)
+    ack_file = models.ForeignKey(
+        ACKFile,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="imports",
+    )
+
+    @property
+    def cwr(self):
+        """Return contents of the CWR file, loaded when first used."""
+        if self.ack_file_id is None:
+            return ""
+        return self.ack_file.content
 
     def __str__(self):
         return self.filename
@@ -2207,3 +3192,112 @@ def change_case(sender, instance, **kwargs):
             if convertible:
                 value = force_case(value)
                 setattr(instance, field.name, value)
+
+
+@receiver(post_save)
+def media_derivatives(sender, instance, raw=False, **kwargs):
+    """Schedule creation of derivatives for new or changed media files.
+
+    Not for loaded fixtures or backups, see ``dmp_media_derivatives``."""
+    if raw or not isinstance(instance, MediaBase):
+        return
+    if needs_derivatives(instance):
+        schedule_derivatives(instance)
+
+
+def check_for_changes(sender, instance, raw=False, **kwargs):
+    """Find out if changes must be propagated to affected works."""
+    if raw or instance.pk is None:
+        return
+    instance._propagate_changes = has_changed(instance)
+
+
+def propagate_changes(sender, instance, created=False, raw=False, **kwargs):
+    """Update ``last_change`` of works affected by a changed object."""
+    if raw or created or not getattr(instance, "_propagate_changes", False):
+        return
+    instance._propagate_changes = False
+    schedule_propagation(
+        get_label(sender),
+        [instance.pk],
+        getattr(instance, "_previous_work_ids", []),
+    )
+    instance._previous_work_ids = []
+
+
+def propagate_deletion(sender, instance, **kwargs):
+    """Update ``last_change`` of works affected by a deleted object.
+
+    Works are collected now, before related objects are deleted.
+    """
+    label = get_label(sender)
+    schedule_propagation(label, [], get_work_ids(label, [instance.pk]))
+
+
+# Receivers are connected only for models in SOURCES, including proxies.
+# Delete signals for all models would disable fast deletes in Django.
+SOURCE_MODELS = (
+    Writer,
+    Artist,
+    Label,
+    Library,
+    Release,
+    LibraryRelease,
+    CommercialRelease,
+    Playlist,
+    Recording,
+    Track,
+)
+
+for source_model in SOURCE_MODELS:
+    pre_save.connect(check_for_changes, sender=source_model)
+    post_save.connect(propagate_changes, sender=source_model)
+    pre_delete.connect(propagate_deletion, sender=source_model)
+
+
+@receiver(post_save, sender=Work)
+@receiver(post_delete, sender=Work)
+@receiver(post_save, sender=Recording)
+@receiver(post_delete, sender=Recording)
+@receiver(post_save, sender=WorkAcknowledgement)
+@receiver(post_delete, sender=WorkAcknowledgement)
+def log_work_index_change(sender, instance, raw=False, **kwargs):
+    """Log changes of works, recordings and acknowledgements."""
+    if raw:
+        return
+    if sender is Work:
+        WorkIndexChange.objects.log([instance.id])
+    elif instance.work_id:
+        WorkIndexChange.objects.log([instance.work_id])
+
+
+@receiver(post_save, sender=WriterInWork)
+@receiver(post_delete, sender=WriterInWork)
+def update_writer_last_names(sender, instance, raw=False, **kwargs):
+    """Update last names of writers stored in the work."""
+    if raw:
+        return
+    names = Work.objects.update_writer_last_names([instance.work_id])
+    if WriterInWork.work.is_cached(instance):
+        instance.work.writer_last_names = names[instance.work_id]
+
+
+@receiver(post_save, sender=Writer)
+def update_writer_last_names_in_works(
+    sender, instance, created=False, raw=False, **kwargs
+):
+    """Update last names stored in works when the last name is changed."""
+    if raw or created:
+        return
+    if "last_name" not in getattr(instance, "_changed_fields", ()):
+        return
+    work_ids = WriterInWork.objects.filter(writer_id=instance.id)
+    work_ids = work_ids.values_list("work_id", flat=True).order_by("work_id")
+    Work.objects.update_writer_last_names(list(work_ids))
+
+
+@receiver(post_delete, sender=ACKImport)
+def delete_unused_ack_file(sender, instance, **kwargs):
+    """Delete the stored ACK file when its last import is deleted."""
+    if instance.ack_file_id:
+        ACKFile.objects.filter(id=instance.ack_file_id, imports=None).delete()
@@ -3,7 +3,12 @@ This module is about processing royalty statements.
 
 It processes files in the request-response cycle, not in background workers.
 Therefore, focus is on speed. Nothing is written to the database, and
-SELECTs are optimised and performed in one batch.
+SELECTs are optimised and performed in batches of identifiers, so large
+statements do not hit limits on the number of query parameters.
+Identifiers not in the :mod:`.work_index` are not queried at all.
+
+    Attributes:
+        BATCH_SIZE (int): number of identifiers in one query
 
 """
 
@@ -11,6 +16,7 @@ import csv
 import os
 from collections import defaultdict
 from decimal import Decimal
+from itertools import chain
 from io import TextIOWrapper
 from tempfile import NamedTemporaryFile
 
@@ -18,11 +24,15 @@ from django import forms
 from django.conf import settings
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db.models import F
 from django.http import FileResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic.edit import FormView
 
 from .models import SOCIETY_DICT, WorkAcknowledgement, Writer, WriterInWork
+from .work_index import get_work_index
+
+BATCH_SIZE = 900  # below 999, the lowest SQLite limit on parameters
 
 
 def get_id_sources():
@@ -216,6 +226,9 @@ class RoyaltyCalculation(object):
         """
         Return the appropriate queryset based on work ID source and ids.
 
+        For society codes, works are matched through acknowledgements, the
+        lookup uses the index on society code and remote work ID.
+
         Returns:
             queryset with :class:`.models.WriterInWork` objects. \
             ``query_id`` has the matched field value.
@@ -223,26 +236,23 @@ class RoyaltyCalculation(object):
         qs = WriterInWork.objects.filter(controlled=True)
         if self.work_id_source == settings.PUBLISHER_CODE:
             qs = qs.filter(work___work_id__in=work_ids)
-            qs = qs.extra(select={"query_id": "_work_id"})
+            qs = qs.annotate(query_id=F("work___work_id"))
         elif self.work_id_source == "ISWC":
             qs = qs.filter(work__iswc__in=work_ids)
-            qs = qs.extra(select={"query_id": "iswc"})
+            qs = qs.annotate(query_id=F("work__iswc"))
         elif self.work_id_source == "ISRC":
             qs = qs.filter(work__recordings__isrc__in=work_ids)
-            qs = qs.extra(select={"query_id": "isrc"})
+            qs = qs.annotate(query_id=F("work__recordings__isrc"))
         else:
+            # one filter call, so the annotation uses the same join
             qs = qs.filter(
-                work__workacknowledgement__society_code=self.work_id_source
+                work__workacknowledgement__society_code=self.work_id_source,
+                work__workacknowledgement__remote_work_id__in=work_ids,
             )
-            qs = qs.filter(
-                work__workacknowledgement__remote_work_id__in=work_ids
-            )
-            qs = qs.extra(
-                select={
-                    "query_id": "music_publisher_workacknowledgement.remote_work_id"
-                }
+            qs = qs.annotate(
+                query_id=F("work__workacknowledgement__remote_work_id")
             )
-        qs = qs.distinct()
+        qs = qs.order_by().distinct()
         return qs
 
     def generate_works_dict(self, qs):
@@ -270,8 +280,12 @@ class RoyaltyCalculation(object):
         Returns:
             dict (writer) of dicts
         """
-        qs = Writer.objects.filter(id__in=self.writer_ids)
-        for writer in qs:
+        writer_ids = sorted(self.writer_ids)
+        qs = (
+            Writer.objects.filter(id__in=writer_ids[i : i + BATCH_SIZE])
+            for i in range(0, len(writer_ids), BATCH_SIZE)
+        )
+        for writer in chain.from_iterable(qs):
             if writer.first_name:
                 name = "{}, {} [{}]".format(
                     writer.last_name, writer.first_name, writer.ipi_name or ""
@@ -298,10 +312,17 @@ class RoyaltyCalculation(object):
         # the first pass of processing
         work_ids = self.get_work_ids()
 
-        # the first query
-        qs = self.get_work_queryset(work_ids)
-
-        self.generate_works_dict(qs)
+        # unknown identifiers are dropped without queries
+        kind = self.work_id_source
+        if kind == settings.PUBLISHER_CODE:
+            kind = "WORK_ID"
+        work_ids = get_work_index().lookup(kind, work_ids)
+
+        # the first query, in batches, so there are no huge IN lists
+        work_ids = sorted(work_ids)
+        for i in range(0, len(work_ids), BATCH_SIZE):
+            qs = self.get_work_queryset(work_ids[i : i + BATCH_SIZE])
+            self.generate_works_dict(qs)
 
         # this includes the second query
         self.generate_writer_dict()
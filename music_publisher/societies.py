@@ -1,22 +1,105 @@
-"""Create society tuple and dict.
+"""Society registry, read from ``societies.csv``.
+
+The file is parsed only once, when the registry is first used, and the
+registry is immutable afterwards. Lookups by code are dictionary lookups,
+including the short names used in JSON (and therefore CWR) output.
 
     Attributes:
-        SOCIETIES (tuple): (tis-n, Name (Country))
-        SOCIETY_DICT (dict): {tis-n, Name (Country)}
+        Society (namedtuple): code, name, country, display and short name
+        NO_SOCIETY (tuple): choice for writers without a PR society
+        SOCIETIES (tuple): (tis-n, Name (Country)), ordered by display name
+        SOCIETY_DICT (mappingproxy): {tis-n: Name (Country)}
 """
 
 import csv
 import os
-from collections import OrderedDict
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 path = os.path.join(dir_path, "societies.csv")
 
-with open(path, "r") as f:
-    reader = csv.reader(f)
-    SOCIETIES = sorted(
-        ((str(row[0]), "{} ({})".format(row[1], row[2])) for row in reader),
-        key=lambda row: row[1],
-    )
+Society = namedtuple(
+    "Society", ("code", "name", "country", "display", "short_name")
+)
+
+NO_SOCIETY = ("99", "NO SOCIETY")
+
+
+class SocietyRegistry(object):
+    """Immutable registry of societies.
+
+    Attributes:
+        choices (tuple): (tis-n, Name (Country)), ordered by display name
+        displays (mappingproxy): {tis-n: Name (Country)}
+        societies (mappingproxy): {tis-n: :class:`Society`}
+        short_names (mappingproxy): {tis-n: short name}, including
+            :data:`NO_SOCIETY`
+    """
+
+    __slots__ = ("choices", "displays", "societies", "short_names")
+
+    def __init__(self, societies):
+        societies = sorted(societies, key=lambda society: society.display)
+        self.choices = tuple((s.code, s.display) for s in societies)
+        self.displays = MappingProxyType(dict(self.choices))
+        self.societies = MappingProxyType({s.code: s for s in societies})
+        short_names = {s.code: s.short_name for s in societies}
+        short_names[NO_SOCIETY[0]] = NO_SOCIETY[1]
+        self.short_names = MappingProxyType(short_names)
+
+    def __contains__(self, code):
+        return code in self.societies
+
+    def __len__(self):
+        return len(self.societies)
 
-SOCIETY_DICT = OrderedDict(SOCIETIES)
+    def get(self, code):
+        """Return :class:`Society` for the code or ``None``."""
+        return self.societies.get(code)
+
+    def name(self, code, default=""):
+        """Return society name, without the country."""
+        society = self.societies.get(code)
+        return society.name if society else default
+
+    def country(self, code, default=""):
+        """Return society country."""
+        society = self.societies.get(code)
+        return society.country if society else default
+
+    def display(self, code, default=""):
+        """Return society name with the country, as used in choices."""
+        return self.displays.get(code, default)
+
+    def short_name(self, code, default=""):
+        """Return the part of the display name before the first comma."""
+        return self.short_names.get(code, default)
+
+
+def read_societies(filename=path):
+    """Yield :class:`Society` tuples from a CSV file."""
+    with open(filename, "r") as f:
+        for row in csv.reader(f):
+            display = "{} ({})".format(row[1], row[2])
+            yield Society(
+                str(row[0]), row[1], row[2], display, display.split(",")[0]
+            )
+
+
+@lru_cache(maxsize=None)
+def get_registry():
+    """Return the registry, reading the CSV file on first call."""
+    return SocietyRegistry(read_societies())
+
+
+def __getattr__(name):
+    """Build ``SOCIETIES`` and ``SOCIETY_DICT`` on first access."""
+    if name == "SOCIETIES":
+        return get_registry().choices
+    if name == "SOCIETY_DICT":
+        return get_registry().displays
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name)
+    )
@@ -0,0 +1,226 @@
+"""Generated catalogs for benchmarks and query plan audits.
+
+Objects are created with ``bulk_create``, without validation, so large
+catalogs can be generated quickly. Data is valid nevertheless: names,
+shares, roles and control follow the same rules as the forms, and IPI
+name numbers and ISWCs have correct check digits.
+
+Data is deterministic for the given arguments. Codes are unique across
+repeated runs only if ``start`` differs by at least the largest count.
+
+    Attributes:
+        SOCIETY_CODES (tuple): societies for writers and acknowledgements
+        ACK_STATUSES (tuple): acknowledgement statuses, in rotation
+        WRITER_COUNTS (tuple): (number of writers, weight) pairs, the
+            distribution of writers per work
+"""
+
+import random
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.db import transaction
+
+from .models import (
+    Label,
+    Library,
+    Recording,
+    Release,
+    Track,
+    Work,
+    WorkAcknowledgement,
+    WorkIndexChange,
+    WorkRegistrationStatus,
+    Writer,
+    WriterInWork,
+)
+
+SOCIETY_CODES = ("52", "10", "21", "35", "319")
+ACK_STATUSES = ("RA", "AS", "AC", "CO", "RJ")
+WRITER_COUNTS = ((1, 35), (2, 35), (3, 20), (4, 7), (5, 3))
+BATCH_SIZE = 1000
+
+
+def get_ipi_name(number):
+    """Return a valid IPI name number, with check digits."""
+    digits = "{:09d}".format(number)
+    total = sum(int(d) * (10 - i) for i, d in enumerate(digits)) % 101
+    if total:
+        total = (101 - total) % 100
+    return "{}{:02d}".format(digits, total)
+
+
+def get_iswc(number):
+    """Return a valid ISWC, with the check digit."""
+    digits = "{:09d}".format(number)
+    total = 1 + sum((i + 1) * int(d) for i, d in enumerate(digits))
+    return "T{}{}".format(digits, (10 - total % 10) % 10)
+
+
+def get_shares(count):
+    """Return manuscript shares for ``count`` writers, summing to 100."""
+    share = (Decimal(100) / count).quantize(Decimal("0.01"))
+    return [Decimal(100) - share * (count - 1)] + [share] * (count - 1)
+
+
+def generate_catalog(
+    works=1000,
+    writers=None,
+    recordings=None,
+    acks=None,
+    tracks_per_release=10,
+    start=1,
+    seed=0,
+):
+    """Generate a catalog with ``works`` works and related objects.
+
+    The number of writers per work follows :data:`WRITER_COUNTS`, and
+    some writers appear in many more works than others. The first writer
+    in each work is controlled, as well as every generally controlled one.
+    Every other work has an ISWC, and every tenth belongs to a library
+    release. Recordings are grouped in releases, acknowledgements rotate
+    through societies and statuses.
+
+    Args:
+        works (int): number of works
+        writers (int): number of writers, default is one per five works
+        recordings (int): number of recordings, default is one per work
+        acks (int): number of acknowledgements, default is three per two
+            works
+        tracks_per_release (int): number of tracks in each release
+        start (int): first number used in titles and codes
+        seed (int): seed for the random distribution of writers
+
+    Returns:
+        dict: {model name: number of created objects}
+    """
+    rng = random.Random(seed)
+    end = start + works
+    writer_count = writers or max(works // 5, 5)
+    recording_count = works if recordings is None else recordings
+    ack_count = works * 3 // 2 if acks is None else acks
+    with transaction.atomic():
+        label = Label.objects.create(name="LABEL {}".format(start))
+        library = Library.objects.create(name="LIBRARY {}".format(start))
+        writer_objects = Writer.objects.bulk_create(
+            (
+                Writer(
+                    first_name="FIRST",
+                    last_name="WRITER {}".format(i),
+                    ipi_name=get_ipi_name(i),
+                    pr_society=SOCIETY_CODES[i % len(SOCIETY_CODES)],
+                    generally_controlled=i % 10 == 0,
+                    saan="SAAN{}".format(i) if i % 10 == 0 else None,
+                    _can_be_controlled=True,
+                )
+                for i in range(start, start + writer_count)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        release_count = -(-recording_count // tracks_per_release) or 1
+        releases = Release.objects.bulk_create(
+            (
+                Release(
+                    release_title="RELEASE {}".format(i),
+                    cd_identifier="CD{}".format(i) if i % 2 else None,
+                    library=library if i % 2 else None,
+                    release_label=label,
+                )
+                for i in range(start, start + release_count)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        library_releases = [r for r in releases if r.library_id]
+        now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        work_objects = Work.objects.bulk_create(
+            (
+                Work(
+                    title="WORK {}".format(i),
+                    _work_id="SY{:08d}".format(i),
+                    iswc=get_iswc(i) if i % 2 else None,
+                    library_release=(
+                        library_releases[i % len(library_releases)]
+                        if i % 10 == 0 and library_releases
+                        else None
+                    ),
+                    last_change=now - timedelta(hours=i),
+                )
+                for i in range(start, end)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        counts, weights = zip(*WRITER_COUNTS)
+        wiws = []
+        for work in work_objects:
+            count = min(rng.choices(counts, weights)[0], writer_count)
+            # squared uniform distribution, a few writers write a lot
+            indexes = []
+            while len(indexes) < count:
+                index = int(rng.random() ** 2 * writer_count)
+                if index not in indexes:
+                    indexes.append(index)
+            for j, (index, share) in enumerate(
+                zip(indexes, get_shares(count))
+            ):
+                writer = writer_objects[index]
+                wiws.append(
+                    WriterInWork(
+                        work=work,
+                        writer=writer,
+                        controlled=j == 0 or writer.generally_controlled,
+                        relative_share=share,
+                        capacity="CA" if j == 0 else ("C ", "A ")[j % 2],
+                    )
+                )
+        WriterInWork.objects.bulk_create(wiws, batch_size=BATCH_SIZE)
+        Work.objects.update_writer_last_names(w.id for w in work_objects)
+        recording_objects = Recording.objects.bulk_create(
+            (
+                Recording(
+                    work=work_objects[i % works],
+                    isrc="SYA{:09d}".format(start + i),
+                    record_label=label,
+                    _recording_id="SY{:08d}R".format(start + i),
+                )
+                for i in range(recording_count)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        Track.objects.bulk_create(
+            (
+                Track(
+                    release=releases[i // tracks_per_release],
+                    recording=recording,
+                    cut_number=i % tracks_per_release + 1,
+                )
+                for i, recording in enumerate(recording_objects)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        ack_objects = WorkAcknowledgement.objects.bulk_create(
+            (
+                WorkAcknowledgement(
+                    work=work_objects[i % works],
+                    society_code=SOCIETY_CODES[
+                        (i + i // works) % len(SOCIETY_CODES)
+                    ],
+                    date=date(2024, 1, 1) + timedelta(days=i // works),
+                    status=ACK_STATUSES[(i + i // works) % len(ACK_STATUSES)],
+                    remote_work_id="R{:08d}".format(start + i % works),
+                )
+                for i in range(ack_count)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        WorkRegistrationStatus.objects.refresh(
+            sorted(set(ack.work_id for ack in ack_objects))
+        )
+        WorkIndexChange.objects.log(work.id for work in work_objects)
+    return {
+        "writers": len(writer_objects),
+        "releases": len(releases),
+        "works": len(work_objects),
+        "writers in works": len(wiws),
+        "recordings": len(recording_objects),
+        "acknowledgements": len(ack_objects),
+    }
@@ -17,14 +17,17 @@ More precise tests would be better.
 
 from datetime import datetime
 from decimal import Decimal
-from io import StringIO
+from io import BytesIO, StringIO
 import json
+import sqlite3
 
 from django.contrib.admin.models import LogEntry
 from django.contrib.admin.options import IS_POPUP_VAR
 from django.contrib.auth.models import User
 from django.core import exceptions
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.db import connection, transaction
 from django.template import Context
 from django.test import (
     override_settings,
@@ -32,12 +35,16 @@ from django.test import (
     TestCase,
     TransactionTestCase,
 )
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.messages import get_messages
 
 import music_publisher.models
 from music_publisher.admin import CWRExportAdmin
 from music_publisher import cwr_templates, data_import, validators
+from music_publisher import json_export
+from music_publisher.ack_import import ACKReconciliation
+from music_publisher.work_index import get_work_index
 from music_publisher.models import (
     AlternateTitle,
     Artist,
@@ -265,6 +272,167 @@ class DataImportTest(TestCase):
             ),
         )
 
+    def test_column_plan(self):
+        """Columns are compiled once, rows are unflattened with the plan."""
+        from music_publisher.benchmarks import (
+            get_wide_import_rows,
+            unflatten_benchmark,
+        )
+
+        fieldnames, rows = get_wide_import_rows(2)
+        di = data_import.DataImporter([], user=None)
+        row_dict = di.unflatten(rows[0])
+        # empty columns are not compiled
+        self.assertEqual(
+            set(fieldnames) - set(di.columns),
+            {"Work ID", "ISWC", "Original Title"},
+        )
+        self.assertEqual(di.unknown_keys, set())
+        self.assertEqual(len(row_dict["writers"]), 10)
+        self.assertEqual(row_dict["writers"]["1"]["share"], Decimal("10.00"))
+        self.assertEqual(row_dict["writers"]["1"]["role"], "CA")
+        self.assertEqual(row_dict["recordings"]["5"]["isrc"], "USX9P1234567")
+        self.assertEqual(row_dict["references"]["3"]["cmo"], "52")
+        self.assertEqual(len(row_dict["alt_titles"]), 4)
+        columns = di.columns
+        self.assertEqual(di.unflatten(rows[1]), row_dict)
+        self.assertIs(di.columns, columns)
+
+        # unknown columns only if they have values
+        di.unflatten({"Writer 1 Height": "", "Writer 2 Height": "2"})
+        self.assertEqual(di.unknown_keys, {"Writer 2 Height"})
+
+        results = unflatten_benchmark(rows=10)
+        self.assertEqual(results["columns"], 150)
+
+    def test_entity_cache(self):
+        """Writers, artists and libraries are loaded once per import."""
+        from music_publisher.benchmarks import get_data_import_file
+        from music_publisher.synthetic import get_ipi_name
+
+        writers = [
+            Writer.objects.create(
+                last_name="Writer {}".format(i),
+                first_name="First",
+                ipi_name=get_ipi_name(i),
+                pr_society="52",
+                _can_be_controlled=True,
+            )
+            for i in (1, 2)
+        ]
+        f = get_data_import_file(writers, 20)
+        di = data_import.DataImporter(f, user=None)
+        with CaptureQueriesContext(connection) as ctx:
+            works = list(di.run())
+        self.assertEqual(len(works), 20)
+        # lookups, not validation of foreign keys
+        writer_selects = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if q["sql"].startswith('SELECT "music_publisher_writer"')
+        ]
+        self.assertEqual(len(writer_selects), 1)
+        self.assertEqual(Writer.objects.count(), 2)
+
+        # created objects are added to the cache, names are case-insensitive
+        writer = (
+            "{0.last_name},{0.first_name},{0.ipi_name},52,CA,100%,Y".format(
+                writers[0]
+            )
+        )
+        f = StringIO(
+            "Work Title,Library,CD Identifier,Artist 1 Last,Writer 1 Last,"
+            "Writer 1 First,Writer 1 IPI,Writer 1 PRO,Writer 1 Role,"
+            "Writer 1 Share,Writer 1 Controlled\n"
+            "A,Library,CD1,New Artist,{0}\n"
+            "B,LIBRARY,cd1,new artist,{0}\n".format(writer)
+        )
+        di = data_import.DataImporter(f, user=None)
+        with CaptureQueriesContext(connection) as ctx:
+            works = list(di.run())
+        self.assertEqual(works[0].library_release, works[1].library_release)
+        self.assertEqual(
+            Artist.objects.filter(last_name__iexact="NEW ARTIST").count(), 1
+        )
+        sqls = [q["sql"] for q in ctx.captured_queries]
+        for table in ("artist", "library", "release"):
+            selects = [
+                sql
+                for sql in sqls
+                if sql.startswith('SELECT "music_publisher_{}"'.format(table))
+            ]
+            self.assertEqual(len(selects), 1, table)
+
+    def test_validate_only(self):
+        """Validation reports errors in all rows and saves nothing."""
+        from unittest import mock
+
+        with open(TEST_DATA_IMPORT_FILENAME) as csvfile:
+            di = data_import.DataImporter(csvfile)
+            with CaptureQueriesContext(connection) as ctx:
+                errors = di.validate()
+        self.assertEqual(errors, [])
+        self.assertTrue(
+            all(q["sql"].startswith("SELECT") for q in ctx.captured_queries)
+        )
+        self.assertEqual(Work.objects.count(), 0)
+        self.assertEqual(Writer.objects.count(), 0)
+
+        from music_publisher.synthetic import get_ipi_name
+
+        content = (
+            "Work ID,Work Title,Writer 1 Last,Writer 1 First,Writer 1 IPI,"
+            "Writer 1 PRO,Writer 1 Role,Writer 1 Share,Writer 1 Controlled,"
+            "Recording 1 ISRC\n"
+            "X1,ONE,WRITER,FIRST,{0},52,CA,100%,Y,\n"
+            "X2,TWO,WRITER,FIRST,{0},52,XX,100%,Y,\n"
+            "X1,THREE,WRITER,FIRST,{0},52,CA,100%,Y,\n"
+            "X4,FOUR,WRITER,FIRST,{0},52,CA,50%,Y,\n"
+            ",,,,,,,,,\n"
+            "X6,SIX,WRITER,FIRST,{0},52,CA,100%,Y,USX9P0000001\n"
+        ).format(get_ipi_name(1))
+        errors = data_import.DataImporter(StringIO(content)).validate()
+        self.assertEqual([line for line, error in errors], [3, 4, 5])
+        self.assertIn("XX", errors[0][1])
+        self.assertIn('Work ID "X1" is also in line 2.', errors[1][1])
+
+        # same results in worker processes
+        with override_settings(OPTION_IMPORT_PROCESSES=2):
+            with mock.patch.object(
+                data_import.DataImporter, "parallel_min_rows", 1
+            ):
+                di = data_import.DataImporter(StringIO(content))
+                self.assertEqual(di.validate(), errors)
+
+        # codes are checked against the database
+        first_row = "".join(content.splitlines(True)[:2])
+        list(data_import.DataImporter(StringIO(first_row)).run())
+        self.assertEqual(Work.objects.count(), 1)
+        errors = data_import.DataImporter(StringIO(content)).validate()
+        self.assertIn(
+            (2, 'Work ID "X1" clashes with an existing work.'), errors
+        )
+
+        # admin
+        self.client.force_login(self.superuser)
+        url = reverse("admin:music_publisher_dataimport_add")
+        mockfile = InMemoryUploadedFile(
+            BytesIO(content.encode()),
+            "data_file",
+            "dataimport.csv",
+            "text/csv",
+            len(content),
+            None,
+        )
+        with override_settings(SECURE_SSL_REDIRECT=False):
+            response = self.client.post(
+                url, {"data_file": mockfile, "validate_only": True}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Validation only, nothing was imported.")
+        self.assertContains(response, "Line 3: ")
+        self.assertEqual(music_publisher.models.DataImport.objects.count(), 0)
+
 
 @override_settings(
     SECURE_SSL_REDIRECT=False,
@@ -621,6 +789,9 @@ class AdminTest(TestCase):
             url = reverse("royalty_calculation")
             response = self.client.get(url, follow=False)
             self.assertEqual(response.status_code, 302)
+            url = reverse("registration_status")
+            response = self.client.get(url, follow=False)
+            self.assertEqual(response.status_code, 302)
 
     def test_super_user(self):
         """Testing index for superuser covers all the cases."""
@@ -765,25 +936,309 @@ class AdminTest(TestCase):
         )
         self.assertEqual(response.status_code, 200)
 
-    def test_cwr_nwr(self):
-        """Test that CWR export works."""
+    def test_release_json_streaming(self):
+        """Streamed release export is same as the JSON response was, and
+        the number of queries does not depend on the number of releases."""
+        for recording in Recording.objects.all():
+            release = Release.objects.create(
+                release_title="ANOTHER", release_label=self.label
+            )
+            Track.objects.create(release=release, recording=recording)
+        qs = CommercialRelease.objects.order_by(
+            "release_title", "cd_identifier", "-id"
+        )
+        expected = json_export.get_encoder().dumps(
+            {"releases": [r.get_dict(with_tracks=True) for r in qs]}
+        )
         self.client.force_login(self.staffuser)
         response = self.client.post(
-            reverse("admin:music_publisher_cwrexport_add"),
+            reverse("admin:music_publisher_commercialrelease_changelist"),
             data={
-                "nwr_rev": "NWR",
-                "works": [
-                    self.original_work.id,
-                    self.modified_work.id,
-                    self.copublished_work.id,
-                ],
+                "action": "create_json",
+                "select_across": 1,
+                "index": 0,
+                "_selected_action": self.commercial_release.id,
             },
         )
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content)
+        self.assertEqual(content, expected)
+        with CaptureQueriesContext(connection) as before:
+            list(CommercialRelease.objects.get_dict_items(qs))
+        for recording in Recording.objects.all():
+            release = Release.objects.create(release_title="MORE")
+            Track.objects.create(release=release, recording=recording)
+        with CaptureQueriesContext(connection) as after:
+            list(CommercialRelease.objects.get_dict_items(qs.all()))
+        self.assertEqual(len(before), len(after))
+
+    @override_settings(OPTION_INSTRUMENTATION="memory")
+    def test_instrumentation(self):
+        """Requests and admin actions are profiled, streaming responses
+        when the content is consumed."""
+        from urllib.parse import urlencode
+
+        from django.test import Client
+
+        from music_publisher import instrumentation
+
+        instrumentation.PROFILES.clear()
+        client = Client()
+        client.force_login(self.staffuser)
+        url = reverse("admin:music_publisher_work_changelist")
+        with self.assertLogs("music_publisher.instrumentation") as logs:
+            client.get(url)
+            # admin actions are posted form-encoded, not as multipart
+            response = client.post(
+                url,
+                data=urlencode(
+                    {
+                        "action": "create_json",
+                        "select_across": 1,
+                        "index": 0,
+                        "_selected_action": self.original_work.id,
+                    }
+                ),
+                content_type="application/x-www-form-urlencoded",
+            )
+            self.assertEqual(len(instrumentation.PROFILES), 1)
+            # queries are not recorded while the content is streamed
+            self.assertFalse(
+                any(
+                    isinstance(wrapper, instrumentation.Profile)
+                    for wrapper in connection.execute_wrappers
+                )
+            )
+            b"".join(response.streaming_content)
+        self.assertEqual(len(instrumentation.PROFILES), 2)
+        profile = instrumentation.PROFILES[-1]
+        self.assertEqual(
+            profile.label,
+            "POST admin:music_publisher_work_changelist create_json",
+        )
+        self.assertGreater(profile.queries, 0)
+        self.assertGreater(profile.peak_memory, 0)
+        line = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(line["label"], profile.label)
+        self.assertEqual(line["queries"], profile.queries)
+        titles = Work.objects.values_list("title", flat=True)
+        with instrumentation.instrument("block", memory=False) as profile:
+            list(titles.filter(id=self.original_work.id))
+            list(titles.filter(id=self.original_work.id))
+            list(titles.filter(id=self.modified_work.id))
+        self.assertEqual(profile.queries, 3)
+        self.assertEqual(profile.duplicates, 1)
+        self.assertEqual(profile.similar, 2)
+        self.assertEqual(len(profile.top_queries), 1)
+        self.assertIsNone(profile.peak_memory)
+        response = client.get(reverse("instrumentation"))
+        self.assertContains(response, "create_json")
+        self.assertContains(response, "block")
+        response = Client().get(reverse("instrumentation"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_json_encoders(self):
+        """All encoders give same values, streamed output is same as the
+        document encoded at once, compact and indented."""
+        works = Work.objects.get_dict(Work.objects.all())["works"]
+        releases = Release.objects.get_dict(Release.objects.all())["releases"]
+        for data in (
+            {},
+            {"works": [], "releases": []},
+            {"works": works, "releases": releases},
+        ):
+            decoded = json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+            for encoder in json_export.ENCODERS.values():
+                for compact in (True, False):
+                    expected = encoder.dumps(data, compact=compact)
+                    self.assertEqual(json.loads(expected), decoded)
+                    streamed = json_export.iter_json(
+                        data.items(), compact, encoder, buffer_size=1000
+                    )
+                    self.assertEqual(b"".join(streamed), expected)
+            # same indentation with all encoders
+            indented = set(
+                encoder.dumps(data)
+                for encoder in json_export.ENCODERS.values()
+            )
+            self.assertEqual(len(indented), 1)
+        with self.settings(OPTION_JSON_ENCODER="json"):
+            self.assertEqual(json_export.get_encoder().name, "json")
+        with self.settings(OPTION_JSON_ENCODER="simplejson"):
+            with self.assertRaises(exceptions.ImproperlyConfigured):
+                json_export.get_encoder()
+
+    def test_cwr_nwr(self):
+        """Test that CWR export works."""
+        self.client.force_login(self.staffuser)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("admin:music_publisher_cwrexport_add"),
+                data={
+                    "nwr_rev": "NWR",
+                    "works": [
+                        self.original_work.id,
+                        self.modified_work.id,
+                        self.copublished_work.id,
+                    ],
+                },
+            )
         self.assertEqual(response.status_code, 302)
         cwr = CWRExport.objects.first().cwr
         self.assertIn("NWR0000000000000000THE MODIFIED WORK", cwr)
         self.assertIn("THE MODIFIED WORK BEHIND THE MODIFIED WORK", cwr)
 
+    def test_cwr_checkpoints(self):
+        """Interrupted CWR generation is resumed from the last checkpoint,
+        with the same number, and the result is the same."""
+        from unittest import mock
+
+        from music_publisher.cwr_loader import get_cwr_dict_items
+
+        qs = Work.objects.order_by("id")
+        expected = "".join(
+            CWRExport(nwr_rev="NWR").yield_lines(list(get_cwr_dict_items(qs)))
+        )
+        cwr_export = CWRExport.objects.create(nwr_rev="NWR")
+        cwr_export.works.set(qs)
+        cwr_export.checkpoint_size = 2
+        yield_works_lines = cwr_export.yield_works_lines
+        calls = []
+
+        def interrupted(works, processes=0):
+            calls.append(works)
+            if len(calls) == 2:
+                raise MemoryError()
+            return yield_works_lines(works, processes)
+
+        with mock.patch.object(cwr_export, "yield_works_lines", interrupted):
+            with self.assertRaises(MemoryError):
+                cwr_export.create_cwr()
+        cwr_export = CWRExport.objects.get(id=cwr_export.id)
+        self.assertEqual(cwr_export.cwr, "")
+        self.assertEqual(cwr_export.chunks.count(), 1)
+        num_in_year = cwr_export.num_in_year
+        self.assertGreater(num_in_year, 0)
+        progress = cwr_export.get_progress()
+        self.assertEqual(progress["done"], 2)
+        self.assertEqual(progress["total"], qs.count())
+        self.client.force_login(self.staffuser)
+        url = reverse(
+            "admin:music_publisher_cwrexport_change", args=(cwr_export.id,)
+        )
+        response = self.client.get(url)
+        self.assertContains(response, "2 of {} works".format(qs.count()))
+        self.assertContains(response, 'name="resume"')
+        # only with POST, with CSRF protection
+        response = self.client.get(url + "?resume=true")
+        self.assertTrue(cwr_export.chunks.exists())
+        response = self.client.post(url, {"resume": "Resume"})
+        self.assertRedirects(response, url)
+        cwr_export = CWRExport.objects.get(id=cwr_export.id)
+        self.assertEqual(cwr_export.num_in_year, num_in_year)
+        self.assertFalse(cwr_export.chunks.exists())
+        # HDR contains the creation time
+        self.assertEqual(
+            cwr_export.cwr.split("\n", 1)[1], expected.split("\n", 1)[1]
+        )
+
+    def test_cwr_parallel(self):
+        """Test that CWR generated in worker processes is identical."""
+        qs = Work.objects.order_by("id")
+        for nwr_rev in ["NWR", "RE2", "WRK", "ISR", "WR1"]:
+            cwr_export = CWRExport(nwr_rev=nwr_rev)
+            works = Work.objects.get_dict(qs)["works"]
+            serial = list(cwr_export.yield_lines(works))
+            with override_settings(
+                OPTION_CWR_PROCESSES=2, OPTION_CWR_PARALLEL_MIN_WORKS=1
+            ):
+                works = Work.objects.get_dict(qs)["works"]
+                parallel = list(cwr_export.yield_lines(works))
+            self.assertGreater(len(serial), 4)
+            # HDR contains the creation time
+            self.assertEqual("".join(serial[1:]), "".join(parallel[1:]))
+
+        # one process pool for all checkpoints
+        from concurrent.futures import ProcessPoolExecutor
+        from unittest import mock
+
+        def create_cwr(processes):
+            cwr_export = CWRExport.objects.create(nwr_rev="NWR")
+            cwr_export.works.set(qs)
+            cwr_export.checkpoint_size = 2
+            with override_settings(
+                OPTION_CWR_PROCESSES=processes,
+                OPTION_CWR_PARALLEL_MIN_WORKS=1,
+                OPTION_CWR_CACHE=0,
+            ):
+                cwr_export.create_cwr()
+            self.assertIsNone(cwr_export.executor)
+            return cwr_export.cwr.split("\n", 1)[1]
+
+        with mock.patch(
+            "concurrent.futures.ProcessPoolExecutor",
+            side_effect=ProcessPoolExecutor,
+        ) as pool:
+            self.assertEqual(create_cwr(2), create_cwr(0))
+        self.assertEqual(pool.call_count, 1)
+
+    def test_cwr_transaction_cache(self):
+        """Transactions reused in later exports give the same CWR, and are
+        rendered again when works change."""
+        from music_publisher.models import CWRTransaction
+
+        qs = Work.objects.order_by("id")
+
+        def create_cwr(nwr_rev, cache):
+            cwr_export = CWRExport.objects.create(nwr_rev=nwr_rev)
+            cwr_export.works.set(qs)
+            with override_settings(OPTION_CWR_CACHE=cache):
+                cwr_export.create_cwr()
+            # HDR contains the creation time
+            return cwr_export.cwr.split("\n", 1)[1]
+
+        nwr_revs = ["NWR", "REV", "NW2", "RE2", "WRK", "ISR", "WR1", "IS1"]
+        for nwr_rev in nwr_revs:
+            expected = create_cwr(nwr_rev, 0)
+            self.assertEqual(create_cwr(nwr_rev, 1), expected)
+            self.assertEqual(create_cwr(nwr_rev, 1), expected)
+        # NWR and REV share transactions
+        self.assertEqual(
+            set(CWRTransaction.objects.values_list("key", flat=True)),
+            {"21", "22", "30WRK", "30ISR", "31WR1", "31IS1"},
+        )
+        self.assertEqual(CWRTransaction.objects.count(), qs.count() * 6)
+
+        work = qs.first()
+        old = CWRTransaction.objects.get(work=work, key="21")
+        work.title = "THE CHANGED WORK"
+        work.save()
+        cwr = create_cwr("NWR", 1)
+        self.assertEqual(cwr, create_cwr("NWR", 0))
+        self.assertIn("THE CHANGED WORK", cwr)
+        new = CWRTransaction.objects.get(work=work, key="21")
+        self.assertNotEqual(new.fingerprint, old.fingerprint)
+
+    def test_cwr_loader(self):
+        """Test that projections give same dicts and CWR as models."""
+        from music_publisher.cwr_loader import get_cwr_dict_items
+
+        qs = Work.objects.order_by("id")
+        works = Work.objects.get_dict(qs)["works"]
+        for work in works:
+            for recording in work["recordings"]:
+                del recording["tracks"]
+        projected = list(get_cwr_dict_items(qs, chunk_size=2))
+        self.assertEqual(works, projected)
+        for nwr_rev in ["NWR", "NW2", "WRK", "ISR", "WR1"]:
+            cwr_export = CWRExport(nwr_rev=nwr_rev)
+            works = Work.objects.get_dict(qs)["works"]
+            expected = "".join(cwr_export.yield_lines(works))
+            projected = list(get_cwr_dict_items(qs))
+            cwr = "".join(cwr_export.yield_lines(projected))
+            # HDR contains the creation time
+            self.assertEqual(expected.split("\n", 1)[1], cwr.split("\n", 1)[1])
+
     def test_csv(self):
         """Test that CSV export works."""
         self.client.force_login(self.staffuser)
@@ -1135,6 +1590,63 @@ class AdminTest(TestCase):
             response.content,
         )
 
+    def test_ack_reconciliation(self):
+        """Number of queries does not depend on the number of records."""
+        Work.persist_work_ids(Work.objects.all())
+        ack_import = music_publisher.models.ACKImport.objects.create(
+            filename="CW180001052_FOO.V21",
+            society_code="52",
+            society_name="PRS",
+            date=datetime.now(),
+        )
+        acks = [
+            (work.work_id, "R{}".format(work.id), datetime.now().date(), "AS")
+            for work in Work.objects.all()
+        ]
+        acks = [ack + ("T9270264761",) for ack in acks]
+        # the index of work identifiers is built once per process
+        get_work_index()
+
+        def run(acks):
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as queries:
+                    reconciliation = ACKReconciliation(
+                        ack_import, self.staffuser.id, True
+                    )
+                    reconciliation.run(acks, [("UNKNOWN", "T9270264761")])
+                transaction.set_rollback(True)
+            return len(queries), reconciliation
+
+        count, reconciliation = run(acks)
+        self.assertEqual(reconciliation.unknown_work_ids, ["UNKNOWN"])
+        self.assertEqual(len(reconciliation.new_acks), len(acks))
+        self.assertEqual(len(reconciliation.changed_works), 1)
+        self.assertEqual(len(reconciliation.errors), len(acks) - 1)
+        self.assertEqual(run(acks * 3)[0], count)
+        self.assertEqual(
+            len(run(acks * 3)[1].existing_work_ids), len(acks) * 2
+        )
+
+    def test_ack_file_deletion(self):
+        """Stored ACK files are deleted with their last import."""
+        from music_publisher.models import ACKFile, ACKImport
+
+        ack_file, created = ACKFile.objects.store(ACK_CONTENT_21)
+        ack_imports = [
+            ACKImport.objects.create(
+                filename="CW180001000_FOO.V21",
+                society_code="052",
+                date=datetime.now().date(),
+                report="",
+                ack_file=ack_file,
+            )
+            for i in range(2)
+        ]
+        ack_imports[0].delete()
+        self.assertTrue(ACKFile.objects.filter(id=ack_file.id).exists())
+        ACKImport.objects.filter(ack_file=ack_file).delete()
+        self.assertFalse(ACKFile.objects.filter(id=ack_file.id).exists())
+
     def test_ack_import_and_work_filters(self):
         """Test acknowledgement import and then filters on the change view,
         as well as other related views.
@@ -1211,6 +1723,20 @@ class AdminTest(TestCase):
                 "One ISWC can not be used for two works: T3221234234 ",
                 music_publisher.models.ACKImport.objects.first().report,
             )
+            # the same file is stored once, and recognized
+            self.assertIn(
+                "This file was already imported: CW180001000_FOO.V21",
+                str(list(get_messages(response.wsgi_request))[0]),
+            )
+            ack_imports = music_publisher.models.ACKImport.objects.all()
+            self.assertEqual(len(ack_imports), 2)
+            self.assertEqual(
+                ack_imports[0].ack_file_id, ack_imports[1].ack_file_id
+            )
+            self.assertEqual(
+                ack_imports[0].cwr.replace("\r", ""),
+                ACK_CONTENT_21.replace("\r", ""),
+            )
 
         """This file has also ISWC codes."""
         with StringIO() as mock:
@@ -1346,6 +1872,20 @@ class AdminTest(TestCase):
             response = self.client.get(url, follow=False)
             self.assertEqual(response.status_code, 200)
 
+            """Test latest statuses and the registration status view."""
+            statuses = music_publisher.models.WorkRegistrationStatus.objects
+            self.assertTrue(statuses.exists())
+            for status in statuses.all():
+                latest = music_publisher.models.WorkAcknowledgement.objects
+                latest = latest.filter(
+                    work_id=status.work_id, society_code=status.society_code
+                ).order_by("-date", "-id")
+                self.assertEqual(latest.first().status, status.status)
+            url = reverse("registration_status")
+            response = self.client.get(url, follow=False)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(b"&amp;ack_status=", response.content)
+
         """Test dummy CWR ACK 3.0"""
         self.client.force_login(self.staffuser)
         with StringIO() as mock:
@@ -1699,6 +2239,22 @@ class AdminTest(TestCase):
         url = base_url + "?q=01"
         response = self.client.get(url, follow=False)
         self.assertEqual(response.status_code, 200)
+        # formatted ISWCs from the database if the index of work
+        # identifiers is not built, it is not built during requests
+        from unittest import mock
+
+        from music_publisher.work_index import WorkIndex
+
+        index = WorkIndex()
+        with mock.patch("music_publisher.admin.INDEX", index):
+            response = self.client.get(base_url, {"q": "T-123.456.789-3"})
+            self.assertEqual(response.context["cl"].result_count, 1)
+        self.assertFalse(index.built)
+        # formatted ISWCs and ISRCs from the index
+        get_work_index()
+        for code in ("T-123.456.789-3", "uss1z9900002"):
+            response = self.client.get(base_url, {"q": code})
+            self.assertEqual(response.context["cl"].result_count, 1)
 
     def test_simple_save(self):
         """Test saving changed Work form."""
@@ -1840,6 +2396,16 @@ class CWRTemplatesTest(SimpleTestCase):
             }
             self.assertIsInstance(template.render(Context(d)).upper(), str)
 
+    def test_lazy_templates(self):
+        """Templates are compiled on first render and only once."""
+        template = cwr_templates.LazyTemplate("{{ x }}")
+        self.assertIsNone(template._template)
+        self.assertEqual(template.render(Context({"x": "A"})), "A")
+        compiled = template._template
+        self.assertIsNotNone(compiled)
+        self.assertEqual(template.render(Context({"x": "B"})), "B")
+        self.assertIs(template._template, compiled)
+
 
 class ValidatorsTest(TestCase):
     """Test all validators.
@@ -2025,6 +2591,556 @@ class ModelsSimpleTest(TransactionTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIsInstance(Playlist.objects.get_dict([release]), dict)
 
+    def test_query_paths(self):
+        from music_publisher.benchmarks import audit_query_paths
+        from music_publisher.synthetic import generate_catalog
+
+        generate_catalog(50)
+        results = list(audit_query_paths(number=1))
+        self.assertEqual(len(results), 12)
+        for name, plan, scans, duration in results:
+            self.assertTrue(plan, name)
+            self.assertEqual(scans, [], name)
+            self.assertGreaterEqual(duration, 0)
+
+    def test_cwr_numbering(self):
+        """Concurrent exports get different, consecutive numbers.
+
+        In-memory SQLite has no concurrency, so the database is copied to
+        a file and numbers are allocated in worker processes."""
+        import os
+        import subprocess
+        import sys
+        import tempfile
+        import time
+        from urllib.parse import urlsplit
+
+        from django.utils.timezone import now
+
+        from music_publisher.models import CWRExportSequence
+
+        year = now().strftime("%y")
+        CWRExport.objects.create(year=year, num_in_year=5)
+        exports = [CWRExport.objects.create() for i in range(20)]
+        ids = [export.id for export in exports]
+        code = (
+            "import time, django; django.setup(); "
+            "from music_publisher.models import CWRExport; "
+            "time.sleep(max(0, {start} - time.time())); "
+            "[e.allocate_number() for e in CWRExport.objects.filter("
+            "id__in={ids})]"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ)
+            env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+            env.setdefault("DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE)
+            if connection.vendor == "sqlite":
+                path = os.path.join(tmp, "db.sqlite3")
+                target = sqlite3.connect(path)
+                connection.connection.backup(target)
+                target.close()
+                env["DATABASE_URL"] = "sqlite:///" + path
+            else:  # pragma: no cover
+                # the test database, not the one in DATABASE_URL
+                url = urlsplit(env["DATABASE_URL"])
+                url = url._replace(path="/" + connection.settings_dict["NAME"])
+                env["DATABASE_URL"] = url.geturl()
+            start = time.time() + 3
+            processes = [
+                subprocess.Popen(
+                    [
+                        sys.executable,
+                        "-c",
+                        code.format(start=start, ids=ids[i::4]),
+                    ],
+                    env=env,
+                    stderr=subprocess.PIPE,
+                )
+                for i in range(4)
+            ]
+            for process in processes:
+                self.assertEqual(process.wait(), 0, process.stderr.read())
+                process.stderr.close()
+            if connection.vendor == "sqlite":
+                target = sqlite3.connect(path)
+                numbers = target.execute(
+                    "SELECT num_in_year FROM music_publisher_cwrexport "
+                    "WHERE id IN ({})".format(",".join(map(str, ids)))
+                ).fetchall()
+                last_number = target.execute(
+                    "SELECT last_number FROM "
+                    "music_publisher_cwrexportsequence"
+                ).fetchone()[0]
+                target.close()
+            else:  # pragma: no cover
+                numbers = CWRExport.objects.filter(id__in=ids)
+                numbers = numbers.values_list("num_in_year")
+                last_number = CWRExportSequence.objects.get(
+                    year=year
+                ).last_number
+        self.assertEqual(sorted(n[0] for n in numbers), list(range(6, 26)))
+        self.assertEqual(last_number, 25)
+
+    def test_royalty_batches(self):
+        """Works are matched in batches, also for large statements."""
+        from types import SimpleNamespace
+        from unittest import mock
+
+        from music_publisher import royalty_calculation
+        from music_publisher.benchmarks import get_statement_file
+        from music_publisher.models import WorkAcknowledgement
+        from music_publisher.synthetic import generate_catalog
+
+        generate_catalog(works=20)
+        acks = WorkAcknowledgement.objects.filter(society_code="10")
+        remote_ids = list(acks.values_list("remote_work_id", flat=True))
+        # more IDs than the default SQLite limit of query parameters
+        unknown_ids = ["X{}".format(i) for i in range(40000)]
+
+        def get_works(ids):
+            form = SimpleNamespace(
+                file=get_statement_file(ids),
+                cleaned_data={
+                    "work_id_column": "0",
+                    "work_id_source": "10",
+                    "right_type_column": "1",
+                    "amount_column": "2",
+                },
+            )
+            calculation = royalty_calculation.RoyaltyCalculation(form)
+            calculation.get_works_and_writers()
+            return calculation.works, calculation.writers
+
+        works, writers = get_works(remote_ids + unknown_ids)
+        self.assertEqual(set(works), set(remote_ids))
+        with mock.patch.object(royalty_calculation, "BATCH_SIZE", 2):
+            self.assertEqual(get_works(remote_ids), (works, writers))
+        wiws = WriterInWork.objects.filter(
+            controlled=True, work__workacknowledgement__in=acks
+        )
+        self.assertEqual(sum(map(len, works.values())), wiws.count())
+
+    def test_change_propagation(self):
+        """Changes of related objects update last change of their works."""
+        from datetime import timedelta
+
+        from django.utils.timezone import now
+
+        from music_publisher.models import Label, LibraryRelease, Recording
+        from music_publisher.synthetic import generate_catalog
+
+        generate_catalog(works=20)
+        old = Work.objects.order_by("last_change").first().last_change
+
+        def get_changed():
+            qs = Work.objects.filter(last_change__gt=now() - timedelta(1))
+            ids = set(qs.values_list("id", flat=True))
+            Work.objects.update(last_change=old)
+            return ids
+
+        get_changed()
+        writer = Writer.objects.filter(writerinwork__isnull=False).first()
+        work_ids = set(writer.works.values_list("id", flat=True))
+        writer.save()  # names change case
+        self.assertEqual(get_changed(), work_ids)
+        writer.save()
+        self.assertEqual(get_changed(), set())
+        writer.first_name = "OTHER"
+        with CaptureQueriesContext(connection) as ctx:
+            writer.save()
+        self.assertEqual(get_changed(), work_ids)
+        # by primary key, update, collect work IDs, update works
+        self.assertEqual(len(ctx.captured_queries), 4)
+
+        # proxy models, more than one source
+        release = LibraryRelease.objects.filter(works__isnull=False).first()
+        release.release_title = "OTHER"
+        release.save()
+        work_ids = set(release.works.values_list("id", flat=True))
+        work_ids |= set(
+            Recording.objects.filter(tracks__release=release).values_list(
+                "work_id", flat=True
+            )
+        )
+        self.assertEqual(get_changed(), work_ids)
+        label = Label.objects.first()
+        label.name = "OTHER"
+        label.save()
+        self.assertEqual(len(get_changed()), 20)
+
+        # both works of a moved recording
+        recording = Recording.objects.first()
+        previous_id = recording.work_id
+        recording.work = Work.objects.exclude(id=previous_id).first()
+        recording.save()
+        self.assertEqual(get_changed(), {previous_id, recording.work_id})
+
+        # works are collected before related objects are deleted
+        recording.tracks.get().delete()
+        self.assertEqual(get_changed(), {recording.work_id})
+
+        # receivers only for source models, others can be fast-deleted
+        from django.apps import apps
+        from django.db.models.signals import pre_delete
+
+        from music_publisher.changes import SOURCES, get_label
+        from music_publisher.models import SOURCE_MODELS
+
+        config = apps.get_app_config("music_publisher")
+        self.assertEqual(
+            set(SOURCE_MODELS),
+            {m for m in config.get_models() if get_label(m) in SOURCES},
+        )
+        self.assertFalse(pre_delete.has_listeners(LogEntry))
+
+    def test_work_index(self):
+        """Index of work identifiers is updated incrementally."""
+        from unittest import mock
+
+        from music_publisher.models import (
+            Recording,
+            WorkAcknowledgement,
+            WorkIndexChange,
+            WorkIndexChangeManager,
+        )
+        from music_publisher.synthetic import generate_catalog
+        from music_publisher.work_index import WorkIndex
+
+        generate_catalog(works=20)
+        index = WorkIndex()
+        index.refresh()
+        work = Work.objects.exclude(iswc=None).first()
+        recording = Recording.objects.first()
+        self.assertEqual(index.get("WORK_ID", work._work_id), (work.id,))
+        self.assertEqual(index.get("ISWC", work.iswc.lower()), (work.id,))
+        self.assertEqual(
+            index.get("ISRC", recording.isrc), (recording.work_id,)
+        )
+        for ack in WorkAcknowledgement.objects.all():
+            self.assertIn(
+                ack.work_id, index.get(ack.society_code, ack.remote_work_id)
+            )
+        self.assertEqual(index.lookup("ISWC", ["UNKNOWN"]), {})
+        with self.assertNumQueries(1):
+            index.refresh()
+
+        # recent changes and three scans of changed works
+        iswc = work.iswc
+        work.iswc = None
+        work.save()
+        other = Work.objects.exclude(id=work.id).first()
+        WorkAcknowledgement.objects.create(
+            work=other,
+            society_code="52",
+            date=datetime.now().date(),
+            status="AS",
+            remote_work_id="DUP",
+        )
+        WorkAcknowledgement.objects.create(
+            work=work,
+            society_code="52",
+            date=datetime.now().date(),
+            status="AS",
+            remote_work_id="DUP",
+        )
+        with self.assertNumQueries(4):
+            index.refresh()
+        self.assertEqual(index.get("ISWC", iswc), ())
+        self.assertEqual(set(index.get("52", "DUP")), {other.id, work.id})
+        WorkAcknowledgement.objects.filter(remote_work_id="DUP").delete()
+        WorkIndexChange.objects.log([work.id, other.id])
+        index.refresh()
+        self.assertEqual(index.get("52", "DUP"), ())
+
+        # rebuilt if the log was trimmed in the meantime
+        with mock.patch.object(WorkIndexChangeManager, "keep", 1):
+            work.iswc = iswc
+            work.save()
+        self.assertEqual(WorkIndexChange.objects.count(), 1)
+        with self.assertNumQueries(5):
+            index.refresh()
+        self.assertEqual(index.get("ISWC", iswc), (work.id,))
+
+        # changes committed later than changes with higher IDs
+        Work.objects.filter(id=work.id).update(iswc=None)
+        WorkIndexChange.objects.log([work.id, other.id])
+        late = WorkIndexChange.objects.filter(work_id=work.id).last()
+        late_id = late.id
+        late.delete()  # not committed yet
+        index.refresh()
+        self.assertEqual(index.get("ISWC", iswc), (work.id,))
+        WorkIndexChange.objects.create(
+            id=late_id, work_id=work.id, time=late.time
+        )
+        index.refresh()
+        self.assertEqual(index.get("ISWC", iswc), ())
+
+        # only indexed models are logged, others can be fast-deleted
+        from django.db.models.signals import post_delete
+
+        self.assertFalse(post_delete.has_listeners(LogEntry))
+
+    def test_writer_last_names(self):
+        """Last names of writers are stored in works, changelists of
+        recordings need a constant number of queries."""
+        from django.core.management import call_command
+
+        from music_publisher.admin import get_change_url
+        from music_publisher.benchmarks import changelist_benchmark
+        from music_publisher.models import Recording, Writer, WriterInWork
+        from music_publisher.synthetic import generate_catalog
+
+        generate_catalog(works=10)
+        for work in Work.objects.all():
+            last_names = sorted(w.last_name for w in work.writers.all())
+            self.assertEqual(work.writer_last_names, " / ".join(last_names))
+        work = Work.objects.create(title="NAMES")
+        writer = Writer.objects.create(last_name="Zulu")
+        wiw = WriterInWork.objects.create(
+            work=work, writer=writer, relative_share=Decimal("50")
+        )
+        self.assertEqual(work.writer_last_names, "ZULU")
+        WriterInWork.objects.create(
+            work=work,
+            writer=Writer.objects.create(last_name="Alpha"),
+            relative_share=Decimal("50"),
+        )
+        work.refresh_from_db()
+        self.assertEqual(work.writer_last_names, "ALPHA / ZULU")
+        wiw.delete()
+        self.assertEqual(work.writer_last_names, "ALPHA")
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                str(work), "{}: NAMES (ALPHA)".format(work.work_id)
+            )
+
+        # renamed writer, backfill
+        alpha = Writer.objects.get(last_name="Alpha")
+        alpha.last_name = "Beta"
+        alpha.save()
+        work.refresh_from_db()
+        self.assertEqual(work.writer_last_names, "BETA")
+        self.assertEqual(
+            Work.objects.filter(writer_last_names__icontains="bet").get(),
+            work,
+        )
+        Work.objects.update(writer_last_names="")
+        out = StringIO()
+        call_command("dmp_writer_last_names", stdout=out)
+        self.assertEqual(out.getvalue().strip(), "works: 11, changed: 11")
+        work.refresh_from_db()
+        self.assertEqual(work.writer_last_names, "BETA")
+
+        recording = Recording.objects.first()
+        self.assertEqual(
+            get_change_url("admin:music_publisher_work_change", work.id),
+            reverse("admin:music_publisher_work_change", args=(work.id,)),
+        )
+        self.assertEqual(
+            get_change_url(
+                "admin:music_publisher_recording_change", recording.id
+            ),
+            reverse(
+                "admin:music_publisher_recording_change", args=(recording.id,)
+            ),
+        )
+        few = changelist_benchmark(rows=2)
+        many = changelist_benchmark(rows=10)
+        self.assertEqual(few["recording queries"], many["recording queries"])
+
+    @override_settings(PUBLISHER_CODE="MK")
+    def test_iswc_requests(self):
+        """ISWC requests for all works without ISWC, in batches."""
+        import re
+
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+
+        from music_publisher.admin import ACKImportAdmin
+        from music_publisher.synthetic import generate_catalog
+
+        generate_catalog(works=10)
+        out = StringIO()
+        call_command("dmp_iswc_requests", dry_run=True, stdout=out)
+        self.assertEqual(out.getvalue(), "works: 5\n")
+        out = StringIO()
+        call_command("dmp_iswc_requests", size=2, stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
+        exports = list(CWRExport.objects.get_iswc_requests())
+        self.assertEqual([e.work_count for e in exports], [2, 2, 1])
+        for export in exports:
+            export.refresh_from_db()
+            self.assertIn(export.filename, out.getvalue())
+            self.assertEqual(export.cwr.count("\nISR"), export.works.count())
+        self.assertFalse(CWRExport.objects.get_iswc_request_work_ids())
+        self.assertEqual(
+            len(CWRExport.objects.get_iswc_request_work_ids(resend=True)), 5
+        )
+
+        # responses
+        work = exports[0].works.first()
+        work.iswc = "T9876543210"
+        work.save()
+        out = StringIO()
+        call_command("dmp_iswc_requests", status=True, stdout=out)
+        self.assertEqual(
+            out.getvalue().splitlines()[0],
+            "{}: 2 works, 1 pending".format(exports[0].filename),
+        )
+        ack = ACK_CONTENT_30.replace("WRKONE", "ISRONE")
+        self.assertEqual(
+            re.findall(ACKImportAdmin.RE_ACK_30, ack)[0][:3],
+            ("ISR", "MK000001            ", "123                 "),
+        )
+        with self.assertRaises(CommandError):
+            call_command("dmp_iswc_requests", size=0)
+
+    def test_synthetic_catalog(self):
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+        from django.forms import inlineformset_factory
+
+        from music_publisher.benchmarks import catalog_benchmark
+        from music_publisher.forms import WriterInWorkFormSet
+
+        out = StringIO()
+        call_command("dmp_generate_catalog", works=20, stdout=out)
+        self.assertIn("works: 20", out.getvalue())
+        self.assertIn("acknowledgements: 30", out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("dmp_generate_catalog", works=20, stdout=out)
+        for work in Work.objects.all():
+            work.full_clean()
+            formset = inlineformset_factory(
+                Work,
+                WriterInWork,
+                formset=WriterInWorkFormSet,
+                fields=("writer", "capacity", "relative_share", "controlled"),
+                extra=0,
+            )(instance=work)
+            for form in formset.forms:
+                form.instance.writer.full_clean()
+                form.instance.full_clean()
+                form.cleaned_data = form.initial
+                form.is_bound = True
+            formset.clean()
+        self.assertEqual(Work.objects.filter(iswc__isnull=False).count(), 10)
+        results = catalog_benchmark(rows=10)
+        self.assertEqual(results["works"], 20)
+        self.assertIn("cwr export peak (MB)", results)
+        self.assertIn("json backup (s)", results)
+        # changes are rolled back
+        self.assertEqual(Work.objects.count(), 20)
+        self.assertFalse(CWRExport.objects.exists())
+        self.assertEqual(WorkAcknowledgement.objects.count(), 30)
+
+    def test_benchmark_comparison(self):
+        import os
+        import tempfile
+
+        from django.core.management import call_command
+
+        from music_publisher.benchmarks import compare_results
+
+        rows = list(
+            compare_results(
+                {"b": {"works": 10, "x (s)": 1.5, "y": "-"}},
+                {"b": {"works": 10, "x (s)": 1.0, "y": "-"}},
+            )
+        )
+        self.assertEqual(rows[0], ("b", "works", 10, 10, 0))
+        self.assertEqual(rows[1], ("b", "x (s)", 1.5, 1.0, 50))
+        self.assertEqual(rows[2], ("b", "y", "-", "-", None))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.json")
+            out = StringIO()
+            call_command(
+                "dmp_benchmark", "societies", output=path, stdout=StringIO()
+            )
+            call_command(
+                "dmp_benchmark", "societies", compare=path, stdout=out
+            )
+            self.assertIn("%)", out.getvalue())
+            with open(path) as f:
+                data = json.load(f)
+            self.assertIn("societies", data["benchmarks"])
+            self.assertEqual(data["environment"]["database"], "sqlite")
+
+    def test_media_derivatives(self):
+        """Derivatives are created after upload and served on playlists."""
+        import os
+        import tempfile
+
+        from django.core.files.base import ContentFile
+        from django.core.management import call_command
+        from PIL import Image
+
+        from music_publisher.models import Playlist
+
+        def image_file(size):
+            content = BytesIO()
+            Image.new("RGBA", size, "red").save(content, "PNG")
+            return ContentFile(content.getvalue(), name="cover.png")
+
+        with tempfile.TemporaryDirectory() as media_root:
+            with override_settings(
+                MEDIA_ROOT=media_root, OPTION_MEDIA_WORKERS=0
+            ):
+                playlist = Playlist(
+                    release_title="Playlist", cd_identifier="SECRET"
+                )
+                playlist.image = image_file((1600, 1200))
+                playlist.save()
+                playlist.refresh_from_db()
+                source = playlist.image.name
+                self.assertEqual(playlist.derivatives["source"], source)
+                for name, size in (("thumbnail", 160), ("medium", 800)):
+                    path = playlist.derivatives[name]
+                    self.assertTrue(path.endswith(".{}.jpg".format(name)))
+                    with Image.open(os.path.join(media_root, path)) as im:
+                        self.assertEqual(max(im.size), size)
+                recording = Recording.objects.create(
+                    recording_title="Track",
+                    work=Work.objects.create(title="Work"),
+                    audio_file=ContentFile(b"not audio", name="a.mp3"),
+                )
+                Track.objects.create(release=playlist, recording=recording)
+                recording.refresh_from_db()
+                self.assertNotIn("preview", recording.derivatives)
+                self.assertEqual(
+                    recording.media_urls["preview"], recording.audio_file.url
+                )
+                response = self.client.get(playlist.secret_url, follow=True)
+                self.assertContains(response, playlist.media_urls["medium"])
+                self.assertContains(response, recording.audio_file.url)
+                response = self.client.get(
+                    playlist.secret_api_url, follow=True
+                )
+                self.assertTrue(
+                    response.json()["image"].endswith(".medium.jpg")
+                )
+
+                old = dict(playlist.derivatives)
+                playlist.image = image_file((100, 100))
+                playlist.save()
+                playlist.refresh_from_db()
+                self.assertNotEqual(playlist.derivatives, old)
+                self.assertFalse(
+                    os.path.exists(os.path.join(media_root, old["medium"]))
+                )
+
+                Playlist.objects.update(derivatives={})
+                playlist.refresh_from_db()
+                # as in loaddata, derivatives are left to the command
+                playlist.save_base(raw=True)
+                playlist.refresh_from_db()
+                self.assertEqual(playlist.derivatives, {})
+                out = StringIO()
+                call_command("dmp_media_derivatives", stdout=out)
+                self.assertIn("Releases: 1", out.getvalue())
+                playlist.refresh_from_db()
+                self.assertIn("medium", playlist.derivatives)
+
     @override_settings(OPTION_FILES=False)
     def test_writer(self):
         writer = music_publisher.models.Writer(
@@ -2374,6 +3490,41 @@ class OtherFunctionalTest(SimpleTestCase):
         with self.assertRaises(NotImplementedError):
             rec.recording_id = "Y"
 
+    def test_societies(self):
+        from music_publisher import societies
+
+        registry = societies.get_registry()
+        self.assertIs(registry, societies.get_registry())
+        self.assertIs(societies.SOCIETIES, registry.choices)
+        for code, display in societies.SOCIETIES:
+            self.assertEqual(societies.SOCIETY_DICT[code], display)
+            self.assertEqual(registry.short_name(code), display.split(",")[0])
+        self.assertEqual(registry.name("52"), "PRS")
+        self.assertEqual(registry.country("52"), "UNITED KINGDOM")
+        self.assertEqual(registry.short_name("99"), "NO SOCIETY")
+        self.assertEqual(registry.short_name("XXX", "XXX"), "XXX")
+        self.assertNotIn("99", registry)
+        with self.assertRaises(TypeError):
+            registry.short_names["52"] = "X"
+        with self.assertRaises(AttributeError):
+            societies.UNKNOWN
+
+    def test_benchmark_command(self):
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+
+        with self.assertRaises(CommandError):
+            call_command("dmp_benchmark", "unknown")
+
+    def test_import_times(self):
+        from music_publisher.benchmarks import import_times
+
+        wall, setup, rows = import_times(("music_publisher.urls",))
+        self.assertGreater(wall, setup)
+        modules = [row[0] for row in rows]
+        self.assertIn("music_publisher.cwr_templates", modules)
+        self.assertIn("music_publisher.urls", modules)
+
     def test_playlist_admin_is_not_valid(self):
         from music_publisher.admin import PlaylistAdmin, Playlist
         from django.utils.timezone import now
@@ -2,7 +2,8 @@ from django.urls import path, include
 from music_publisher.royalty_calculation import RoyaltyCalculationView
 from rest_framework import routers
 from .api import ReleaseViewSet, ArtistViewSet, PlaylistViewSet, BackupViewSet
-from .views import SecretPlaylistView
+from .instrumentation import InstrumentationView
+from .views import RegistrationStatusView, SecretPlaylistView
 
 
 class APIRootView(routers.APIRootView):
@@ -38,6 +39,16 @@ urlpatterns = [
         RoyaltyCalculationView.as_view(),
         name="royalty_calculation",
     ),
+    path(
+        "registration_status/",
+        RegistrationStatusView.as_view(),
+        name="registration_status",
+    ),
+    path(
+        "instrumentation/",
+        InstrumentationView.as_view(),
+        name="instrumentation",
+    ),
     path("api/v1/", include(router.urls)),
     path(
         "secret_playlist/<slug:secret>/",
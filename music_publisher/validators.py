@@ -10,7 +10,7 @@ import re
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured, ValidationError
 from django.utils.deconstruct import deconstructible
-from .societies import SOCIETIES
+from .societies import get_registry
 from decimal import Decimal
 
 
@@ -227,10 +227,10 @@ def validate_settings():
 
     validate_publisher_settings()
 
-    keys = [s[0] for s in SOCIETIES]
+    registry = get_registry()
     for t in ["PR", "MR", "SR"]:
         attr = getattr(settings, "PUBLISHER_SOCIETY_" + t)
-        if attr and attr not in keys:
+        if attr and attr not in registry:
             raise ImproperlyConfigured(
                 'PUBLISHER_SOCIETY_{}: Unknown society code "{}".'.format(
                     t, attr
@@ -1,8 +1,17 @@
+from django.conf import settings
+from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.views.generic import TemplateView
 from django.shortcuts import get_object_or_404
-from .models import Playlist
+from django.urls import reverse
+from django.utils.http import urlencode
+from .models import (
+    Playlist,
+    SOCIETY_DICT,
+    WorkAcknowledgement,
+    WorkRegistrationStatus,
+)
 from django.utils.timezone import now
-from django.db.models import Q
+from django.db.models import Count, Q
 
 
 class SecretPlaylistView(TemplateView):
@@ -15,4 +24,68 @@ class SecretPlaylistView(TemplateView):
             Q(cd_identifier=secret),
             Q(Q(release_date__isnull=True) | Q(release_date__gte=now())),
         )
+        tracks = context["playlist"].tracks.select_related(
+            "recording__artist",
+            "recording__record_label",
+            "recording__work",
+        )
+        context["tracks"] = tracks.prefetch_related("recording__work__writers")
         return context
+
+
+class RegistrationStatusView(PermissionRequiredMixin, TemplateView):
+    """Counts of works per society and latest registration status.
+
+    Counts come from :class:`.models.WorkRegistrationStatus` with a single
+    aggregate query, each cell links to the filtered work changelist.
+    """
+
+    template_name = "music_publisher/registration_status.html"
+    permission_required = ("music_publisher.view_work",)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        counts = {}
+        qs = WorkRegistrationStatus.objects.order_by()
+        qs = qs.values_list("society_code", "status").annotate(Count("id"))
+        for society_code, status, count in qs:
+            counts[(society_code, status)] = count
+        codes = {society_code for society_code, status in counts}
+        statuses = [
+            (status, label)
+            for status, label in WorkAcknowledgement.TRANSACTION_STATUS_CHOICES
+            if any(key[1] == status for key in counts)
+        ]
+        url = reverse("admin:music_publisher_work_changelist")
+        rows = []
+        for code in sorted(codes, key=lambda c: SOCIETY_DICT.get(c, c)):
+            cells = []
+            for status, label in statuses:
+                count = counts.get((code, status), 0)
+                query = urlencode({"ack_society": code, "ack_status": status})
+                cells.append((count, "{}?{}".format(url, query)))
+            rows.append(
+                {
+                    "society": SOCIETY_DICT.get(code, code),
+                    "url": "{}?{}".format(
+                        url, urlencode({"ack_society": code})
+                    ),
+                    "total": sum(cell[0] for cell in cells),
+                    "cells": cells,
+                }
+            )
+        context["statuses"] = statuses
+        context["rows"] = rows
+        return context
+
+    def render_to_response(self, context, **response_kwargs):
+        """Prepare the context, required since we use admin template."""
+        context["site_header"] = settings.PUBLISHER_NAME
+        context["opts"] = {
+            "app_label": "music_publisher",
+            "model_name": "registrationstatus",
+        }
+        context["title"] = "Registration Status"
+        context["has_permission"] = True
+        context["is_nav_sidebar_enabled"] = False  # Permission issue
+        return super().render_to_response(context, **response_kwargs)
@@ -0,0 +1,230 @@
+"""In-memory index of work identifiers.
+
+ACK imports, royalty calculations, data import checks and admin search
+look up works by work ID, ISWC, ISRC or work IDs assigned by societies.
+The index maps all of them to IDs of works (primary keys), so these
+lookups need no queries, and unknown identifiers need no queries at all.
+Admin search uses the index only if it was already built in the process,
+it is not built during requests.
+
+The index is process-local. It is built with one ``values_list`` scan of
+works, recordings and acknowledgements. Every change of these objects is
+logged in :class:`.models.WorkIndexChange`, by signals or explicitly after
+bulk operations, and the latest change is the version of the index. Each
+use reads recent changes with one query and applies the ones not applied
+yet, by reloading identifiers of changed works. If there are too many
+changes, or the log was trimmed in the meantime, the index is rebuilt.
+
+IDs of changes are assigned when logged, but changes become visible when
+their transactions are committed, so a change with a lower ID than the
+version may appear later. Therefore the last :data:`WINDOW` changes
+before the version are read again, and IDs of applied ones are kept.
+
+Identifiers are stored in dictionaries, one per kind. Most identifiers
+belong to one work, then the value is an ``int``, a tuple otherwise.
+Identifiers of each work are kept too, for incremental updates. Strings
+and ints are shared between both, and kinds are interned. With a catalog
+of one ISWC per two works, one recording per work and three
+acknowledgements per two works, as in :mod:`.synthetic`, the index takes
+about 500 bytes per work, so about 500 MB for 1M works, in each process.
+It is built in about 7 seconds for 1M works.
+
+    Attributes:
+        REBUILD_THRESHOLD (int): maximal number of changed works applied
+            incrementally
+        WINDOW (int): number of changes before the version read again
+        BATCH_SIZE (int): number of works in one query when reloading
+"""
+
+import sys
+from threading import Lock
+
+from .models import (
+    Recording,
+    Work,
+    WorkAcknowledgement,
+    WorkIndexChange,
+    chunked,
+)
+
+REBUILD_THRESHOLD = 10000
+WINDOW = 1000
+BATCH_SIZE = 900
+
+
+def normalize(code):
+    """Return ISWC or ISRC in upper case, without dashes and dots."""
+    return code.upper().replace("-", "").replace(".", "")
+
+
+class WorkIndex(object):
+    """Index of work identifiers.
+
+    Kinds of identifiers are ``WORK_ID``, ``ISWC``, ``ISRC`` and society
+    codes, for work IDs assigned by societies. ISWCs and ISRCs are
+    normalized, see :func:`normalize`.
+
+    Attributes:
+        version (tuple): version of indexed data, (id, time) of the
+            latest applied change, or ``None`` if there were no changes
+        applied (set): IDs of applied changes within :data:`WINDOW`
+        built (bool): the index was built
+        codes (dict): {kind: {identifier: work ID or tuple of work IDs}}
+        keys (dict): {work ID: (kind, identifier, kind, identifier, ...)}
+    """
+
+    def __init__(self):
+        self.version = None
+        self.applied = set()
+        self.built = False
+        self.codes = {}
+        self.keys = {}
+        self.lock = Lock()
+
+    @staticmethod
+    def get_rows(work_ids=None):
+        """Yield (work ID, kind, identifier) for all or some works."""
+        works = Work.objects.order_by()
+        recordings = Recording.objects.exclude(isrc=None).order_by()
+        acks = WorkAcknowledgement.objects.exclude(remote_work_id="")
+        acks = acks.order_by()
+        if work_ids is not None:
+            works = works.filter(id__in=work_ids)
+            recordings = recordings.filter(work_id__in=work_ids)
+            acks = acks.filter(work_id__in=work_ids)
+        for work_id, code, iswc in works.values_list("id", "_work_id", "iswc"):
+            if code:
+                yield work_id, "WORK_ID", code
+            if iswc:
+                yield work_id, "ISWC", normalize(iswc)
+        for work_id, isrc in recordings.values_list("work_id", "isrc"):
+            yield work_id, "ISRC", normalize(isrc)
+        for row in acks.values_list(
+            "work_id", "society_code", "remote_work_id"
+        ):
+            yield row
+
+    def add(self, rows):
+        """Add identifiers, see :meth:`get_rows`."""
+        keys = {}
+        ids = {}
+        for work_id, kind, code in rows:
+            work_id = ids.setdefault(work_id, work_id)  # one int per work
+            kind = sys.intern(kind)
+            codes = self.codes.setdefault(kind, {})
+            value = codes.get(code)
+            if value is None:
+                codes[code] = work_id
+            elif isinstance(value, int):
+                if value == work_id:
+                    continue
+                codes[code] = (value, work_id)
+            elif work_id in value:
+                continue
+            else:
+                codes[code] = value + (work_id,)
+            keys.setdefault(work_id, []).extend((kind, code))
+        for work_id, work_keys in keys.items():
+            self.keys[work_id] = self.keys.get(work_id, ()) + tuple(work_keys)
+
+    def remove(self, work_ids):
+        """Remove identifiers of works."""
+        for work_id in work_ids:
+            keys = self.keys.pop(work_id, ())
+            for kind, code in zip(keys[::2], keys[1::2]):
+                codes = self.codes[kind]
+                value = codes[code]
+                if isinstance(value, int):
+                    del codes[code]
+                else:
+                    value = tuple(v for v in value if v != work_id)
+                    codes[code] = value[0] if len(value) == 1 else value
+
+    def build(self):
+        """Build the index from scratch.
+
+        Recent changes are read before the scan, changes committed in the
+        meantime are then applied again with the next refresh.
+        """
+        qs = WorkIndexChange.objects.order_by("-id")[:WINDOW]
+        changes = list(qs.values_list("id", "time"))
+        self.codes = {}
+        self.keys = {}
+        self.add(self.get_rows())
+        self.version = changes[0] if changes else None
+        self.applied = set(change[0] for change in changes)
+        self.built = True
+
+    def get_changes(self):
+        """Return recent changes, (id, time, work ID), ordered by id.
+
+        Returns:
+            list: changes within :data:`WINDOW` before the version and all
+            later ones, or ``None`` if the log was trimmed or rolled back
+        """
+        start = self.version[0] - WINDOW if self.version else 0
+        qs = WorkIndexChange.objects.filter(id__gt=start).order_by("id")
+        changes = list(qs.values_list("id", "time", "work_id"))
+        if self.version and self.version not in (c[:2] for c in changes):
+            return None
+        return changes
+
+    def refresh(self):
+        """Apply changes not applied yet, or rebuild."""
+        with self.lock:
+            changes = self.get_changes() if self.built else None
+            if changes is None:
+                self.build()
+                return
+            work_ids = set(
+                change[2]
+                for change in changes
+                if change[0] not in self.applied
+            )
+            if len(work_ids) > REBUILD_THRESHOLD:
+                self.build()
+                return
+            for chunk in chunked(sorted(work_ids), BATCH_SIZE):
+                self.remove(chunk)
+                self.add(self.get_rows(chunk))
+            if changes:
+                self.version = changes[-1][:2]
+                start = self.version[0] - WINDOW
+                self.applied = set(c[0] for c in changes if c[0] > start)
+
+    def get(self, kind, code):
+        """Return a tuple of IDs of works with the identifier."""
+        if kind in ("ISWC", "ISRC"):
+            code = normalize(code)
+        value = self.codes.get(kind, {}).get(code)
+        if value is None:
+            return ()
+        if isinstance(value, int):
+            return (value,)
+        return value
+
+    def lookup(self, kind, codes):
+        """Return IDs of works with any of the identifiers.
+
+        Args:
+            kind (str): ``WORK_ID``, ``ISWC``, ``ISRC`` or a society code
+            codes (iterable): identifiers
+
+        Returns:
+            dict: {identifier: tuple of work IDs}, only found ones
+        """
+        found = {}
+        for code in codes:
+            work_ids = self.get(kind, code)
+            if work_ids:
+                found[code] = work_ids
+        return found
+
+
+INDEX = WorkIndex()
+
+
+def get_work_index():
+    """Return the index for this process, with the latest changes."""
+    INDEX.refresh()
+    return INDEX